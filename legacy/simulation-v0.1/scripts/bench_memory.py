@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Time the IMEX step as a function of the number of Prony memory modes.
+
+For each M the script reports the cost of a full ``_step_imex`` call and of
+the memory update alone, next to the broadcast update the model used before
+``PronyMemory`` (fresh ``exp``/``sum``/``(M, N, N)`` temporaries per step).
+
+    python scripts/bench_memory.py --grid 64 --modes 0 1 5 10 20 50
+"""
+import argparse, os, sys, time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from doft.models.model import DOFTModel
+
+
+def per_call_us(fn, repeat):
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def build_model(grid, modes, seed=0):
+    kernel = None
+    if modes:
+        rng = np.random.default_rng(seed)
+        kernel = {"weights": rng.uniform(0.01, 0.1, modes), "thetas": np.geomspace(0.05, 5.0, modes)}
+    model = DOFTModel(
+        grid_size=grid, a=0.5, tau=1.0, a_ref=1.0, tau_ref=1.0, gamma=0.2, seed=seed,
+        kernel_params=kernel, max_ram_bytes=32 * 1024**3,
+    )
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    return model
+
+
+def accepted_step(model):
+    model.last_energy = np.inf  # accept every attempt; only the cost is measured
+    model._step_imex(0)
+
+
+def legacy_update(y, P, weights, thetas, dt):
+    memory_term = np.sum(y, axis=0)
+    exp_fac = np.exp(-dt / thetas[:, None, None])
+    return memory_term, exp_fac * y + weights[:, None, None] * (1.0 - exp_fac) * P
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--grid", type=int, default=64)
+    ap.add_argument("--modes", type=int, nargs="+", default=[0, 1, 5, 10, 20, 50])
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"grid={args.grid}  repeat={args.repeat}")
+    print(f"{'M':>4} {'step_us':>10} {'update_us':>10} {'legacy_update_us':>17} {'speedup':>8}")
+    for modes in args.modes:
+        model = build_model(args.grid, modes)
+        step = per_call_us(lambda: accepted_step(model), args.repeat)
+        if model.memory is None:
+            print(f"{modes:>4} {step:>10.1f} {'-':>10} {'-':>17} {'-':>8}")
+            continue
+        mem, P, dt = model.memory, model.P, model.dt_nondim
+        update = per_call_us(lambda: (mem.propose(P, dt), mem.commit()), args.repeat)
+        legacy = per_call_us(
+            lambda: legacy_update(mem.y, P, mem.weights, mem.thetas, dt), args.repeat
+        )
+        print(f"{modes:>4} {step:>10.1f} {update:>10.1f} {legacy:>17.1f} {legacy / update:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
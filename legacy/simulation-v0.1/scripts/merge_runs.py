@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-import argparse, glob, os
+import argparse, glob, json, os, sys
+import multiprocessing as mp
 import numpy as np
 
 try:
@@ -7,91 +8,201 @@ try:
 except ImportError as e:
     raise SystemExit("pandas is required to merge runs. Please install pandas and try again.") from e
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from doft.utils.outputs import COLUMNAR_EXTENSIONS, find_table, read_table
+from doft.utils.utils import RunningStats
+
+NUM_COLS = ["gamma","xi","ceff_bar","beta_dyn","lpcV","samples","step","K","z0"]
+GROUP_KEYS = ["gamma","xi"]
+STAT_COLS = ["ceff_bar","beta_dyn","lpc_ok"]
+STATE_FILE = "merge_state.json"
+# One shard table per directory; find_table prefers the columnar formats
+SHARD_STEM = "table"
+SHARD_NAMES = [SHARD_STEM + ext for ext in (*COLUMNAR_EXTENSIONS.values(), ".csv")]
+
 def coerce_numeric(df, cols):
     for c in cols:
         if c in df.columns:
             df[c] = pd.to_numeric(df[c], errors="coerce")
     return df
 
+def file_signature(path):
+    st = os.stat(path)
+    return {"mtime": st.st_mtime, "size": st.st_size}
+
+def read_shard(path):
+    """Read one shard and reduce it to per-(gamma, xi) partial statistics.
+
+    Runs inside the worker pool; returns ``(path, df, partials, error)`` where
+    ``partials`` maps a group key to its row count and ``RunningStats`` state.
+    """
+    try:
+        df = read_table(path)
+    except Exception as e:
+        return path, None, None, str(e)
+
+    # Coerce the relevant columns to numeric types
+    df = coerce_numeric(df, NUM_COLS)
+
+    # Optional derived values
+    if "lpcV" in df.columns:
+        df["lpc_ok"] = (df["lpcV"].fillna(0) == 0).astype(float)
+
+    partials = {}
+    if all(k in df.columns for k in GROUP_KEYS):
+        cols = [c for c in STAT_COLS if c in df.columns]
+        for key, sub in df.groupby(GROUP_KEYS):
+            partials[key] = {
+                "n": len(sub),
+                "stats": {c: RunningStats().update(sub[c].to_numpy()).to_dict() for c in cols},
+            }
+    return path, df, partials, None
+
+def load_state(outdir):
+    path = os.path.join(outdir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        raw = json.load(f)
+    groups = {}
+    for g in raw["groups"]:
+        groups[tuple(g["key"])] = {
+            "n": g["n"],
+            "stats": {c: RunningStats.from_dict(s) for c, s in g["stats"].items()},
+        }
+    return {"files": raw["files"], "columns": raw["columns"], "groups": groups}
+
+def save_state(outdir, state):
+    raw = {
+        "files": state["files"],
+        "columns": state["columns"],
+        "groups": [
+            {"key": list(k), "n": g["n"], "stats": {c: s.to_dict() for c, s in g["stats"].items()}}
+            for k, g in state["groups"].items()
+        ],
+    }
+    tmp = os.path.join(outdir, STATE_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(raw, f)
+    os.replace(tmp, os.path.join(outdir, STATE_FILE))
+
+def extend_columns(path, columns, chunksize=100_000):
+    """Rewrite ``path`` chunk by chunk so its header matches ``columns``."""
+    tmp = path + ".tmp"
+    header = True
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk.reindex(columns=columns).to_csv(tmp, mode="w" if header else "a", header=header, index=False)
+        header = False
+    os.replace(tmp, path)
+
+def build_summary(groups):
+    have = {c for g in groups.values() for c, s in g["stats"].items()}
+    rows = []
+    for key, g in groups.items():
+        row = dict(zip(GROUP_KEYS, key))
+        st = g["stats"]
+        empty = RunningStats()
+        row["ceff_bar_mean"] = st.get("ceff_bar", empty).mean if st.get("ceff_bar", empty).n else np.nan
+        row["ceff_bar_std"] = st.get("ceff_bar", empty).std
+        if "beta_dyn" in have:
+            s = st.get("beta_dyn", empty)
+            row["beta_dyn_mean"] = s.mean if s.n else np.nan
+            row["beta_dyn_std"] = s.std
+        if "lpc_ok" in have:
+            s = st.get("lpc_ok", empty)
+            row["lpc_ok_frac"] = s.mean if s.n else np.nan
+        row["n"] = g["n"]
+        rows.append(row)
+    summary = pd.DataFrame(rows)
+    if summary.empty:
+        return summary
+    # Compute SEM values from the accumulated standard deviations
+    summary["ceff_bar_sem"] = summary["ceff_bar_std"] / np.sqrt(summary["n"].clip(lower=1))
+    return summary.sort_values(GROUP_KEYS).reset_index(drop=True)
+
+def ingest(results, state, merged_path):
+    """Append shard rows to ``merged_path`` and fold their partial statistics."""
+    n_new = n_rows = 0
+    for path, df, partials, err in results:
+        if err is not None:
+            print(f"[warn] could not read {path}: {err}")
+            continue
+        extra = [c for c in df.columns if c not in state["columns"]]
+        if extra:
+            if state["columns"] and os.path.exists(merged_path):
+                extend_columns(merged_path, state["columns"] + extra)
+            state["columns"] = state["columns"] + extra
+        write_header = not os.path.exists(merged_path)
+        df.reindex(columns=state["columns"]).to_csv(
+            merged_path, mode="a", header=write_header, index=False
+        )
+        for key, part in partials.items():
+            key = tuple(float(k) for k in key)
+            g = state["groups"].setdefault(key, {"n": 0, "stats": {}})
+            g["n"] += part["n"]
+            for c, s in part["stats"].items():
+                g["stats"].setdefault(c, RunningStats()).merge(RunningStats.from_dict(s))
+        state["files"][path] = file_signature(path)
+        n_new += 1
+        n_rows += len(df)
+    return n_new, n_rows
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("inputs", nargs="+", help="directories or shard patterns (e.g. runs/quick_shard*)")
     ap.add_argument("--out", required=True, help="output directory")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes used to read shards")
+    ap.add_argument("--full", action="store_true", help="ignore the merge manifest and rebuild from scratch")
     args = ap.parse_args()
 
-    # Locate all table.csv under each input
+    # Locate one table.{parquet,arrow,csv} per directory under each input, so
+    # a shard written in several formats is ingested once
     files = []
     for pat in args.inputs:
         for root in glob.glob(pat):
-            files.extend(glob.glob(os.path.join(root, "**", "table.csv"), recursive=True))
-    files = sorted(set(files))
+            for dirpath, _dirs, _files in os.walk(root):
+                path = find_table(dirpath, SHARD_STEM)
+                if path is not None:
+                    files.append(path)
+    files = sorted(set(os.path.abspath(f) for f in files))
     if not files:
-        raise SystemExit("No table.csv found in the inputs. Did any run finish?")
+        raise SystemExit(f"No {'/'.join(SHARD_NAMES)} found in the inputs. Did any run finish?")
 
-    dfs = []
-    for f in files:
-        try:
-            df = pd.read_csv(f)
-            dfs.append(df)
-        except Exception as e:
-            print(f"[warn] could not read {f}: {e}")
+    os.makedirs(args.out, exist_ok=True)
+    merged_path = os.path.join(args.out, "merged.csv")
+
+    # Reuse the previous merge unless a shard it ingested changed or vanished
+    state = None if args.full else load_state(args.out)
+    if state is not None:
+        stale = [f for f, sig in state["files"].items()
+                 if not os.path.exists(f) or file_signature(f) != sig]
+        if stale or not os.path.exists(merged_path):
+            print(f"[info] {len(stale)} merged shard(s) changed; rebuilding from scratch")
+            state = None
+    if state is None:
+        state = {"files": {}, "columns": [], "groups": {}}
+        if os.path.exists(merged_path):
+            os.remove(merged_path)
+
+    new_files = [f for f in files if f not in state["files"]]
+    if args.jobs > 1 and len(new_files) > 1:
+        with mp.Pool(processes=min(args.jobs, len(new_files))) as pool:
+            results = pool.imap(read_shard, new_files, chunksize=8)
+            n_new, n_rows = ingest(results, state, merged_path)
+    else:
+        n_new, n_rows = ingest(map(read_shard, new_files), state, merged_path)
 
-    if not dfs:
+    if not state["groups"] and not state["files"]:
         raise SystemExit("Could not read any valid CSV.")
 
-    big = pd.concat(dfs, ignore_index=True)
-
-    # Coerce the relevant columns to numeric types
-    num_cols = ["gamma","xi","ceff_bar","beta_dyn","lpcV","samples","step","K","z0"]
-    big = coerce_numeric(big, num_cols)
-
-    # Optional derived values
-    if "lpcV" in big.columns:
-        big["lpc_ok"] = (big["lpcV"].fillna(0) == 0).astype(float)
-
-    os.makedirs(args.out, exist_ok=True)
-    big.to_csv(os.path.join(args.out, "merged.csv"), index=False)
-
-    # Build flexible aggregates
-    group = big.groupby(["gamma","xi"], as_index=False)
-    agg_dict = {
-        "ceff_bar": ["mean","std"],
-    }
-    if "beta_dyn" in big.columns:
-        agg_dict["beta_dyn"] = ["mean","std"]
-    if "lpc_ok" in big.columns:
-        agg_dict["lpc_ok"] = ["mean"]
-
-    summary = group.agg(agg_dict)
-    # Flatten MultiIndex columns
-    summary.columns = [
-        "_".join([c for c in col if c]).rstrip("_")
-        if isinstance(col, tuple) else col
-        for col in summary.columns
-    ]
-    # Friendly column names
-    summary = summary.rename(columns={
-        "ceff_bar_mean":"ceff_bar_mean",
-        "ceff_bar_std":"ceff_bar_std",
-        "beta_dyn_mean":"beta_dyn_mean",
-        "beta_dyn_std":"beta_dyn_std",
-        "lpc_ok_mean":"lpc_ok_frac"
-    })
-
-    # Compute SEM values when standard deviations are available
-    if "ceff_bar_std" in summary.columns:
-        counts = group.size().reset_index(name="n")["n"]
-        summary["n"] = counts
-        summary["ceff_bar_sem"] = summary["ceff_bar_std"] / np.sqrt(summary["n"].clip(lower=1))
-    else:
-        summary["n"] = group.size().values
+    save_state(args.out, state)
 
-    summary = summary.sort_values(["gamma","xi"]).reset_index(drop=True)
+    summary = build_summary(state["groups"])
     summary.to_csv(os.path.join(args.out, "summary.csv"), index=False)
 
     # Muestra breve
     pd.set_option("display.max_columns", None)
-    print(f"[ok] merged={len(big)} filas  |  grupos={len(summary)}")
+    print(f"[ok] new shards={n_new} (+{n_rows} filas)  |  shards={len(state['files'])}  |  grupos={len(summary)}")
     print(summary.head(12).to_string(index=False))
 
 if __name__ == "__main__":
@@ -1,6 +1,173 @@
-
+import hashlib
+import json
 import os
 
+from doft.utils.outputs import find_table, read_table
+from doft.utils.utils import RunningStats
+
+CACHE_FILE = ".analysis_cache.json"
+GROUP_KEY = "gamma"
+SUMMARY_METRICS = ["ceff_pulse", "lpc_ok_frac", "anisotropy_max_pct"]
+# Columns identifying a run; paired comparisons match runs on all but one
+PAIR_KEYS = ["seed", "a_mean", "tau_mean", "gamma"]
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 of ``path`` read in chunks."""
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_run_tables(indir: str) -> list[str]:
+    """Return one ``runs`` table per directory below ``indir``."""
+
+    found = []
+    for root, _dirs, _files in os.walk(indir):
+        path = find_table(root, "runs")
+        if path is not None:
+            found.append(path)
+    return sorted(found)
+
+
+def aggregate_runs(df) -> dict:
+    """Reduce one runs table to per-gamma partial statistics."""
+
+    partial = {}
+    if GROUP_KEY not in df.columns:
+        return partial
+    for key, sub in df.groupby(GROUP_KEY):
+        partial[repr(float(key))] = {
+            "n": len(sub),
+            "stats": {
+                m: RunningStats().update(sub[m].to_numpy(dtype=float)).to_dict()
+                for m in SUMMARY_METRICS
+                if m in sub.columns
+            },
+        }
+    return partial
+
+
+def load_cache(outdir: str) -> dict:
+    path = os.path.join(outdir, CACHE_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"inputs": {}, "figures": {}}
+
+
+def save_cache(outdir: str, cache: dict):
+    tmp = os.path.join(outdir, CACHE_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp, os.path.join(outdir, CACHE_FILE))
+
+
+def build_summary(tables: list[str], cache: dict):
+    """Aggregate ``tables`` into a per-gamma summary, reusing cached partials.
+
+    Cache entries are keyed by table path and hold the content hash they
+    were computed from; only tables without an entry or with a changed hash
+    are parsed. Identical tables in different directories are separate
+    entries and both count. The cache is pruned to the current inputs.
+    """
+
+    import pandas as pd
+
+    inputs = {}
+    for path in tables:
+        digest = file_digest(path)
+        entry = cache["inputs"].get(path)
+        if entry is None or entry.get("digest") != digest:
+            entry = {"digest": digest, "groups": aggregate_runs(read_table(path))}
+        inputs[path] = entry
+    cache["inputs"] = inputs
+
+    groups = {}
+    for entry in inputs.values():
+        for key, part in entry["groups"].items():
+            g = groups.setdefault(key, {"n": 0, "stats": {}})
+            g["n"] += part["n"]
+            for m, s in part["stats"].items():
+                g["stats"].setdefault(m, RunningStats()).merge(RunningStats.from_dict(s))
+
+    rows = []
+    for key, g in groups.items():
+        row = {GROUP_KEY: float(key), "n_runs": g["n"]}
+        for m in SUMMARY_METRICS:
+            s = g["stats"].get(m, RunningStats())
+            row[f"{m}_mean"] = s.mean if s.n else float("nan")
+            row[f"{m}_std"] = s.std
+            row[f"{m}_sem"] = s.std / s.n ** 0.5 if s.n else float("nan")
+        rows.append(row)
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values(GROUP_KEY).reset_index(drop=True)
+
+
+def paired_difference(df, metric: str, column: str, baseline, treatment, z: float = 1.96) -> dict:
+    """Estimate the change of ``metric`` from ``column == baseline`` to ``treatment``.
+
+    Runs are paired on the other :data:`PAIR_KEYS` columns (above all the
+    seed) and the mean, standard error and normal ``z`` interval of the
+    per-pair differences are returned. With common random numbers
+    (``crn_experiment``) the paired runs share their initial noise, so the
+    paired standard error is well below ``unpaired_sem``, the error of the
+    difference of the two independent means; ``sem_ratio ** 2`` is the
+    fraction of seeds needed for the same confidence.
+    """
+
+    keys = [k for k in PAIR_KEYS if k in df.columns and k != column]
+    base = df[df[column] == baseline].groupby(keys)[metric].mean()
+    treat = df[df[column] == treatment].groupby(keys)[metric].mean()
+    pairs = base.to_frame("base").join(treat.to_frame("treat"), how="inner").dropna()
+    diff = RunningStats().update(pairs["treat"] - pairs["base"])
+    n = diff.n
+    nan = float("nan")
+    sem = diff.std / n ** 0.5 if n else nan
+    var_sum = RunningStats().update(pairs["base"]).var + RunningStats().update(pairs["treat"]).var
+    unpaired = (var_sum / n) ** 0.5 if n else nan
+    mean = diff.mean if n else nan
+    return {
+        "metric": metric,
+        "column": column,
+        "baseline": baseline,
+        "treatment": treatment,
+        "n_pairs": n,
+        "diff_mean": mean,
+        "diff_sem": sem,
+        "ci95_lo": mean - z * sem,
+        "ci95_hi": mean + z * sem,
+        "unpaired_sem": unpaired,
+        "sem_ratio": sem / unpaired if unpaired > 0 else nan,
+    }
+
+
+def paired_table(df, column: str):
+    """Paired differences of every summary metric against the lowest ``column`` level."""
+
+    import pandas as pd
+
+    levels = sorted(df[column].dropna().unique())
+    rows = [
+        paired_difference(df, metric, column, levels[0], level)
+        for metric in SUMMARY_METRICS
+        if metric in df.columns
+        for level in levels[1:]
+    ]
+    return pd.DataFrame(rows)
+
+
+def slice_digest(name: str, df, columns: list[str]) -> str:
+    """Hash the data slice a figure is drawn from."""
+
+    data = df[columns].to_csv(index=False).encode()
+    return hashlib.sha256(name.encode() + b"\0" + data).hexdigest()
+
+
 def main():
     import argparse
     try:
@@ -14,26 +181,75 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="indir", required=True)
     ap.add_argument("--out", dest="outdir", required=True)
+    ap.add_argument("--no-cache", action="store_true", help="ignore cached aggregates and re-render every figure")
+    ap.add_argument(
+        "--paired", metavar="COLUMN", choices=PAIR_KEYS,
+        help="write paired_<COLUMN>.csv: seed-paired metric differences against the lowest COLUMN level",
+    )
     args = ap.parse_args()
 
     os.makedirs(args.outdir, exist_ok=True)
-    summ = os.path.join(args.indir, "summary.csv")
-    if not os.path.exists(summ):
-        print("No summary.csv at", summ)
-        return
-    df = pd.read_csv(summ)
-
-    plt.figure(); plt.plot(df["gamma"], df["hbar_eff"], marker="o")
-    plt.xlabel("gamma"); plt.ylabel("hbar_eff"); plt.title("ħ_eff vs gamma"); plt.grid(True, alpha=0.3)
-    plt.savefig(os.path.join(args.outdir, "hbar_eff_vs_gamma.png"), dpi=140); plt.close()
-
-    plt.figure(); plt.plot(df["gamma"], df["lpc_rate"], marker="o")
-    plt.xlabel("gamma"); plt.ylabel("LPC violation rate"); plt.title("LPC vs gamma"); plt.grid(True, alpha=0.3)
-    plt.savefig(os.path.join(args.outdir, "lpc_rate_vs_gamma.png"), dpi=140); plt.close()
-
-    plt.figure(); plt.bar(df["gamma"].astype(str), df["anisotropy_rel"])
-    plt.xlabel("gamma"); plt.ylabel("Δc/c"); plt.title("Average anisotropy"); plt.grid(True, axis="y", alpha=0.3)
-    plt.savefig(os.path.join(args.outdir, "anisotropy_vs_gamma.png"), dpi=140); plt.close()
+    cache = {"inputs": {}, "figures": {}} if args.no_cache else load_cache(args.outdir)
+
+    tables = find_run_tables(args.indir)
+    if tables:
+        df = build_summary(tables, cache)
+        df.to_csv(os.path.join(args.outdir, "summary.csv"), index=False)
+        if args.paired:
+            runs = pd.concat([read_table(path) for path in tables], ignore_index=True)
+            paired_table(runs, args.paired).to_csv(
+                os.path.join(args.outdir, f"paired_{args.paired}.csv"), index=False
+            )
+        figures = [
+            ("ceff_pulse_vs_gamma.png", ["gamma", "ceff_pulse_mean", "ceff_pulse_sem"]),
+            ("lpc_ok_frac_vs_gamma.png", ["gamma", "lpc_ok_frac_mean", "lpc_ok_frac_sem"]),
+            ("anisotropy_vs_gamma.png", ["gamma", "anisotropy_max_pct_mean"]),
+        ]
+    else:
+        summ = find_table(args.indir, "summary")
+        if summ is None:
+            print("No runs or summary table in", args.indir)
+            return
+        df = read_table(summ)
+        figures = [
+            ("hbar_eff_vs_gamma.png", ["gamma", "hbar_eff"]),
+            ("lpc_rate_vs_gamma.png", ["gamma", "lpc_rate"]),
+            ("anisotropy_vs_gamma.png", ["gamma", "anisotropy_rel"]),
+        ]
+
+    def render(name, cols):
+        x, y = df[cols[0]], df[cols[1]]
+        plt.figure()
+        if name.startswith("anisotropy"):
+            plt.bar(x.astype(str), y)
+            plt.ylabel("Δc/c" if cols[1] == "anisotropy_rel" else "max anisotropy (%)")
+            plt.title("Average anisotropy"); plt.grid(True, axis="y", alpha=0.3)
+        else:
+            if len(cols) > 2:
+                plt.errorbar(x, y, yerr=df[cols[2]], marker="o", capsize=3)
+            else:
+                plt.plot(x, y, marker="o")
+            labels = {
+                "hbar_eff": ("hbar_eff", "ħ_eff vs gamma"),
+                "lpc_rate": ("LPC violation rate", "LPC vs gamma"),
+                "ceff_pulse_mean": ("c_eff (pulse)", "c_eff vs gamma"),
+                "lpc_ok_frac_mean": ("LPC ok fraction", "LPC vs gamma"),
+            }
+            ylabel, title = labels[cols[1]]
+            plt.ylabel(ylabel); plt.title(title); plt.grid(True, alpha=0.3)
+        plt.xlabel("gamma")
+        plt.savefig(os.path.join(args.outdir, name), dpi=140); plt.close()
+
+    # Only re-render figures whose input slice changed since the last call
+    for name, cols in figures:
+        digest = slice_digest(name, df, cols)
+        out_path = os.path.join(args.outdir, name)
+        if cache["figures"].get(name) == digest and os.path.exists(out_path):
+            continue
+        render(name, cols)
+        cache["figures"][name] = digest
+
+    save_cache(args.outdir, cache)
 
 if __name__ == "__main__":
     main()
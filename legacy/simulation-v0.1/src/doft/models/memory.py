@@ -0,0 +1,105 @@
+"""Prony-chain memory kernel for the DOFT lattice.
+
+The kernel ``K(t) = sum_k w_k exp(-t / theta_k)`` is represented by one
+auxiliary field ``y_k`` per mode. Over a step of length ``dt`` each mode is
+advanced exactly for a piecewise-constant drive ``P``::
+
+    y_k <- exp(-dt / theta_k) * y_k + w_k * (1 - exp(-dt / theta_k)) * P
+
+and the force fed back into the momentum equation is ``sum_k y_k``.
+"""
+
+import numpy as np
+
+from doft.utils.precompute import PRECOMPUTE
+
+
+class PronyMemory:
+    """Memory states, decay coefficients and summed force for ``M`` modes.
+
+    Decay and gain factors are looked up when the step size changes and
+    shared between models through :data:`doft.utils.precompute.PRECOMPUTE`.
+    Candidate states are written into a second buffer by :meth:`propose` and
+    swapped in by :meth:`commit`, so a rejected step attempt costs no
+    allocation and leaves the committed states untouched.
+    The summed force is maintained alongside the states; code that writes to
+    :attr:`y` directly must call :meth:`invalidate` afterwards.
+    """
+
+    def __init__(self, weights, thetas, shape):
+        self.weights = np.asarray(weights, dtype=float)
+        self.thetas = np.asarray(thetas, dtype=float)
+        self.y = np.zeros((self.weights.size, *shape), dtype=np.float64)
+        self._y_next = np.empty_like(self.y)
+        self._drive = np.empty_like(self.y)
+        self._force = np.zeros(shape, dtype=np.float64)
+        self._force_next = np.empty_like(self._force)
+        self._force_valid = True
+        self._dt = None
+        self._decay = None
+        self._gain = None
+
+    @property
+    def n_modes(self) -> int:
+        return self.weights.size
+
+    def coefficients(self, dt: float):
+        """Return the ``(decay, gain)`` factors for ``dt``, shaped ``(M, 1, 1)``."""
+
+        if dt != self._dt:
+            key = ("prony", tuple(self.weights.tolist()), tuple(self.thetas.tolist()), dt)
+            self._decay, self._gain = PRECOMPUTE.get(key, lambda: self._build_coefficients(dt))
+            self._dt = dt
+        return self._decay, self._gain
+
+    def _build_coefficients(self, dt: float):
+        decay = np.exp(-dt / self.thetas)
+        return decay[:, None, None], (self.weights * (1.0 - decay))[:, None, None]
+
+    @property
+    def force(self) -> np.ndarray:
+        """Summed memory force ``sum_k y_k`` of the committed states."""
+
+        if not self._force_valid:
+            np.sum(self.y, axis=0, out=self._force)
+            self._force_valid = True
+        return self._force
+
+    def invalidate(self):
+        """Mark the summed force stale after an external write to :attr:`y`."""
+
+        self._force_valid = False
+
+    def propose(self, P: np.ndarray, dt: float) -> np.ndarray:
+        """Advance every mode by ``dt`` into the candidate buffer and return it.
+
+        The committed states are not modified; the candidate's summed force
+        is computed in the same pass and becomes :attr:`force` on commit.
+        """
+
+        decay, gain = self.coefficients(dt)
+        np.multiply(decay, self.y, out=self._y_next)
+        np.multiply(gain, P, out=self._drive)
+        self._y_next += self._drive
+        np.sum(self._y_next, axis=0, out=self._force_next)
+        return self._y_next
+
+    def commit(self):
+        """Accept the last :meth:`propose` result as the current state."""
+
+        self.y, self._y_next = self._y_next, self.y
+        self._force, self._force_next = self._force_next, self._force
+        self._force_valid = True
+
+    def rescale(self, scale: float):
+        """Divide the states (and the cached force) by ``scale`` in place."""
+
+        self.y /= scale
+        if self._force_valid:
+            self._force /= scale
+
+    def energy(self, y: np.ndarray | None = None) -> float:
+        """Return ``0.5 * sum_k w_k |y_k|^2`` for ``y`` (default: committed)."""
+
+        y = self.y if y is None else y
+        return 0.5 * float(np.einsum("k,kij,kij->", self.weights, y, y))
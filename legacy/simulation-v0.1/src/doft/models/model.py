@@ -1,11 +1,179 @@
 # src/doft/models/model.py
 import numpy as np
-import pandas as pd
-from scipy.stats import theilslopes
 import math
+import os
+import time
 import warnings
+from array import array
+from collections import deque
+
+from doft.models.memory import PronyMemory
+from doft.utils.outputs import BackgroundWriter
+from doft.models.parareal import check_model, parareal_lpc_series, resolve_parareal
+from doft.utils.crn import rng_stream
+from doft.utils.precompute import PRECOMPUTE
+from doft.utils.snapshots import SnapshotWriter
+from doft.utils.theilsen import theilslopes_batch as _theilslopes_batch
+from doft.utils.utils import PhaseTimer, spectral_entropy, spectral_entropy_batch
+
+# pandas and scipy are imported at their point of use so that the stepping
+# core (and every spawned pool worker) only pays for NumPy at import time.
+
+
+def theilslopes_batch(y, x, lengths, alpha=0.95):
+    """Theil-Sen fits of padded series (``doft.utils.theilsen``, SciPy-compatible)."""
+
+    return _theilslopes_batch(y, x, lengths, alpha)
+
+
+# Length of the diagnostic logs (energy, scale, delta_d) kept in lean mode
+LEAN_LOG_LEN = 1024
+
+
+def stable_dt_nondim(a_nondim: float, tau_nondim: float, gamma_nondim: float) -> float:
+    """Return the stable dimensionless time step for the given parameters."""
+
+    denom = gamma_nondim + abs(a_nondim) + 1.0
+    if denom > 0:
+        gamma_bound = 0.1 / denom
+    else:
+        gamma_bound = float("inf")
+    return min(0.02, 0.1, tau_nondim / 50.0, gamma_bound)
+
+
+def phase_step_counts(dt: float, max_pulse_steps=None, max_lpc_steps=None) -> tuple[int, int]:
+    """Return ``(pulse_steps, lpc_steps)`` for a physical step ``dt``."""
+
+    # Adjust n_steps to account for the much smaller dt, simulating a similar physical duration.
+    # old_dt=0.1, new_dt=0.005*tau_ref. Ratio is ~20.
+    pulse_steps = int(3000 * (0.1 / dt))
+    if max_pulse_steps is not None:
+        pulse_steps = min(pulse_steps, max_pulse_steps)
+    lpc_steps = int(30000 * (0.1 / dt))
+    if max_lpc_steps is not None:
+        lpc_steps = min(lpc_steps, max_lpc_steps)
+    return pulse_steps, lpc_steps
+
+
+def resolve_probes(spec, grid_size: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Return the ``(rows, cols)`` of the LPC probe cells described by ``spec``.
+
+    ``None`` is the single centre cell; ``{"grid": k}`` a ``k x k`` grid of
+    evenly spaced cells; ``{"random": n, "seed": s}`` ``n`` distinct random
+    cells (``s`` defaults to ``seed``); a list of ``[row, col]`` pairs is
+    used as given.
+    """
+
+    center = grid_size // 2
+    if spec is None:
+        rows, cols = np.array([center]), np.array([center])
+    elif isinstance(spec, dict) and "grid" in spec:
+        k = int(spec["grid"])
+        if not 1 <= k <= grid_size:
+            raise ValueError(f"lpc_probes grid must be between 1 and {grid_size}")
+        axis = ((np.arange(k) + 0.5) * grid_size / k).astype(np.intp)
+        rows, cols = (a.ravel() for a in np.meshgrid(axis, axis, indexing="ij"))
+    elif isinstance(spec, dict) and "random" in spec:
+        n = int(spec["random"])
+        if not 1 <= n <= grid_size * grid_size:
+            raise ValueError("lpc_probes random count must fit the lattice")
+        rng = np.random.default_rng(spec.get("seed", seed))
+        rows, cols = np.divmod(rng.choice(grid_size * grid_size, n, replace=False), grid_size)
+    else:
+        pairs = np.asarray(spec, dtype=np.intp).reshape(-1, 2)
+        if pairs.size == 0 or pairs.min() < 0 or pairs.max() >= grid_size:
+            raise ValueError("lpc_probes cells must lie on the lattice")
+        rows, cols = pairs[:, 0], pairs[:, 1]
+    return rows.astype(np.intp), cols.astype(np.intp)
+
+
+def _pulse_profile(grid_size: int) -> np.ndarray:
+    """Unit-amplitude Gaussian pulse centred on the grid (cached per process)."""
+
+    def build():
+        center = grid_size // 2
+        x, y = np.meshgrid(np.arange(grid_size), np.arange(grid_size))
+        return np.exp(-((x - center) ** 2 + (y - center) ** 2) / 10.0)
+
+    return PRECOMPUTE.get(("pulse_profile", grid_size), build)
+
+
+def _ray_geometry(grid_size: int, num_angles: int) -> tuple[np.ndarray, np.ndarray]:
+    """Angles and flat cell indices ``(num_angles, grid_size // 2)`` of the rays.
+
+    Cell ``r`` of the ray at angle ``theta`` is
+    ``(int(center + r * sin(theta)), int(center + r * cos(theta)))``, as the
+    per-step scan computed it before (cached per process).
+    """
+
+    def build():
+        center = grid_size // 2
+        thetas = np.linspace(0, 2 * np.pi, num_angles, endpoint=False)
+        r = np.arange(center)
+        cells = np.empty((num_angles, center), dtype=np.intp)
+        for i, theta in enumerate(thetas):
+            px = (center + r * np.cos(theta)).astype(np.intp)
+            py = (center + r * np.sin(theta)).astype(np.intp)
+            cells[i] = py * grid_size + px
+        return thetas, cells
+
+    return PRECOMPUTE.get(("rays", grid_size, num_angles), build)
+
+
+def _lagrange_nodes(order: int) -> tuple[np.ndarray, tuple]:
+    """Offsets of the order-``order`` Lagrange stencil and its ``(j, x_m, x_j - x_m)`` factors."""
+
+    def build():
+        offsets = np.arange(-order // 2, -order // 2 + order + 1)
+        factors = tuple(
+            (j, int(xm), int(xj - xm))
+            for j, xj in enumerate(offsets)
+            for m, xm in enumerate(offsets)
+            if m != j
+        )
+        return offsets, factors
+
+    return PRECOMPUTE.get(("lagrange", order), build)
+
+
+class _PairLog:
+    """Append-only ``(t, r)`` log stored in a flat ``array('d')``.
+
+    Used for the pulse front detections in lean mode: 16 bytes per pair
+    instead of a tuple of two boxed numbers in a list.
+    """
+
+    def __init__(self):
+        self._buf = array("d")
+
+    def append(self, pair):
+        self._buf.extend(pair)
+
+    def __len__(self):
+        return len(self._buf) // 2
+
+    def __iter__(self):
+        it = iter(self._buf)
+        return zip(it, it)
+
+    def as_array(self) -> np.ndarray:
+        return np.array(self._buf, dtype=np.float64).reshape(-1, 2)
+
+
+def _detection_array(log) -> np.ndarray:
+    """Return the ``(t, r)`` detections of ``log`` as an ``(n, 2)`` array.
+
+    Duplicate pairs are dropped, keeping first occurrences. Detections are
+    logged once per step, so the times normally increase strictly and the
+    check is all it costs.
+    """
+
+    arr = log.as_array() if isinstance(log, _PairLog) else np.asarray(log, dtype=np.float64).reshape(-1, 2)
+    if len(arr) > 1 and not np.all(np.diff(arr[:, 0]) > 0):
+        _, first = np.unique(arr, axis=0, return_index=True)
+        arr = arr[np.sort(first)]
+    return arr
 
-from doft.utils.utils import spectral_entropy
 
 def compute_energy(Q: np.ndarray, P: np.ndarray) -> float:
     """Return total nondimensional energy of the lattice.
@@ -28,6 +196,23 @@ def compute_energy(Q: np.ndarray, P: np.ndarray) -> float:
     return float(kinetic + potential)
 
 
+def _coupling_energy(Q: np.ndarray, K: float) -> float:
+    if K == 0.0:
+        return 0.0
+    grad_x = np.roll(Q, -1, axis=0) - Q
+    grad_y = np.roll(Q, -1, axis=1) - Q
+    return 0.5 * K * np.sum(grad_x**2 + grad_y**2)
+
+
+def _memory_energy(y_states: np.ndarray | None, kernel_params: dict | None) -> float:
+    if y_states is None or not kernel_params:
+        return 0.0
+    weights = np.asarray(kernel_params.get("weights", []), dtype=float)
+    if not weights.size or y_states.shape[0] != weights.size:
+        return 0.0
+    return 0.5 * np.sum(weights[:, None, None] * y_states**2)
+
+
 def compute_energy_terms(
     Q: np.ndarray,
     P: np.ndarray,
@@ -59,18 +244,8 @@ def compute_energy_terms(
 
     kinetic = 0.5 * np.sum(P**2)
     potential = 0.5 * np.sum(Q**2)
-
-    coupling = 0.0
-    if K != 0.0:
-        grad_x = np.roll(Q, -1, axis=0) - Q
-        grad_y = np.roll(Q, -1, axis=1) - Q
-        coupling = 0.5 * K * np.sum(grad_x**2 + grad_y**2)
-
-    memory = 0.0
-    if y_states is not None and kernel_params:
-        weights = np.asarray(kernel_params.get("weights", []), dtype=float)
-        if weights.size and y_states.shape[0] == weights.size:
-            memory = 0.5 * np.sum(weights[:, None, None] * y_states**2)
+    coupling = _coupling_energy(Q, K)
+    memory = _memory_energy(y_states, kernel_params)
 
     total = kinetic + potential + coupling + memory
     return {
@@ -94,6 +269,31 @@ def compute_total_energy(
     return compute_energy_terms(Q, P, K, y_states, kernel_params)["total"]
 
 
+def _write_step_log(rows: list[dict], log_path: str) -> list[str]:
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    csv_path = f"{log_path}.csv"
+    json_path = f"{log_path}.json"
+    df.to_csv(csv_path, index=False)
+    df.to_json(json_path, orient="records")
+    return [csv_path, json_path]
+
+
+# (timer section, method) pairs shadowed by timed wrappers when instrumented
+_TIMED_SECTIONS = (
+    ("pulse", "_calculate_pulse_metrics"),
+    ("lpc", "_calculate_lpc_metrics"),
+    ("front_detection", "_detect_fronts"),
+    ("theilsen", "_fit_front_speeds"),
+    ("window_entropy", "_window_blocks"),
+    ("laplacian", "_laplacian"),
+    ("delay_interp", "_get_delayed_q_interpolated"),
+    ("energy_check", "_candidate_energy"),
+    ("snapshot", "_snapshot"),
+)
+
+
 class DOFTModel:
     def __init__(
         self,
@@ -125,10 +325,24 @@ class DOFTModel:
         max_delta_d: float = 0.25,
         interp_order: int = 3,
         ring_buffer_margin: int = 5,
+        instrument: bool = False,
+        rate_logger=None,
+        lean: bool = False,
+        pulse_early_stop: str | None = None,
+        pulse_slope_rtol: float = 0.01,
+        pulse_check_interval: int = 200,
+        snapshots: dict | None = None,
+        output_writer: BackgroundWriter | None = None,
+        lpc_probes=None,
+        lpc_parareal=None,
+        crn_experiment: str | None = None,
+        energy_stride: int = 1,
     ):
         self.grid_size = grid_size
         self.seed = seed
         self.rng = np.random.default_rng(self.seed)
+        # Common-random-numbers mode (``doft.utils.crn``): named substreams
+        self.crn_experiment = crn_experiment
 
         self.boundary_mode = boundary_mode
 
@@ -144,12 +358,7 @@ class DOFTModel:
 
         # STABILITY FIX #2: SAFE TIME STEP
         # Determine a stable dimensionless time step based on current parameters.
-        denom = self.gamma_nondim + abs(self.a_nondim) + 1.0
-        if denom > 0:
-            gamma_bound = 0.1 / denom
-        else:
-            gamma_bound = float("inf")
-        safe_dt = min(0.02, 0.1, self.tau_nondim / 50.0, gamma_bound)
+        safe_dt = stable_dt_nondim(self.a_nondim, self.tau_nondim, self.gamma_nondim)
         if dt_nondim is not None and not math.isclose(dt_nondim, safe_dt, rel_tol=0, abs_tol=1e-12):
             warnings.warn(
                 f"Requested dt_nondim={dt_nondim} replaced by stable dt_nondim={safe_dt}",
@@ -177,6 +386,8 @@ class DOFTModel:
             raise ValueError("interp_order must be between 3 and 5")
         self.interp_order = interp_order
         self.dt_max_delta_d_exceeded_count = 0
+        # Rejected IMEX step attempts per cause; each one halves dt and retries
+        self.rejections = {"nonfinite": 0, "energy": 0, "delay_slew": 0}
 
         if self.tau_dynamic_on:
             self.ring_buffer_len = int(
@@ -206,10 +417,13 @@ class DOFTModel:
             self.z_state = None
         self.Q = np.zeros((grid_size, grid_size), dtype=np.float64)
         self.P = np.zeros((grid_size, grid_size), dtype=np.float64)
+        # Scratch buffers for IMEX candidates, swapped with Q/P on acceptance
+        self._Q_next = None
+        self._P_next = None
 
         # Memory states for Prony-chain kernels (optional)
         self.kernel_params = None
-        self.y_states = None
+        self.memory = None
         if kernel_params:
             weights = np.asarray(kernel_params.get("weights", []), dtype=float)
             thetas = np.asarray(kernel_params.get("thetas", []), dtype=float)
@@ -219,13 +433,24 @@ class DOFTModel:
                 if np.any(weights < 0) or np.any(thetas <= 0):
                     raise ValueError("kernel_params must have weights >= 0 and thetas > 0")
                 self.kernel_params = {"weights": weights, "thetas": thetas}
-                self.y_states = np.zeros((weights.size, grid_size, grid_size), dtype=np.float64)
+                self.memory = PronyMemory(weights, thetas, (grid_size, grid_size))
 
         # Delayed state approximated by a single Prony variable
         self.Q_delay = np.zeros((grid_size, grid_size), dtype=np.float64)
 
-        # Keep parameter for compatibility but no longer used to size history buffers
+        # Sweep-wide budget; enforced before the runs start by
+        # ``doft.simulation.planner`` (worker count and lean mode)
         self.max_ram_bytes = max_ram_bytes
+        # Lean mode bounds the diagnostic logs and packs the pulse detections
+        self.lean = lean
+        # Optional field snapshots (``doft.utils.snapshots``): ``path`` plus
+        # ``stride``, ``region``, ``chunk_steps`` and ``compress``
+        if snapshots is not None and not snapshots.get("path"):
+            raise ValueError("snapshots require a 'path'")
+        self.snapshots = dict(snapshots) if snapshots is not None else None
+        # Every file output goes through this writer thread; ``run`` starts
+        # a private one when none is shared
+        self.output_writer = output_writer
 
         # Parameters for pulse experiment
         self.pulse_amplitude = pulse_amplitude
@@ -234,30 +459,56 @@ class DOFTModel:
         )
 
         # Select energy functional
-        if energy_mode == "basic":
-            self.energy_fn = compute_energy
-        elif energy_mode == "total" or (
-            energy_mode == "auto" and (self.a_nondim != 0.0 or self.y_states is not None)
+        if energy_mode == "total" or (
+            energy_mode == "auto" and (self.a_nondim != 0.0 or self.memory is not None)
         ):
-            self.energy_fn = lambda Q, P: compute_total_energy(
-                Q, P, self.a_nondim, self.y_states, self.kernel_params
-            )
+            self.energy_mode = "total"
         else:
-            self.energy_fn = compute_energy
+            self.energy_mode = "basic"
+        self.integrator = integrator
+        # Leapfrog: energy every ``energy_stride`` steps and the end-of-step
+        # force reused by the next step while ``_force_field is self.Q``
+        if int(energy_stride) < 1:
+            raise ValueError("energy_stride must be >= 1")
+        self.energy_stride = int(energy_stride)
+        self._force_field = None
+        self._force_cache = None
+        if integrator.lower() == "leapfrog":
+            if gamma != 0.0:
+                raise ValueError("Leapfrog integrator requires gamma = 0")
+            if kernel_params is not None:
+                raise ValueError(
+                    "Leapfrog integrator incompatible with memory terms"
+                )
+        self._bind_callables()
+        # Experimental time-parallel LPC phase (``doft.models.parareal``)
+        self.lpc_parareal = resolve_parareal(lpc_parareal)
+        if self.lpc_parareal is not None:
+            check_model(self)
 
         # Energy monitoring for source-free simulations
-        self.energy_log: list[float] = []
+        self.energy_log = self._new_log()
         self.last_energy = self.energy_fn(self.Q, self.P)
 
         # Track scaling applied to the fields to avoid overflow
         self.scale_threshold = 1e6
         self.scale_accum = 1.0
-        self.scale_log: list[float] = []
+        self.scale_log = self._new_log()
         # Track maximum change in delay per step
-        self.delta_d_log: list[float] = []
+        self.delta_d_log = self._new_log()
 
         # Optional caps for expensive diagnostic runs
         self.max_pulse_steps = max_pulse_steps
+        # Optional early end of the pulse phase: "saturation" stops once every
+        # front has reached the boundary, "slope" also stops once the front
+        # speeds agree to ``pulse_slope_rtol`` between two checks.
+        if pulse_early_stop not in (None, "saturation", "slope"):
+            raise ValueError("pulse_early_stop must be None, 'saturation' or 'slope'")
+        self.pulse_early_stop = pulse_early_stop
+        self.pulse_slope_rtol = pulse_slope_rtol
+        self.pulse_check_interval = max(1, int(pulse_check_interval))
+        # Cells sampled every LPC step (``resolve_probes``); the centre by default
+        self.probe_rows, self.probe_cols = resolve_probes(lpc_probes, grid_size, seed)
         if lpc_duration_physical is not None:
             self.max_lpc_steps = math.ceil(lpc_duration_physical / self.dt)
         else:
@@ -272,28 +523,87 @@ class DOFTModel:
         self._K_m2 = 0.0
         self._K_count = 0
 
-        self.integrator = integrator
-        # Map integrator to the appropriate stepping function
-        integ_lower = integrator.lower()
-        if integ_lower == "leapfrog":
-            if gamma != 0.0:
-                raise ValueError("Leapfrog integrator requires gamma = 0")
-            if kernel_params is not None:
-                raise ValueError(
-                    "Leapfrog integrator incompatible with memory terms"
-                )
+        # Optional throughput telemetry (``doft.utils.utils.RateLogger``)
+        self.rate_logger = rate_logger
+
+        # Optional per-section timing. Hot methods are shadowed by timed
+        # wrappers on the instance, so the uninstrumented path is unchanged.
+        self.timer = PhaseTimer() if instrument else None
+        if self.timer is not None:
+            for name, attr in _TIMED_SECTIONS:
+                setattr(self, attr, self.timer.wrap(name, getattr(self, attr)))
 
+    def _bind_callables(self):
+        """Set the energy functional and the stepping function."""
+
+        if self.energy_mode == "total":
+            self.energy_fn = lambda Q, P: compute_total_energy(
+                Q, P, self.a_nondim, self._memory_states(), self.kernel_params
+            )
+        else:
+            self.energy_fn = compute_energy
+        # Map integrator to the appropriate stepping function
+        if self.integrator.lower() == "leapfrog":
             def _step(t_idx, self=self):
                 return self._step_leapfrog(t_idx)
-
-            self._step = _step
         else:
             def _step(t_idx, self=self):
                 return self._step_imex(t_idx)
+        self._step = _step
+
+    def __getstate__(self):
+        """Picklable state for worker processes (``doft.models.parareal``).
+
+        Closures, timers, telemetry and the output writer stay behind: a
+        copy steps and measures exactly like the original but reports
+        nothing.
+        """
+
+        state = self.__dict__.copy()
+        for attr in ("energy_fn", "_step", "rate_logger", "output_writer"):
+            state.pop(attr, None)
+        for _, attr in _TIMED_SECTIONS:
+            state.pop(attr, None)
+        state["timer"] = None
+        state["snapshots"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.rate_logger = None
+        self.output_writer = None
+        self._bind_callables()
+
+    def _new_log(self):
+        return deque(maxlen=LEAN_LOG_LEN) if self.lean else []
+
+    def _open_snapshots(self, phase: str) -> SnapshotWriter | None:
+        """Return the snapshot writer of ``phase`` (``None`` when disabled).
+
+        Each phase gets its own store under ``snapshots['path']``; frame
+        ``step`` holds the fields after step ``step`` of that phase.
+        """
 
-            self._step = _step
+        if self.snapshots is None:
+            return None
+        cfg = self.snapshots
+        fields = ["Q", "P", "tau"] if self.tau_dynamic_on else ["Q", "P"]
+        return SnapshotWriter(
+            os.path.join(cfg["path"], phase),
+            fields,
+            self.Q.shape,
+            stride=cfg.get("stride", 1),
+            region=cfg.get("region"),
+            chunk_steps=cfg.get("chunk_steps", 64),
+            compress=cfg.get("compress", True),
+            attrs={"phase": phase, "dt": self.dt, "seed": self.seed, "tau_units": "tau_ref"},
+            writer=self.output_writer,
+        )
+
+    def _snapshot(self, writer: SnapshotWriter, t_idx: int):
+        writer.capture(t_idx, t_idx * self.dt, {"Q": self.Q, "P": self.P, "tau": self.prev_tau})
 
-    def _compute_dynamic_tau(self) -> np.ndarray:
+    def _compute_dynamic_tau(self, G_val: np.ndarray | None = None):
         """Compute per-cell delay ``tau_ij(t)`` with bounds.
 
         The function implements the direct formulation
@@ -302,18 +612,24 @@ class DOFTModel:
         ``dot z = -lambda_z (z - G)`` and ``tau = tau0 + alpha_delay * z``.
 
         ``G`` is presently chosen as the local energy density
-        ``0.5 * (Q**2 + P**2)`` which depends on both ``q`` and ``qdot``.
+        ``0.5 * (Q**2 + P**2)`` which depends on both ``q`` and ``qdot``; it
+        may be passed in when the caller already holds it.
+
+        The model state is left untouched: the candidate ``(tau, z)`` pair is
+        returned and only stored into ``prev_tau``/``z_state`` once the step
+        using it is accepted.
         """
 
         base = self.tau_nondim
         # Local state measure G(q, qdot)
-        G_val = 0.5 * (self.Q ** 2 + self.P ** 2)
+        if G_val is None:
+            G_val = 0.5 * (self.Q ** 2 + self.P ** 2)
 
+        z_new = None
         if self.lambda_z != 0.0:
-            if self.z_state is None:
-                self.z_state = np.zeros_like(self.Q)
-            self.z_state += self.dt_nondim * (-self.lambda_z * (self.z_state - G_val))
-            delta_tau = self.alpha_delay * self.z_state
+            z_prev = self.z_state if self.z_state is not None else np.zeros_like(self.Q)
+            z_new = z_prev + self.dt_nondim * (-self.lambda_z * (z_prev - G_val))
+            delta_tau = self.alpha_delay * z_new
         else:
             delta_tau = self.alpha_delay * G_val
 
@@ -323,15 +639,13 @@ class DOFTModel:
         tau = base + delta_tau
 
         # Slew-rate bound (approximate omega_loc ~ 1)
-        if self.prev_tau is None:
-            self.prev_tau = np.full_like(self.Q, base)
-        tau_dot = (tau - self.prev_tau) / self.dt_nondim
+        prev_tau = self.prev_tau if self.prev_tau is not None else np.full_like(self.Q, base)
+        tau_dot = (tau - prev_tau) / self.dt_nondim
         max_tau_dot = self.eta_slew
         tau_dot = np.clip(tau_dot, -max_tau_dot, max_tau_dot)
-        tau = self.prev_tau + tau_dot * self.dt_nondim
-        self.prev_tau = tau
+        tau = prev_tau + tau_dot * self.dt_nondim
 
-        return tau
+        return tau, z_new
 
     def _get_delayed_q_interpolated(self, tau: np.ndarray, t_idx: int | None = None):
         """Return delayed field along with delay-step diagnostics.
@@ -352,7 +666,8 @@ class DOFTModel:
         tuple
             ``(field, delay_steps, delta_d)`` where ``field`` is the delayed
             field, ``delay_steps`` the delay in units of ``dt`` (per cell) and
-            ``delta_d`` the maximum absolute change since the previous call.
+            ``delta_d`` the maximum absolute change since the last accepted
+        step. The caller commits ``delay_steps`` and logs ``delta_d``.
         """
 
         if not self.tau_dynamic_on or self.q_ring is None:
@@ -368,22 +683,19 @@ class DOFTModel:
         order = int(self.interp_order)
         if order < 3 or order > 5:
             raise ValueError("interp_order must be between 3 and 5")
-        offsets = np.arange(-order // 2, -order // 2 + order + 1)
+        offsets, factors = _lagrange_nodes(order)
         idxs = (i0[None, ...] + offsets[:, None, None]) % self.ring_buffer_len
-        samples = np.take(self.q_ring, idxs, axis=0, mode="wrap")
+        # Per-cell gather: sample k of cell (i, j) is q_ring[idxs[k, i, j], i, j]
+        rows, cols = np.indices(i0.shape, sparse=True)
+        samples = self.q_ring[idxs, rows, cols]
 
         weights = np.ones_like(samples, dtype=np.float64)
-        for j, xj in enumerate(offsets):
-            for m, xm in enumerate(offsets):
-                if m == j:
-                    continue
-                weights[j] *= (frac - xm) / (xj - xm)
+        for j, xm, dx in factors:
+            weights[j] *= (frac - xm) / dx
         field = np.sum(weights * samples, axis=0)
 
         abs_delta = np.abs(delay_steps - self._prev_delay_steps)
         delta_d = float(np.max(abs_delta))
-        self.delta_d_log.append(delta_d)
-        self._prev_delay_steps = delay_steps
         return field, delay_steps, delta_d
 
     def _laplacian(self, field: np.ndarray, mode: str | None = None) -> np.ndarray:
@@ -433,132 +745,215 @@ class DOFTModel:
         for the coupled ``(Q, P)`` system.
         """
 
-        Q_prev = self.Q.copy()
-        P_prev = self.P.copy()
         energy_prev = self.last_energy
 
-        while True:
-            tau = (
-                self._compute_dynamic_tau()
-                if self.tau_dynamic_on
-                else np.full_like(self.Q, self.tau_nondim)
+        # The step is transactional: each attempt builds its candidate in
+        # scratch buffers and no model state (fields, delay filter, ring
+        # buffer, logs) changes until the attempt is accepted. Terms that do
+        # not depend on dt are evaluated once and reused by every retry.
+        Q_new, P_new = self._scratch_fields()
+        G_val = None
+        K_term = None
+        memory_term = 0.0
+        if self.memory is not None:
+            memory_term = self.memory.force
+        if self.tau_dynamic_on:
+            G_val = 0.5 * (self.Q ** 2 + self.P ** 2)
+        else:
+            # Static delay: the delayed field and its coupling term are fixed
+            Q_delayed, delay_steps, delta_d = self._get_delayed_q_interpolated(
+                self.tau_nondim, t_idx
             )
-            Q_delayed, delay_steps, delta_d = self._get_delayed_q_interpolated(tau, t_idx)
-
-            if self.tau_dynamic_on and delta_d >= self.max_delta_d:
-                self.dt_max_delta_d_exceeded_count += 1
-                new_dt = self.dt_nondim * 0.5
-                if new_dt < self.min_dt_nondim:
-                    print(
-                        f"ERROR: |Δd|={delta_d} exceeded and minimum dt reached. Aborting step."
-                    )
-                    self.dt_nondim = self.min_dt_nondim
-                    self.dt = self.dt_nondim * self.tau_ref
-                    break
-                self.dt_nondim = new_dt
-                self.dt = self.dt_nondim * self.tau_ref
-                continue
-
-            # Linear coupling term evaluated explicitly from the delayed field
             K_term = self.a_nondim * self._laplacian(Q_delayed)
 
-            # Placeholder for possible nonlinear contributions (explicit)
-            nonlinear_term = 0.0
+        while True:
+            attempt_t0 = time.perf_counter() if self.timer is not None else 0.0
+            tau = z_new = None
+            if self.tau_dynamic_on:
+                tau, z_new = self._compute_dynamic_tau(G_val)
+                Q_delayed, delay_steps, delta_d = self._get_delayed_q_interpolated(tau, t_idx)
+
+                if delta_d >= self.max_delta_d:
+                    self.dt_max_delta_d_exceeded_count += 1
+                    if not self._reject_attempt("delay_slew", attempt_t0):
+                        print(
+                            f"ERROR: |Δd|={delta_d} exceeded and minimum dt reached. Aborting step."
+                        )
+                        break
+                    continue
 
-            memory_term = 0.0
-            if self.y_states is not None:
-                memory_term = np.sum(self.y_states, axis=0)
+                # Linear coupling term evaluated explicitly from the delayed field
+                K_term = self.a_nondim * self._laplacian(Q_delayed)
 
             # IMEX update: implicit in the linear -Q and -gamma P terms,
-            # explicit for K_term, memory_term, and nonlinear_term
-            numerator = (
-                self.P
-                + self.dt_nondim * (K_term + nonlinear_term + memory_term - self.Q)
-            )
+            # explicit for K_term and memory_term (no nonlinear contribution
+            # at present). Same operation order as the unfused expression
+            #   P_new = (P + dt * (K_term + memory_term - Q)) / denom
             denom = 1.0 + self.dt_nondim * self.gamma_nondim + self.dt_nondim**2
-            P_new = numerator / denom
-            Q_new = self.Q + self.dt_nondim * P_new
+            np.add(K_term, memory_term, out=P_new)
+            P_new -= self.Q
+            P_new *= self.dt_nondim
+            P_new += self.P
+            P_new /= denom
+            np.multiply(P_new, self.dt_nondim, out=Q_new)
+            Q_new += self.Q
+
+            # The norms double as the finiteness check: any NaN/inf entry (or
+            # an overflow of the sum of squares) makes them non-finite.
+            norm_Q = float(np.linalg.norm(Q_new))
+            norm_P = float(np.linalg.norm(P_new))
+            if not (math.isfinite(norm_Q) and math.isfinite(norm_P)):
+                print(
+                    f"WARNING: Non-finite values encountered at step {t_idx}. "
+                    f"Reducing dt_nondim from {self.dt_nondim}"
+                )
+                if not self._reject_attempt("nonfinite", attempt_t0):
+                    break
+                continue
 
-            # Compute norms and rescale if necessary to avoid overflow
-            norm_Q = np.linalg.norm(Q_new)
-            norm_P = np.linalg.norm(P_new)
+            # Rescale if necessary to avoid overflow; the cached terms are
+            # linear (G quadratic) in the fields and are rescaled with them
             scale = max(norm_Q, norm_P)
             if scale > self.scale_threshold:
                 Q_new /= scale
                 P_new /= scale
+                norm_Q /= scale
+                norm_P /= scale
+                self.Q /= scale
+                self.P /= scale
                 self.Q_delay /= scale
                 if self.q_ring is not None:
                     self.q_ring /= scale
-                if self.y_states is not None:
-                    self.y_states /= scale
-                Q_prev /= scale
-                P_prev /= scale
+                if self.memory is not None:
+                    # memory_term is the engine's force buffer, rescaled here
+                    self.memory.rescale(scale)
+                if self.tau_dynamic_on:
+                    G_val /= scale ** 2
+                else:
+                    K_term /= scale
                 self.scale_accum *= scale
+                self._invalidate_force()
                 self.last_energy /= scale ** 2
                 energy_prev = self.last_energy
 
-            if self.y_states is not None:
-                weights = self.kernel_params["weights"][:, None, None]
-                thetas = self.kernel_params["thetas"][:, None, None]
-                exp_fac = np.exp(-self.dt_nondim / thetas)
-                y_new = exp_fac * self.y_states + weights * (1.0 - exp_fac) * P_prev
-            else:
-                y_new = None
+            y_new = None
+            if self.memory is not None:
+                y_new = self.memory.propose(self.P, self.dt_nondim)
 
-            energy_new = compute_total_energy(
-                Q_new, P_new, self.a_nondim, y_new, self.kernel_params
-            )
+            energy_new = self._candidate_energy(Q_new, P_new, y_new, norm_Q, norm_P)
             energy_prev_phys = energy_prev * self.scale_accum ** 2
             energy_new_phys = energy_new * self.scale_accum ** 2
 
-            if (
-                np.isfinite(P_new).all()
-                and np.isfinite(Q_new).all()
-                and energy_new_phys <= energy_prev_phys + 1e-12
-            ):
-                self.P, self.Q = P_new, Q_new
-                self.y_states = y_new
+            if energy_new_phys <= energy_prev_phys + 1e-12:
+                # Commit: swap the candidate in; the old fields become scratch
+                self._Q_next, self._P_next = self.Q, self.P
+                self.Q, self.P = Q_new, P_new
+                if self.memory is not None:
+                    self.memory.commit()
                 self.last_energy = energy_new
                 if self.tau_dynamic_on and self.q_ring is not None:
                     self.q_ring[self._ring_index] = self.Q
                     self._ring_index = (self._ring_index + 1) % self.ring_buffer_len
                     self._prev_delay_steps = delay_steps
+                    self.delta_d_log.append(delta_d)
+                    self.prev_tau = tau
+                    if z_new is not None:
+                        self.z_state = z_new
                 else:
                     alpha = self.dt_nondim / self.tau_nondim if self.tau_nondim > 0 else 0.0
-                    self.Q_delay = (self.Q_delay + alpha * self.Q) / (1.0 + alpha)
+                    self.Q_delay += alpha * self.Q
+                    self.Q_delay /= 1.0 + alpha
                 self.energy_log.append(energy_new_phys)
                 self.scale_log.append(self.scale_accum)
                 if self.log_steps:
                     self._log_step(t_idx)
                 break
 
-            if not (np.isfinite(P_new).all() and np.isfinite(Q_new).all()):
-                print(
-                    f"WARNING: Non-finite values encountered at step {t_idx}. "
-                    f"Reducing dt_nondim from {self.dt_nondim}"
-                )
-            else:
-                print(
-                    f"WARNING: Energy increased from {energy_prev} to {energy_new} at step {t_idx}. "
-                    f"Reducing dt_nondim from {self.dt_nondim}"
-                )
+            print(
+                f"WARNING: Energy increased from {energy_prev} to {energy_new} at step {t_idx}. "
+                f"Reducing dt_nondim from {self.dt_nondim}"
+            )
+            if not self._reject_attempt("energy", attempt_t0):
+                break
+
+    def _scratch_fields(self):
+        """Return the ``(Q, P)`` scratch buffers used for IMEX candidates."""
 
-            self.P = P_prev.copy()
-            self.Q = Q_prev.copy()
-            self.last_energy = energy_prev
-            new_dt = self.dt_nondim * 0.5
-            if new_dt < self.min_dt_nondim:
+        if self._Q_next is None or self._Q_next.shape != self.Q.shape or self._Q_next is self.Q:
+            self._Q_next = np.empty(self.Q.shape, dtype=np.float64)
+        if self._P_next is None or self._P_next.shape != self.P.shape or self._P_next is self.P:
+            self._P_next = np.empty(self.P.shape, dtype=np.float64)
+        return self._Q_next, self._P_next
+
+    def _reject_attempt(self, cause: str, attempt_t0: float) -> bool:
+        """Count a rejected IMEX attempt and halve ``dt``.
+
+        Returns ``False`` when the halved step would fall below
+        ``min_dt_nondim``; ``dt`` is then pinned to the minimum and the caller
+        aborts the step, leaving the state unchanged.
+        """
+
+        self.rejections[cause] += 1
+        if self.timer is not None:
+            self.timer.add("rollback", time.perf_counter() - attempt_t0)
+        new_dt = self.dt_nondim * 0.5
+        if new_dt < self.min_dt_nondim:
+            if cause != "delay_slew":
                 print(
                     f"ERROR: Minimum dt_nondim {self.min_dt_nondim} reached. "
                     "Aborting step."
                 )
-                self.dt_nondim = self.min_dt_nondim
-                self.dt = self.dt_nondim * self.tau_ref
-                break
-
-            self.dt_nondim = new_dt
+            self.dt_nondim = self.min_dt_nondim
             self.dt = self.dt_nondim * self.tau_ref
+            return False
+        self.dt_nondim = new_dt
+        self.dt = self.dt_nondim * self.tau_ref
+        return True
+
+    @property
+    def rollback_count(self) -> int:
+        """Total rejected IMEX attempts across all causes."""
+
+        return sum(self.rejections.values())
+
+    def _candidate_energy(self, Q_new, P_new, y_new, norm_Q, norm_P) -> float:
+        """Total energy of a candidate IMEX state for the stability guard.
+
+        Equivalent to :func:`compute_total_energy`, but the kinetic and
+        potential parts come from the norms the step has already computed.
+        """
+
+        return (
+            0.5 * (norm_P ** 2 + norm_Q ** 2)
+            + _coupling_energy(Q_new, self.a_nondim)
+            + (self.memory.energy(y_new) if y_new is not None else 0.0)
+        )
+
+    def _memory_states(self) -> np.ndarray | None:
+        return self.memory.y if self.memory is not None else None
 
+    @property
+    def y_states(self) -> np.ndarray | None:
+        """Prony memory states ``(M, N, N)``, or ``None`` without a kernel.
+
+        The returned array may be written to in place, so the engine's cached
+        force sum is invalidated on every access; the stepping code reads
+        ``self.memory`` directly instead.
+        """
+
+        if self.memory is None:
+            return None
+        self.memory.invalidate()
+        return self.memory.y
+
+    @y_states.setter
+    def y_states(self, value):
+        if self.memory is None:
+            if value is not None:
+                raise ValueError("y_states requires kernel_params")
+            return
+        self.memory.y[...] = value
+        self.memory.invalidate()
 
     def _step_leapfrog(self, t_idx: int):
         """Advance the state using a Leapfrog (Störmer-Verlet) step.
@@ -567,33 +962,51 @@ class DOFTModel:
         in the conservative case with **no** damping or memory effects.
         It requires ``gamma = 0`` and ``kernel_params`` set to ``None``.
 
+        The force at the end of a step is the force at the start of the
+        next one (first same as last), so it is kept with the field it was
+        computed from and reused while ``self.Q`` is still that array: one
+        Laplacian per step. Reassigning ``self.Q`` drops it; code that
+        changes ``self.Q`` in place must call :meth:`_invalidate_force`.
+        The energy is evaluated and logged every ``energy_stride`` steps.
+
         Parameters
         ----------
         t_idx:
-            Current step index (unused, kept for signature parity).
+            Current step index; selects the energy evaluations.
         """
 
         if self.gamma_nondim != 0.0:
             raise ValueError("Leapfrog integrator requires gamma = 0")
-        if self.y_states is not None:
+        if self.memory is not None:
             raise ValueError("Leapfrog integrator incompatible with memory terms")
 
-        def force(field: np.ndarray) -> np.ndarray:
-            return self.a_nondim * self._laplacian(field) - field
-
-        F_n = force(self.Q)
+        if self._force_field is self.Q:
+            F_n = self._force_cache
+        else:
+            F_n = self._leapfrog_force(self.Q)
         P_half = self.P + 0.5 * self.dt_nondim * F_n
         Q_new = self.Q + self.dt_nondim * P_half
-        F_new = force(Q_new)
+        F_new = self._leapfrog_force(Q_new)
         P_new = P_half + 0.5 * self.dt_nondim * F_new
 
         self.Q = Q_new
         self.P = P_new
-        self.last_energy = self.energy_fn(self.Q, self.P)
-        self.energy_log.append(self.last_energy)
+        self._force_field, self._force_cache = Q_new, F_new
+        if t_idx % self.energy_stride == 0:
+            self.last_energy = self.energy_fn(self.Q, self.P)
+            self.energy_log.append(self.last_energy)
         if self.log_steps:
             self._log_step(t_idx)
 
+    def _leapfrog_force(self, field: np.ndarray) -> np.ndarray:
+        return self.a_nondim * self._laplacian(field) - field
+
+    def _invalidate_force(self):
+        """Drop the Leapfrog force cached for the current ``self.Q``."""
+
+        self._force_field = None
+        self._force_cache = None
+
     def _log_step(self, t_idx: int):
         """Store per-step energy and LPC metrics if logging is enabled."""
 
@@ -601,7 +1014,7 @@ class DOFTModel:
             self.Q,
             self.P,
             self.a_nondim,
-            self.y_states,
+            self._memory_states(),
             self.kernel_params,
         )
         K_metric = spectral_entropy(self.Q.flatten())
@@ -635,11 +1048,94 @@ class DOFTModel:
 
         if not self.log_steps or not self.step_log:
             return
-        df = pd.DataFrame(self.step_log)
-        csv_path = f"{self.log_path}.csv"
-        json_path = f"{self.log_path}.json"
-        df.to_csv(csv_path, index=False)
-        df.to_json(json_path, orient="records")
+        writer = self.output_writer or BackgroundWriter()
+        writer.submit(_write_step_log, list(self.step_log), self.log_path)
+        if writer is not self.output_writer:
+            writer.close()
+
+    def _report_progress(self, step: int, force: bool = False):
+        """Forward the integrator state to ``self.rate_logger``."""
+
+        self.rate_logger.tick(
+            step,
+            force=force,
+            dt_nondim=self.dt_nondim,
+            scale_accum=self.scale_accum,
+            rollbacks=self.rollback_count,
+        )
+
+    def _detect_fronts(self, t_now, thetas, thresholds, center, max_r_so_far, front_detections):
+        """Advance the outermost above-threshold radius along every ray.
+
+        The rays are read in one gather through the cached cell indices of
+        :func:`_ray_geometry`.
+        """
+
+        _, cells = _ray_geometry(self.grid_size, len(thetas))
+        along = self.Q.ravel()[cells]
+        for i, theta in enumerate(thetas):
+            for thr_idx, thr in enumerate(thresholds):
+                r_start = max_r_so_far[(theta, thr_idx)]
+                above = np.flatnonzero(along[i, r_start:] > thr)
+                if above.size:
+                    max_r_so_far[(theta, thr_idx)] = r_start + int(above[-1])
+                rmax = max_r_so_far[(theta, thr_idx)]
+                if rmax > 0:
+                    front_detections[(theta, thr_idx)].append((t_now, rmax))
+
+    def _pulse_should_stop(self, t_idx, center, max_r_so_far, front_detections, state):
+        """Return why the pulse phase can end after step ``t_idx``, or ``None``.
+
+        Once every ray has its front at ``center - 1`` no further detection
+        can change. Note that the steps after that point are not duplicates
+        (each adds ``(t, rmax)`` at a new ``t``); they flatten the tail of the
+        radius series, so stopping early is opt-in.
+        """
+
+        if all(r >= center - 1 for r in max_r_so_far.values()):
+            return "saturation"
+        if self.pulse_early_stop != "slope" or (t_idx + 1) % self.pulse_check_interval:
+            return None
+
+        # Speed estimate on at most 256 evenly spaced detections per ray
+        rays = []
+        for dets in front_detections.values():
+            dets = _detection_array(dets)
+            if len(dets) < 10:
+                return None
+            rays.append(dets[np.linspace(0, len(dets) - 1, min(len(dets), 256)).astype(int)])
+        mean_c = float(np.mean(self._fit_front_speeds(rays).slope))
+        prev, state["mean_c"] = state.get("mean_c"), mean_c
+        # A front that has not moved yet (zero speed) is not a stable estimate
+        if prev and math.isfinite(mean_c) and abs(mean_c - prev) <= self.pulse_slope_rtol * abs(prev):
+            return "slope"
+        return None
+
+    def _fit_front_speeds(self, rays):
+        """Theil-Sen fits of radius vs time for a list of ``(n, 2)`` detection arrays.
+
+        Returns a ``TheilSenResult`` of per-ray arrays; all rays are fitted
+        in one batched call.
+        """
+
+        lengths = np.array([len(dets) for dets in rays], dtype=np.int64)
+        times = np.zeros((len(rays), int(lengths.max(initial=0))))
+        dists = np.zeros_like(times)
+        for row, dets in enumerate(rays):
+            times[row, :len(dets)] = dets[:, 0]
+            dists[row, :len(dets)] = dets[:, 1]
+        return theilslopes_batch(dists, times, lengths, 0.95)
+
+    def _noise_rng(self, stream: str) -> np.random.Generator:
+        """Generator for the noise ``stream``.
+
+        In CRN mode a fresh substream that depends only on the seed and
+        :attr:`crn_experiment`, else the shared :attr:`rng`.
+        """
+
+        if self.crn_experiment is None:
+            return self.rng
+        return rng_stream(self.seed, self.crn_experiment, stream)
 
     def _calculate_pulse_metrics(self, n_steps, noise_std: float = 0.0):
         r"""Estimate wave-front speed using multiple noise-relative thresholds.
@@ -663,7 +1159,7 @@ class DOFTModel:
             self._ring_index = 0
             self._prev_delay_steps = self.tau_nondim / self.dt_nondim if self.dt_nondim > 0 else 0.0
         if noise_std > 0.0:
-            self.Q += self.rng.normal(0.0, noise_std, size=self.Q.shape)
+            self.Q += self._noise_rng("pulse_noise").normal(0.0, noise_std, size=self.Q.shape)
 
         # Noise floor and thresholds relative to it
         xi_floor = float(np.std(self.Q))
@@ -673,19 +1169,17 @@ class DOFTModel:
         center = self.grid_size // 2
 
         # Inject Gaussian pulse
-        x, y = np.meshgrid(np.arange(self.grid_size), np.arange(self.grid_size))
-        self.Q += self.pulse_amplitude * np.exp(
-            -((x - center) ** 2 + (y - center) ** 2) / 10.0
-        )
+        self.Q += self.pulse_amplitude * _pulse_profile(self.grid_size)
+        self._invalidate_force()
         # Update stored energy after pulse injection so the stability guard
         # does not interpret the added pulse energy as a spurious increase.
         self.last_energy = self.energy_fn(self.Q, self.P)
 
         num_angles = 16
-        thetas = np.linspace(0, 2 * np.pi, num_angles, endpoint=False)
+        thetas, _ = _ray_geometry(self.grid_size, num_angles)
 
         front_detections = {
-            (theta, thr_idx): []
+            (theta, thr_idx): _PairLog() if self.lean else []
             for theta in thetas
             for thr_idx in range(len(thresholds))
         }
@@ -695,21 +1189,38 @@ class DOFTModel:
             for thr_idx in range(len(thresholds))
         }
 
+        rate_logger = self.rate_logger
+        if rate_logger is not None:
+            rate_logger.reset(phase="pulse")
+        snap = self._open_snapshots("pulse")
+        loop_t0 = time.perf_counter() if self.timer is not None else 0.0
+        steps_run, stop_reason, stop_state = n_steps, "none", {}
         for t_idx in range(n_steps):
             self._step(t_idx)
+            if snap is not None and snap.due(t_idx):
+                self._snapshot(snap, t_idx)
             t_now = t_idx * self.dt
-            for theta in thetas:
-                cos_t, sin_t = np.cos(theta), np.sin(theta)
-                for thr_idx, thr in enumerate(thresholds):
-                    r_start = max_r_so_far[(theta, thr_idx)]
-                    for r in range(r_start, center):
-                        px = int(center + r * cos_t)
-                        py = int(center + r * sin_t)
-                        if self.Q[py, px] > thr:
-                            max_r_so_far[(theta, thr_idx)] = r
-                    rmax = max_r_so_far[(theta, thr_idx)]
-                    if rmax > 0:
-                        front_detections[(theta, thr_idx)].append((t_now, rmax))
+            self._detect_fronts(t_now, thetas, thresholds, center, max_r_so_far, front_detections)
+            if rate_logger is not None:
+                self._report_progress(t_idx + 1)
+            if self.pulse_early_stop is not None:
+                reason = self._pulse_should_stop(
+                    t_idx, center, max_r_so_far, front_detections, stop_state
+                )
+                if reason is not None:
+                    steps_run, stop_reason = t_idx + 1, reason
+                    break
+        if self.timer is not None:
+            self.timer.add("pulse_loop", time.perf_counter() - loop_t0, steps_run)
+        if snap is not None:
+            snap.close()
+        if rate_logger is not None:
+            self._report_progress(steps_run, force=True)
+        stop_metrics = {
+            'pulse_steps_run': steps_run,
+            'pulse_steps_saved': n_steps - steps_run,
+            'pulse_stop_reason': stop_reason,
+        }
 
         c_thetas = []
         c_thetas_ci_low = []
@@ -720,24 +1231,30 @@ class DOFTModel:
         ci_low_by_thr = {thr_idx: [] for thr_idx in range(len(thresholds))}
         ci_high_by_thr = {thr_idx: [] for thr_idx in range(len(thresholds))}
 
+        # Fit every ray with enough detections in one batch
+        rays = {}
+        for theta in thetas:
+            for thr_idx in range(len(thresholds)):
+                detections = _detection_array(front_detections[(theta, thr_idx)])
+                if len(detections) >= 10:
+                    rays[(theta, thr_idx)] = detections
+        fits = self._fit_front_speeds(list(rays.values())) if rays else None
+        fit_of = {key: (fits.slope[i], fits.low_slope[i], fits.high_slope[i]) for i, key in enumerate(rays)}
+
         for theta in thetas:
             c_thr = []
             ci_lo_thr = []
             ci_hi_thr = []
             for thr_idx in range(len(thresholds)):
-                detections = np.array(
-                    list(dict.fromkeys(front_detections[(theta, thr_idx)]))
-                )
-                if len(detections) < 10:
+                if (theta, thr_idx) not in fit_of:
                     continue
-                times, dists = detections[:, 0], detections[:, 1]
-                res = theilslopes(dists, times, 0.95)
-                c_thr.append(res[0])
-                ci_lo_thr.append(res[2])
-                ci_hi_thr.append(res[3])
-                c_by_thr[thr_idx].append(res[0])
-                ci_low_by_thr[thr_idx].append(res[2])
-                ci_high_by_thr[thr_idx].append(res[3])
+                c, lo, hi = (float(v) for v in fit_of[(theta, thr_idx)])
+                c_thr.append(c)
+                ci_lo_thr.append(lo)
+                ci_hi_thr.append(hi)
+                c_by_thr[thr_idx].append(c)
+                ci_low_by_thr[thr_idx].append(lo)
+                ci_high_by_thr[thr_idx].append(hi)
             if c_thr:
                 c_thetas.append(float(np.mean(c_thr)))
                 c_thetas_ci_low.append(float(np.mean(ci_lo_thr)))
@@ -756,6 +1273,7 @@ class DOFTModel:
                 'ceff_iso_z': 0.0,
                 'ceff_iso_diag': 0.0,
                 'ceff_pulse_by_thr': [0.0 for _ in thresholds],
+                **stop_metrics,
             }
 
         c_thetas = np.array(c_thetas)
@@ -793,19 +1311,71 @@ class DOFTModel:
             'ceff_iso_z': c_z,
             'ceff_iso_diag': c_diag,
             'ceff_pulse_by_thr': c_by_thr_list,
+            **stop_metrics,
         }
 
+    def _window_blocks(self, time_series, win_size, overlap):
+        """Spectral entropy per window and its change since the last valid one.
+
+        ``time_series`` is ``(n_steps,)`` or ``(n_steps, n_probes)``; the
+        windows of every probe are evaluated in one batch and each row
+        carries its ``probe_id``. Returns ``(block_data, block_skipped)``;
+        windows with non-finite samples are recorded with ``NaN`` metrics and
+        counted as skipped.
+        """
+
+        series = np.asarray(time_series, dtype=np.float64)
+        if series.ndim == 1:
+            series = series[:, None]
+        n_probes = series.shape[1]
+        step = win_size - overlap
+        block_data = []
+        block_skipped = 0
+        num_windows = (series.shape[0] - win_size) // step + 1
+        # (n_probes, num_windows, win_size) strided view over probe-major rows
+        windows = np.lib.stride_tricks.sliding_window_view(
+            np.ascontiguousarray(series.T), win_size, axis=1
+        )[:, ::step][:, :num_windows]
+        windows = windows.reshape(n_probes * num_windows, win_size)
+        finite = np.isfinite(windows).all(axis=1)
+        K_all = spectral_entropy_batch(windows)
+        for probe in range(n_probes):
+            last_K = None
+            for i in range(num_windows):
+                j = probe * num_windows + i
+                if not finite[j]:
+                    block_skipped += 1
+                    block_data.append({'probe_id': probe,
+                                        'window_id': i,
+                                        'K_metric': np.nan,
+                                        'deltaK': np.nan,
+                                        'block_skipped': 1})
+                    continue
+                K_metric = float(K_all[j])
+                deltaK = K_metric - last_K if last_K is not None else 0.0
+                block_data.append({'probe_id': probe,
+                                    'window_id': i,
+                                    'K_metric': K_metric,
+                                    'deltaK': deltaK,
+                                    'block_skipped': 0})
+                last_K = K_metric
+        return block_data, block_skipped
+
     def _calculate_lpc_metrics(self, n_steps):
-        self.Q = self.rng.normal(0, 0.1, self.Q.shape); self.P.fill(0.0); self.Q_delay.fill(0.0)
+        import pandas as pd
+
+        self.Q = self._noise_rng("lpc_init").normal(0, 0.1, self.Q.shape); self.P.fill(0.0); self.Q_delay.fill(0.0)
+        self._invalidate_force()
         if self.q_ring is not None:
             self.q_ring.fill(0.0)
             self._ring_index = 0
             self._prev_delay_steps = self.tau_nondim / self.dt_nondim if self.dt_nondim > 0 else 0.0
-        center = self.grid_size // 2
-        time_series = np.zeros(n_steps)
-        for t_idx in range(n_steps):
-            self._step(t_idx)
-            time_series[t_idx] = self.Q[center, center]
+        probe_idx = np.ravel_multi_index((self.probe_rows, self.probe_cols), self.Q.shape)
+        parareal = reference = None
+        if self.lpc_parareal is not None:
+            time_series, parareal, reference = parareal_lpc_series(self, n_steps, probe_idx)
+        else:
+            time_series = self._lpc_series(n_steps, probe_idx)
 
         # STABILITY FIX #4: NUMERICAL GUARD
         # Check for non-finite values before spectral calculations.
@@ -815,60 +1385,98 @@ class DOFTModel:
             print("  WARNING: Non-finite values detected in time series.")
 
         win_size, overlap = 4096, 2048 # Larger window for finer frequency resolution with small dt
-        step = win_size - overlap
         if len(time_series) < win_size:
-            return {'block_skipped': 0}, pd.DataFrame()
-        block_data, last_K = [], None
-        block_skipped = 0
-        num_windows = (len(time_series) - win_size) // step + 1
-        for i in range(num_windows):
-            window_data = time_series[i*step : i*step + win_size]
-            if not np.isfinite(window_data).all():
-                block_skipped += 1
-                block_data.append({'window_id': i,
-                                    'K_metric': np.nan,
-                                    'deltaK': np.nan,
-                                    'block_skipped': 1})
-                continue
-            K_metric = spectral_entropy(window_data)
-            deltaK = K_metric - last_K if last_K is not None else 0.0
-            block_data.append({'window_id': i,
-                                'K_metric': K_metric,
-                                'deltaK': deltaK,
-                                'block_skipped': 0})
-            last_K = K_metric
-
+            return {'block_skipped': 0, **(parareal or {})}, pd.DataFrame()
+        block_data, block_skipped = self._window_blocks(time_series, win_size, overlap)
         blocks_df = pd.DataFrame(block_data)
-
+        if reference is not None:
+            # Largest K_metric deviation from the serial run, window by window
+            ref_blocks, _ = self._window_blocks(reference, win_size, overlap)
+            dev = np.abs(blocks_df['K_metric'].to_numpy() - [b['K_metric'] for b in ref_blocks])
+            parareal['lpc_parareal_K_dev'] = float(np.nanmax(dev)) if np.isfinite(dev).any() else np.nan
+
+        # Per-probe fractions of non-increasing entropy steps; the pooled
+        # fraction counts every probe's window transitions together
         valid_blocks = blocks_df[blocks_df['block_skipped'] == 0]
         windows_analyzed = len(valid_blocks)
-        if windows_analyzed > 1:
-            deltaK_neg_count = (valid_blocks['deltaK'][1:] <= 0).sum()
-            lpc_ok_frac = deltaK_neg_count / (windows_analyzed - 1)
-        else:
-            lpc_ok_frac = 0.0
+        ok_by_probe, neg_total, pairs_total = [], 0, 0
+        for probe in range(time_series.shape[1]):
+            probe_blocks = valid_blocks[valid_blocks['probe_id'] == probe]
+            n_valid = len(probe_blocks)
+            if n_valid > 1:
+                neg = int((probe_blocks['deltaK'][1:] <= 0).sum())
+                ok_by_probe.append(neg / (n_valid - 1))
+                neg_total += neg
+                pairs_total += n_valid - 1
+            else:
+                ok_by_probe.append(0.0)
+        lpc_ok_frac = neg_total / pairs_total if pairs_total else 0.0
 
         return {
             'lpc_ok_frac': lpc_ok_frac,
             'lpc_vcount': 0,
             'lpc_windows_analyzed': windows_analyzed,
             'block_skipped': block_skipped,
+            'lpc_n_probes': len(ok_by_probe),
+            'lpc_ok_frac_by_probe': ok_by_probe,
+            'lpc_ok_frac_probe_std': float(np.std(ok_by_probe, ddof=1)) if len(ok_by_probe) > 1 else 0.0,
+            **(parareal or {}),
         }, blocks_df
 
+    def _lpc_series(self, n_steps, probe_idx):
+        """Run the serial LPC loop; returns the ``(n_steps, n_probes)`` probe series."""
+
+        # One (n_probes,) row per step, gathered with a single np.take
+        time_series = np.zeros((n_steps, probe_idx.size))
+        rate_logger = self.rate_logger
+        if rate_logger is not None:
+            rate_logger.reset(phase="lpc")
+        snap = self._open_snapshots("lpc")
+        loop_t0 = time.perf_counter() if self.timer is not None else 0.0
+        for t_idx in range(n_steps):
+            self._step(t_idx)
+            np.take(self.Q, probe_idx, out=time_series[t_idx])
+            if snap is not None and snap.due(t_idx):
+                self._snapshot(snap, t_idx)
+            if rate_logger is not None:
+                self._report_progress(t_idx + 1)
+        if self.timer is not None:
+            self.timer.add("lpc_loop", time.perf_counter() - loop_t0, n_steps)
+        if snap is not None:
+            snap.close()
+        if rate_logger is not None:
+            self._report_progress(n_steps, force=True)
+        return time_series
+
     def run(self):
-        # Adjust n_steps to account for the much smaller dt, simulating a similar physical duration.
-        # old_dt=0.1, new_dt=0.005*tau_ref. Ratio is ~20.
-        pulse_steps = int(3000 * (0.1 / self.dt))
-        if self.max_pulse_steps is not None:
-            pulse_steps = min(pulse_steps, self.max_pulse_steps)
-        lpc_steps = int(30000 * (0.1 / self.dt))
-        if self.max_lpc_steps is not None:
-            lpc_steps = min(lpc_steps, self.max_lpc_steps)
+        """Run the pulse and LPC phases and return ``(run_metrics, blocks_df)``.
+
+        Outputs are queued on :attr:`output_writer` and flushed (fsynced)
+        before returning; a failed write raises here.
+        """
+
+        if self.output_writer is not None:
+            result = self._run_phases()
+            self.output_writer.flush()
+            return result
+        with BackgroundWriter() as writer:
+            self.output_writer = writer
+            try:
+                return self._run_phases()
+            finally:
+                self.output_writer = None
+
+    def _run_phases(self):
+        # The precompute cache is shared by every run of the process
+        cache_start = PRECOMPUTE.stats()
+        pulse_steps, lpc_steps = phase_step_counts(
+            self.dt, self.max_pulse_steps, self.max_lpc_steps
+        )
 
         pulse_metrics = self._calculate_pulse_metrics(n_steps=pulse_steps)
         lpc_metrics, blocks_df = self._calculate_lpc_metrics(n_steps=lpc_steps)
 
-        total_steps = pulse_steps + lpc_steps
+        total_steps = pulse_metrics.get('pulse_steps_run', pulse_steps) + lpc_steps
         if total_steps > 0:
             delta_d_rate = self.dt_max_delta_d_exceeded_count / total_steps
         else:
@@ -882,10 +1490,23 @@ class DOFTModel:
                 "lambda_z": self.lambda_z,
                 "dt_max_delta_d_exceeded_count": self.dt_max_delta_d_exceeded_count,
                 "delta_d_rate": delta_d_rate,
+                "rejected_nonfinite": self.rejections["nonfinite"],
+                "rejected_energy": self.rejections["energy"],
+                "rejected_delay_slew": self.rejections["delay_slew"],
+                "rejected_frac": (
+                    self.rollback_count / (total_steps + self.rollback_count)
+                    if total_steps + self.rollback_count > 0
+                    else 0.0
+                ),
                 "interp_order": self.interp_order,
                 "ring_buffer_len": self.ring_buffer_len,
             }
         )
+        if self.timer is not None:
+            final_run_metrics.update(self.timer.as_metrics())
+            cache = PRECOMPUTE.stats()
+            final_run_metrics["precompute_hits"] = cache["hits"] - cache_start["hits"]
+            final_run_metrics["precompute_misses"] = cache["misses"] - cache_start["misses"]
         if self.log_steps:
             self.save_step_log()
         return final_run_metrics, blocks_df
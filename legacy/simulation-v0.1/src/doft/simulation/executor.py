@@ -0,0 +1,295 @@
+# src/doft/simulation/executor.py
+"""Process x thread layout for simulation sweeps.
+
+An executor layout fixes how many worker processes a sweep uses, how many
+BLAS/OpenMP/FFT threads each of them may start and, optionally, which CPUs
+each worker is pinned to. Without it every pool worker runs NumPy/SciPy
+with one thread per core and the node is oversubscribed.
+
+The layout comes from the ``executor`` entry of the run configuration::
+
+    "executor": {"processes": 4, "threads_per_process": 2, "affinity": "compact"}
+
+or, with ``"executor": "auto"``, from the profile recorded by::
+
+    python -m doft.simulation.executor autotune --out executor.json
+
+``threadpoolctl`` is only imported when ``threads_per_process`` is set.
+"""
+
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import multiprocessing as mp
+
+from doft.utils import utils
+from doft.utils.utils import set_fft_workers
+
+DEFAULT_PROFILE = os.path.join(os.path.expanduser("~"), ".cache", "doft", "executor.json")
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+# Kept alive for the lifetime of the worker so the limits stay applied
+_THREAD_LIMITS = None
+
+
+def available_cpus() -> list[int]:
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return list(range(os.cpu_count() or 1))
+
+
+def load_profile(path: str | None = None) -> dict:
+    """Return the layout recorded by :func:`autotune` at ``path``."""
+
+    path = path or DEFAULT_PROFILE
+    if not os.path.exists(path):
+        raise SystemExit(
+            f"No executor profile at {path}. Run 'python -m doft.simulation.executor autotune' first."
+        )
+    with open(path) as f:
+        return json.load(f)["best"]
+
+
+def resolve_executor(spec, profile_path: str | None = None) -> dict:
+    """Normalise the ``executor`` config entry into a layout dict.
+
+    ``spec`` may be ``None`` (library defaults), ``"auto"`` (recorded
+    profile) or a mapping with ``processes``, ``threads_per_process`` and
+    ``affinity`` (``None``, ``"compact"`` or a list of CPU ids).
+    """
+
+    if spec is None:
+        return {"processes": None, "threads_per_process": None, "affinity": None}
+    if spec == "auto":
+        spec = load_profile(profile_path)
+    if not isinstance(spec, dict):
+        raise ValueError("executor must be 'auto' or a mapping")
+    unknown = set(spec) - {"processes", "threads_per_process", "affinity"}
+    if unknown:
+        raise ValueError(f"unknown executor keys: {sorted(unknown)}")
+    layout = {
+        "processes": spec.get("processes"),
+        "threads_per_process": spec.get("threads_per_process"),
+        "affinity": spec.get("affinity"),
+    }
+    for key in ("processes", "threads_per_process"):
+        if layout[key] is not None and int(layout[key]) < 1:
+            raise ValueError(f"executor {key} must be >= 1")
+    affinity = layout["affinity"]
+    if affinity is not None and affinity != "compact" and not isinstance(affinity, list):
+        raise ValueError("executor affinity must be 'compact' or a list of CPU ids")
+    return layout
+
+
+def apply_thread_limits(threads: int):
+    """Limit BLAS/OpenMP pools of this process to ``threads`` threads.
+
+    The environment variables cover libraries loaded later (and processes
+    spawned from this one); ``threadpoolctl`` resizes the pools that are
+    already loaded.
+    """
+
+    global _THREAD_LIMITS
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    _THREAD_LIMITS = _threadpool_limits()(limits=threads)
+
+
+def _threadpool_limits():
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError as e:
+        raise SystemExit(
+            "threadpoolctl is required for executor.threads_per_process. "
+            "Please install threadpoolctl or drop the setting."
+        ) from e
+    return threadpool_limits
+
+
+def worker_cpus(affinity, slot: int, threads: int | None) -> list[int]:
+    """Return the CPUs worker ``slot`` (0-based) should be pinned to.
+
+    ``"compact"`` gives each worker its own block of ``threads`` CPUs
+    (wrapping around when there are more workers than blocks); an explicit
+    list is shared by all workers.
+    """
+
+    cpus = available_cpus()
+    if affinity == "compact":
+        width = max(1, threads or 1)
+        n_blocks = max(1, len(cpus) // width)
+        start = (slot % n_blocks) * width
+        return cpus[start:start + width]
+    return [c for c in affinity if c in cpus] or cpus
+
+
+def configure_worker(layout: dict, slot: int = 0):
+    """Apply ``layout`` to the current process (called from ``init_worker``)."""
+
+    threads = layout.get("threads_per_process")
+    if threads:
+        apply_thread_limits(int(threads))
+        set_fft_workers(int(threads))
+    affinity = layout.get("affinity")
+    if affinity and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, worker_cpus(affinity, slot, threads))
+
+
+def serial_layout(layout: dict) -> dict:
+    """Layout for a sweep run in the driver process itself.
+
+    A serial sweep is a single process, so it keeps every available CPU:
+    no pinning, and a thread budget of all cores instead of the per-worker
+    ``threads_per_process`` (left at library defaults when unset).
+    """
+
+    threads = len(available_cpus()) if layout.get("threads_per_process") else None
+    return {"processes": 1, "threads_per_process": threads, "affinity": None}
+
+
+def pool_processes(layout: dict, workers: int) -> int:
+    """Number of pool workers for ``layout``, at most ``workers``.
+
+    Without an explicit ``processes`` count a thread budget caps the pool at
+    ``len(available_cpus()) // threads_per_process`` workers, so that
+    processes x threads does not oversubscribe the node.
+    """
+
+    processes = layout.get("processes")
+    threads = layout.get("threads_per_process")
+    if processes is None and threads:
+        processes = max(1, len(available_cpus()) // int(threads))
+    return workers if processes is None else min(workers, int(processes))
+
+
+@contextmanager
+def serial_limits(layout: dict):
+    """Apply the thread budget of ``layout`` to this process inside the block.
+
+    Used for serial sweeps run by the driver itself: unlike
+    :func:`configure_worker` it leaves ``os.environ`` and the CPU affinity
+    alone, and restores the BLAS/OpenMP pools and FFT workers on exit.
+    """
+
+    threads = layout.get("threads_per_process")
+    if not threads:
+        yield
+        return
+    fft_workers = utils.FFT_WORKERS
+    try:
+        with _threadpool_limits()(limits=int(threads)):
+            set_fft_workers(int(threads))
+            yield
+    finally:
+        set_fft_workers(fft_workers)
+
+
+def candidate_layouts(n_cpus: int) -> list[dict]:
+    """Layouts with ``processes * threads_per_process <= n_cpus``."""
+
+    layouts = []
+    threads = 1
+    while threads <= n_cpus:
+        layouts.append({"processes": n_cpus // threads, "threads_per_process": threads})
+        threads *= 2
+    if n_cpus > 1:
+        layouts.append({"processes": 1, "threads_per_process": n_cpus})
+    unique = {(l["processes"], l["threads_per_process"]): l for l in layouts}
+    return list(unique.values())
+
+
+def _bench_init(layout, slots):
+    with slots.get_lock():
+        slot = slots.value
+        slots.value += 1
+    configure_worker(layout, slot)
+
+
+def _bench_run(sample: dict) -> int:
+    from doft.models.model import DOFTModel
+
+    model = DOFTModel(**sample["model"])
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    model.last_energy = model.energy_fn(model.Q, model.P)
+    for t_idx in range(sample["steps"]):
+        model._step(t_idx)
+    return sample["steps"]
+
+
+def benchmark_layout(layout: dict, sample: dict, runs_per_process: int = 2) -> float:
+    """Return sweep throughput (model steps per second) under ``layout``."""
+
+    n_runs = layout["processes"] * runs_per_process
+    slots = mp.Value("i", 0)
+    t0 = time.perf_counter()
+    with mp.Pool(layout["processes"], initializer=_bench_init, initargs=(layout, slots)) as pool:
+        steps = sum(pool.map(_bench_run, [sample] * n_runs, chunksize=1))
+    return steps / (time.perf_counter() - t0)
+
+
+def autotune(sample: dict, layouts: list[dict] | None = None, runs_per_process: int = 2) -> dict:
+    """Benchmark ``layouts`` on ``sample`` and return the results and the best."""
+
+    layouts = layouts or candidate_layouts(len(available_cpus()))
+    results = []
+    for layout in layouts:
+        layout = {**layout, "affinity": layout.get("affinity")}
+        rate = benchmark_layout(layout, sample, runs_per_process)
+        print(
+            f"processes={layout['processes']:>3} threads={layout['threads_per_process']:>3} "
+            f"-> {rate:,.0f} steps/s"
+        )
+        results.append({**layout, "steps_per_s": rate})
+    best = max(results, key=lambda r: r["steps_per_s"])
+    return {
+        "best": {k: best[k] for k in ("processes", "threads_per_process", "affinity")},
+        "results": results,
+        "sample": sample,
+        "cpus": len(available_cpus()),
+        "timestamp_utc": time.asctime(time.gmtime()),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Executor layout tools for DOFT sweeps.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    tune = sub.add_parser("autotune", help="benchmark process x thread layouts on this node")
+    tune.add_argument("--out", default=DEFAULT_PROFILE, help="where to record the fastest layout")
+    tune.add_argument("--grid", type=int, default=100, help="grid size of the sample model")
+    tune.add_argument("--steps", type=int, default=200, help="steps per sample run")
+    tune.add_argument("--runs-per-process", type=int, default=2)
+    tune.add_argument("--affinity", choices=["compact"], default=None, help="also pin workers")
+    args = ap.parse_args(argv)
+
+    sample = {
+        "model": {"grid_size": args.grid, "a": 0.3, "tau": 1.0, "a_ref": 1.0, "tau_ref": 1.0,
+                  "gamma": 0.1, "seed": 0},
+        "steps": args.steps,
+    }
+    layouts = [
+        {**l, "affinity": args.affinity} for l in candidate_layouts(len(available_cpus()))
+    ]
+    record = autotune(sample, layouts, args.runs_per_process)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(record, f, indent=4)
+    best = record["best"]
+    print(
+        f"--> Fastest layout: {best['processes']} process(es) x {best['threads_per_process']} "
+        f"thread(s); recorded in {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
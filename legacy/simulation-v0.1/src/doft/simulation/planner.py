@@ -0,0 +1,176 @@
+# src/doft/simulation/planner.py
+"""Memory planning for simulation sweeps.
+
+:func:`estimate_run_bytes` predicts the peak resident memory of a single
+``DOFTModel.run`` from the lattice size, the delay ring buffer, the number of
+Prony modes and the phase step counts, without allocating anything.
+:func:`plan_sweep` turns the largest per-run estimate of a sweep into a
+worker count (and, when needed, lean mode) that keeps the concurrent runs
+within ``max_ram_bytes``.
+
+The constants below are deliberately conservative upper bounds; the
+estimate is meant to prevent OOM kills, not to account for every byte.
+"""
+
+import math
+import os
+
+from doft.models.model import LEAN_LOG_LEN, phase_step_counts, resolve_probes, stable_dt_nondim
+from doft.utils.snapshots import block_bytes
+from doft.utils.theilsen import MAX_PAIRS as THEILSEN_MAX_PAIRS
+
+FLOAT_BYTES = 8
+# Interpreter plus NumPy/SciPy/pandas in a worker process
+PROCESS_BASE_BYTES = 256 * 1024**2
+# Lattice-sized arrays alive during a step: Q, P, Q_delay, their scratch
+# buffers, the Laplacian and update temporaries and the pulse meshgrid
+FIELD_COPIES = 16
+# Per-cell temporaries of the ring-buffer interpolation, per stencil point
+RING_INTERP_COPIES = 3
+# Prony modes: states, candidate buffer and drive scratch
+MEMORY_COPIES = 3
+# One (t, r) detection as a tuple in a list, or packed in lean mode
+DETECTION_BYTES = 120
+LEAN_DETECTION_BYTES = 16
+# One boxed float appended to a diagnostic list
+LOG_ENTRY_BYTES = 32
+# One per-step dict of the optional step log
+STEP_LOG_ENTRY_BYTES = 1024
+# Theil-Sen (doft.utils.theilsen): pair indices, dx, dy and slopes of at
+# most MAX_PAIRS (sampled) pairs
+THEILSEN_BYTES_PER_PAIR = 48
+# Snapshot block buffers: the one being filled plus ``max_pending`` queued
+SNAPSHOT_BLOCKS = 3
+NUM_ANGLES = 16
+
+
+def estimate_run_bytes(
+    grid_size: int,
+    a: float,
+    tau: float,
+    gamma: float,
+    *,
+    a_ref: float = 1.0,
+    tau_ref: float = 1.0,
+    tau_dynamic: bool = False,
+    epsilon_tau: float = 0.1,
+    interp_order: int = 3,
+    ring_buffer_margin: int = 5,
+    n_modes: int = 0,
+    n_thresholds: int = 3,
+    max_pulse_steps: int | None = None,
+    max_lpc_steps: int | None = None,
+    lpc_duration_physical: float | None = None,
+    log_steps: bool = False,
+    lean: bool = False,
+    snapshots: dict | None = None,
+    n_probes: int = 1,
+) -> dict:
+    """Return the estimated peak bytes of one run, broken down by component.
+
+    The returned mapping holds one entry per component and ``"peak"``. The
+    pulse and LPC phases do not overlap, so the peak is the resident state
+    plus the larger of the two phase footprints.
+    """
+
+    dt_nondim = stable_dt_nondim(a / a_ref, tau / tau_ref, gamma * tau_ref)
+    dt = dt_nondim * tau_ref
+    if lpc_duration_physical is not None:
+        max_lpc_steps = math.ceil(lpc_duration_physical / dt)
+    pulse_steps, lpc_steps = phase_step_counts(dt, max_pulse_steps, max_lpc_steps)
+    cells = grid_size * grid_size
+    field = cells * FLOAT_BYTES
+
+    ring_len = 0
+    if tau_dynamic:
+        ring_len = int(math.ceil((tau / tau_ref) * (1.0 + epsilon_tau) / dt_nondim)) + ring_buffer_margin
+    log_len = min(pulse_steps + lpc_steps, LEAN_LOG_LEN) if lean else pulse_steps + lpc_steps
+
+    parts = {
+        "process": PROCESS_BASE_BYTES,
+        "fields": FIELD_COPIES * field,
+        "ring_buffer": ring_len * field
+        + (RING_INTERP_COPIES * (interp_order + 1) * field if tau_dynamic else 0),
+        "memory_kernel": MEMORY_COPIES * n_modes * field,
+        "logs": 3 * log_len * LOG_ENTRY_BYTES
+        + (pulse_steps + lpc_steps) * STEP_LOG_ENTRY_BYTES * bool(log_steps),
+        "snapshots": 0,
+    }
+    if snapshots is not None:
+        r0, r1, c0, c1 = snapshots.get("region") or (0, grid_size, 0, grid_size)
+        n_fields = 3 if tau_dynamic else 2
+        parts["snapshots"] = SNAPSHOT_BLOCKS * block_bytes(
+            n_fields, (r1 - r0, c1 - c0), snapshots.get("chunk_steps", 64)
+        )
+    rays = NUM_ANGLES * n_thresholds
+    detections = rays * pulse_steps * (LEAN_DETECTION_BYTES if lean else DETECTION_BYTES)
+    pairs = min(pulse_steps * (pulse_steps - 1) // 2, THEILSEN_MAX_PAIRS)
+    pulse_phase = detections + THEILSEN_BYTES_PER_PAIR * pairs
+    # Probe time series, its probe-major copy and the overlapping windows
+    lpc_phase = 4 * n_probes * lpc_steps * FLOAT_BYTES
+    parts["pulse_phase"] = pulse_phase
+    parts["lpc_phase"] = lpc_phase
+
+    parts["peak"] = (
+        parts["process"] + parts["fields"] + parts["ring_buffer"]
+        + parts["memory_kernel"] + parts["logs"] + parts["snapshots"]
+        + max(pulse_phase, lpc_phase)
+    )
+    parts["pulse_steps"] = pulse_steps
+    parts["lpc_steps"] = lpc_steps
+    parts["ring_buffer_len"] = ring_len
+    return parts
+
+
+def _run_estimate(config: dict, point, lean: bool) -> dict:
+    a, tau, gamma = point
+    kernel = config.get("kernel_params") or {}
+    return estimate_run_bytes(
+        config["grid_size"],
+        a,
+        tau,
+        gamma,
+        a_ref=config.get("a_ref", 1.0),
+        tau_ref=config.get("tau_ref", 1.0),
+        tau_dynamic=config.get("tau_dynamic_on", False),
+        epsilon_tau=config.get("epsilon_tau", 0.1),
+        interp_order=config.get("interp_order", 3),
+        n_modes=len(kernel.get("weights", [])),
+        n_thresholds=len(config.get("detection_thresholds", [1.0, 3.0, 5.0])),
+        max_pulse_steps=config.get("max_pulse_steps"),
+        max_lpc_steps=config.get("max_lpc_steps"),
+        lpc_duration_physical=config.get("lpc_duration_physical"),
+        log_steps=config.get("log_steps", False),
+        lean=lean,
+        snapshots=config.get("snapshots"),
+        n_probes=resolve_probes(config.get("lpc_probes"), config["grid_size"])[0].size,
+    )
+
+
+def plan_sweep(points, config: dict, budget_bytes: int, max_workers: int | None = None) -> dict:
+    """Choose the worker count and memory mode for a sweep over ``points``.
+
+    ``points`` are ``(a, tau, gamma)`` tuples and ``config`` the sweep
+    configuration passed to the workers. Lean mode is switched on when the
+    default footprint would not fit even a single worker (or would cut the
+    parallelism below what lean mode allows). ``fits`` is ``False`` when a
+    single lean run already exceeds the budget; the sweep then runs on one
+    worker and may still run out of memory.
+    """
+
+    max_workers = max_workers or os.cpu_count() or 1
+    peak = max(_run_estimate(config, p, lean=False)["peak"] for p in points)
+    lean_peak = max(_run_estimate(config, p, lean=True)["peak"] for p in points)
+
+    workers = min(max_workers, budget_bytes // peak)
+    lean_workers = min(max_workers, budget_bytes // lean_peak)
+    lean = lean_workers > workers
+    if lean:
+        peak, workers = lean_peak, lean_workers
+    return {
+        "per_run_bytes": int(peak),
+        "workers": int(max(workers, 1)),
+        "lean": bool(lean),
+        "fits": bool(workers >= 1),
+        "budget_bytes": int(budget_bytes),
+    }
@@ -0,0 +1,364 @@
+# src/doft/simulation/profiling.py
+"""Profile one sweep configuration.
+
+``doft-profile`` reads the same JSON config as ``run_sim``, builds the model
+of a single ``(a, tau, seed)`` point and runs it under one of three
+profilers:
+
+``cprofile``
+    deterministic function profile (``cProfile``); also saves the raw
+    ``profile.pstats`` for snakeviz or gprof2dot.
+``stack``
+    sampling profiler that records the main thread's Python stack every
+    ``--interval`` seconds; cheap enough to keep the timings realistic.
+``tracemalloc``
+    allocation snapshot at the end of the run, by allocating stack.
+
+Every profiler writes ``stacks.folded`` (collapsed stacks, one
+``frame;frame;frame weight`` line each, for ``flamegraph.pl`` or
+speedscope), ``top.txt`` with the ``--top`` hottest functions and
+``profile.json`` with the point, the step caps and the wall time::
+
+    doft-profile --config configs/phase1.json --a 1.2 --tau 1.0 --profiler stack
+
+The pulse and LPC phases are capped with ``max_pulse_steps`` and
+``max_lpc_steps`` (``--max-pulse-steps``/``--max-lpc-steps``) so profiles
+finish quickly; ``lpc_duration_physical`` is ignored for the same reason.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from doft.simulation.run_sim import build_model, worker_config
+
+PROFILERS = ("cprofile", "stack", "tracemalloc")
+
+
+def profile_config(cfg_json: dict, max_pulse_steps: int | None, max_lpc_steps: int | None) -> dict:
+    """Worker config of ``run_sim`` for one profiled run.
+
+    Parsed and validated by :func:`~doft.simulation.run_sim.worker_config`,
+    with the step caps applied; step logs, snapshots, telemetry and
+    ``lpc_duration_physical`` are left off.
+    """
+
+    config = worker_config(cfg_json)
+    for key in ("log_path", "snapshots", "telemetry_interval", "lpc_duration_physical"):
+        config.pop(key, None)
+    config["log_steps"] = False
+    config["max_pulse_steps"] = max_pulse_steps
+    config["max_lpc_steps"] = max_lpc_steps
+    return config
+
+
+def default_point(cfg_json: dict) -> tuple[float, float, int]:
+    """First ``(a, tau)`` of the sweep groups and the first seed."""
+
+    groups = cfg_json.get("sweep_groups") or {"g1": [(1.0, 1.0)]}
+    a_val, tau_val = next(iter(groups.values()))[0]
+    seeds = cfg_json.get("seeds") or [42]
+    return a_val, tau_val, seeds[0]
+
+
+def _label(filename: str, lineno: int, funcname: str) -> str:
+    if filename == "~":  # C functions in cProfile
+        return funcname
+    return f"{funcname} ({os.path.basename(filename)}:{lineno})"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return _label(code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def pstats_to_collapsed(stats: pstats.Stats, min_share: float = 1e-4) -> dict[str, float]:
+    """Collapsed stacks (weights in microseconds) from a cProfile call graph.
+
+    cProfile only records caller/callee edges, so the self time of a function
+    is split over its callers in proportion to the edge times (as flameprof
+    does). Recursive edges and branches below ``min_share`` of the total are
+    dropped.
+    """
+
+    raw = stats.stats
+    callees: dict = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [f for f, (_, _, _, _, callers) in raw.items() if not callers]
+    total = sum(raw[f][3] for f in roots) or 1.0
+    out: dict[str, float] = {}
+
+    def walk(func, share, path):
+        _, _, tt, ct, _ = raw[func]
+        frac = share / ct if ct > 0 else 0.0
+        stack = path + (_label(*func),)
+        if tt * frac > 0:
+            key = ";".join(stack)
+            out[key] = out.get(key, 0.0) + tt * frac * 1e6
+        for callee, edge_ct in callees.get(func, ()):
+            sub = edge_ct * frac
+            if sub >= min_share * total and _label(*callee) not in stack:
+                walk(callee, sub, stack)
+
+    for root in roots:
+        walk(root, raw[root][3], ())
+    return out
+
+
+class StackSampler:
+    """Sample the Python stack of one thread at a fixed interval.
+
+    Samples are taken from a daemon thread, so they land on GIL switch
+    points; long NumPy calls that keep the GIL are attributed to their
+    Python caller. Stacks start at the frame running ``root`` (a code
+    object) when it is on the stack.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int | None = None, root=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.root = root
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                if frame.f_code is self.root:
+                    break
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="doft-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def top_from_collapsed(stacks: dict, n: int) -> list[dict]:
+    """Self and total weight per frame, heaviest self weight first."""
+
+    self_w: Counter = Counter()
+    total_w: Counter = Counter()
+    for stack, weight in stacks.items():
+        frames = stack.split(";")
+        self_w[frames[-1]] += weight
+        for frame in set(frames):
+            total_w[frame] += weight
+    grand = sum(stacks.values()) or 1
+    return [
+        {
+            "self_pct": 100.0 * w / grand,
+            "total_pct": 100.0 * total_w[f] / grand,
+            "self": w,
+            "function": f,
+        }
+        for f, w in self_w.most_common(n)
+    ]
+
+
+def format_table(rows: list[dict], columns: list[str]) -> str:
+    """Plain-text table; floats get three decimals."""
+
+    def cell(v):
+        return f"{v:.3f}" if isinstance(v, float) else str(v)
+
+    body = [[cell(r[c]) for c in columns] for r in rows]
+    widths = [max([len(c)] + [len(b[i]) for b in body]) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.ljust(w) for v, w in zip(b, widths)) for b in body]
+    return "\n".join(lines) + "\n"
+
+
+def _profile_cprofile(run, out_dir, top):
+    profiler = cProfile.Profile()
+    profiler.runcall(run)
+    profiler.dump_stats(os.path.join(out_dir, "profile.pstats"))
+    stats = pstats.Stats(profiler)
+    rows = []
+    for func, (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            "ncalls": nc, "tottime": tt, "cumtime": ct, "function": _label(*func),
+        })
+    rows.sort(key=lambda r: r["tottime"], reverse=True)
+    table = format_table(rows[:top], ["ncalls", "tottime", "cumtime", "function"])
+    return pstats_to_collapsed(stats), table
+
+
+def _profile_stack(run, out_dir, top, interval):
+    with StackSampler(interval, root=run.__code__) as sampler:
+        run()
+    stacks = dict(sampler.stacks)
+    table = format_table(top_from_collapsed(stacks, top), ["self_pct", "total_pct", "self", "function"])
+    return stacks, table
+
+
+def _profile_tracemalloc(run, out_dir, top, nframes=16):
+    tracemalloc.start(nframes)
+    try:
+        run()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    stacks: Counter = Counter()
+    for stat in snapshot.statistics("traceback"):
+        frames = [f"{os.path.basename(f.filename)}:{f.lineno}" for f in stat.traceback]
+        stacks[";".join(frames)] += stat.size
+    rows = [
+        {
+            "size_kib": stat.size / 1024.0,
+            "count": stat.count,
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+        }
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+    table = f"traced peak: {peak / 1024**2:.1f} MiB\n" + format_table(rows, ["size_kib", "count", "location"])
+    return dict(stacks), table
+
+
+def write_collapsed(stacks: dict, path: str):
+    with open(path, "w") as f:
+        for stack, weight in sorted(stacks.items()):
+            w = int(round(weight))
+            if w > 0:
+                f.write(f"{stack} {w}\n")
+
+
+def profile_point(
+    cfg_json: dict,
+    a_val: float,
+    tau_val: float,
+    seed: int,
+    profiler: str = "cprofile",
+    out_dir: str = "profiles",
+    gamma: float | None = None,
+    max_pulse_steps: int | None = 1000,
+    max_lpc_steps: int | None = 8192,
+    top: int = 25,
+    interval: float = 0.005,
+    nframes: int = 16,
+) -> dict:
+    """Run one configuration under ``profiler``; returns the ``profile.json`` record."""
+
+    if profiler not in PROFILERS:
+        raise ValueError(f"profiler must be one of {PROFILERS}")
+    config = profile_config(cfg_json, max_pulse_steps, max_lpc_steps)
+    gamma = config["gamma"] if gamma is None else gamma
+    run_id = f"profile_{profiler}"
+    model = build_model(config, a_val, tau_val, gamma, seed, run_id)
+    os.makedirs(out_dir, exist_ok=True)
+    # Imported at their point of use by the model; loaded here so the
+    # one-off import cost stays out of the profile
+    import pandas  # noqa: F401
+    import scipy.fft  # noqa: F401
+
+    result = {}
+
+    def run():
+        result["metrics"] = model.run()[0]
+
+    t0 = time.perf_counter()
+    if profiler == "cprofile":
+        stacks, table = _profile_cprofile(run, out_dir, top)
+    elif profiler == "stack":
+        stacks, table = _profile_stack(run, out_dir, top, interval)
+    else:
+        stacks, table = _profile_tracemalloc(run, out_dir, top, nframes)
+    wall_s = time.perf_counter() - t0
+
+    write_collapsed(stacks, os.path.join(out_dir, "stacks.folded"))
+    with open(os.path.join(out_dir, "top.txt"), "w") as f:
+        f.write(table)
+    metrics = result.get("metrics", {})
+    record = {
+        "profiler": profiler,
+        "a": a_val,
+        "tau": tau_val,
+        "gamma": gamma,
+        "seed": seed,
+        "grid_size": config["grid_size"],
+        "max_pulse_steps": max_pulse_steps,
+        "max_lpc_steps": max_lpc_steps,
+        "pulse_steps_run": metrics.get("pulse_steps_run"),
+        "wall_s": wall_s,
+        "table": table,
+    }
+    with open(os.path.join(out_dir, "profile.json"), "w") as f:
+        json.dump({k: v for k, v in record.items() if k != "table"}, f, indent=2)
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="doft-profile", description="Profile a single (a, tau, seed) run of a sweep config."
+    )
+    parser.add_argument("--config", help="run_sim JSON config (default: $DOFT_CONFIG)")
+    parser.add_argument("--a", type=float, help="coupling a (default: first sweep point)")
+    parser.add_argument("--tau", type=float, help="delay tau (default: first sweep point)")
+    parser.add_argument("--seed", type=int, help="seed (default: first configured seed)")
+    parser.add_argument("--gamma", type=float, help="damping (default: config gamma)")
+    parser.add_argument("--profiler", choices=PROFILERS, default="cprofile")
+    parser.add_argument("--max-pulse-steps", type=int, default=1000)
+    parser.add_argument("--max-lpc-steps", type=int, default=8192)
+    parser.add_argument("--top", type=int, default=25, help="rows of the hot-function table")
+    parser.add_argument("--interval", type=float, default=0.005, help="stack sampling interval (s)")
+    parser.add_argument("--frames", type=int, default=16, help="tracemalloc traceback depth")
+    parser.add_argument("--out", help="output directory (default: profiles/<profiler>_a<a>_tau<tau>_s<seed>)")
+    args = parser.parse_args(argv)
+
+    config_path = args.config or os.environ.get("DOFT_CONFIG")
+    cfg_json = {}
+    if config_path:
+        with open(config_path) as f:
+            cfg_json = json.load(f)
+    a_val, tau_val, seed = default_point(cfg_json)
+    a_val = a_val if args.a is None else args.a
+    tau_val = tau_val if args.tau is None else args.tau
+    seed = seed if args.seed is None else args.seed
+    out_dir = args.out or os.path.join(
+        "profiles", f"{args.profiler}_a{a_val}_tau{tau_val}_s{seed}"
+    )
+
+    record = profile_point(
+        cfg_json, a_val, tau_val, seed,
+        profiler=args.profiler,
+        out_dir=out_dir,
+        gamma=args.gamma,
+        max_pulse_steps=args.max_pulse_steps,
+        max_lpc_steps=args.max_lpc_steps,
+        top=args.top,
+        interval=args.interval,
+        nframes=args.frames,
+    )
+    print(record["table"], end="")
+    print(f"{args.profiler}: {record['wall_s']:.2f} s, outputs in {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
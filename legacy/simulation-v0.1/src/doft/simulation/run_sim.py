@@ -1,7 +1,6 @@
 # src/doft/simulation/run_sim.py
 import argparse
 import logging
-import pandas as pd
 import numpy as np
 import time
 import json
@@ -11,6 +10,26 @@ import subprocess
 import multiprocessing as mp
 
 from doft.models.model import DOFTModel
+from doft.models.parareal import resolve_parareal
+from doft.simulation.executor import (
+    configure_worker,
+    pool_processes,
+    resolve_executor,
+    serial_layout,
+    serial_limits,
+)
+from doft.simulation.planner import plan_sweep
+from doft.simulation.sequential import SequentialSeeds, resolve_sequential
+from doft.simulation.sweep import AXES, DEFAULT_METRICS, AdaptiveSweep
+from doft.utils.precompute import DEFAULT_MAXSIZE, PRECOMPUTE
+from doft.utils.utils import RateLogger
+from doft.utils.outputs import (
+    BLOCKS_COLUMNS,
+    COLUMNAR_EXTENSIONS,
+    OUTPUT_FORMATS,
+    RUNS_COLUMNS,
+    BackgroundWriter,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
@@ -22,17 +41,172 @@ _COUNTER = None
 _TOTAL = 0
 
 
-def init_worker(config, results_list, counter, total):
-    """Initializer for worker processes to set shared state."""
+def init_worker(config, results_list, counter, total, executor=None, slots=None):
+    """Initializer for worker processes to set shared state.
+
+    ``executor`` is the layout from :func:`resolve_executor`; its thread
+    limits and CPU affinity are applied to this process. ``slots`` numbers
+    the workers so each one gets its own CPU block. The per-process
+    precompute cache is bounded to ``config['precompute_cache_size']``.
+    """
     global _CONFIG, _RESULTS, _COUNTER, _TOTAL
     _CONFIG = config
     _RESULTS = results_list
     _COUNTER = counter
     _TOTAL = total
+    PRECOMPUTE.resize(config.get('precompute_cache_size', DEFAULT_MAXSIZE))
+    if executor:
+        slot = 0
+        if slots is not None:
+            with slots.get_lock():
+                slot = slots.value
+                slots.value += 1
+        configure_worker(executor, slot)
+
+
+def worker_config(cfg_json, boundary_mode='periodic', log_steps=False, log_path=None):
+    """Normalise and validate the model settings of a sweep config.
+
+    Returns the worker config consumed by :func:`build_model`, with the
+    defaults applied and ``None`` entries dropped; ``boundary_mode``,
+    ``log_steps`` and ``log_path`` are the fallbacks for the config keys of
+    the same names. Sweep-level keys (seeds, sweep groups, output formats,
+    executor) are left to the caller; ``snapshots`` is returned as given,
+    without a ``path``.
+    """
 
+    kernel_params = cfg_json.get('kernel_params', cfg_json.get('prony_memory'))
+    if kernel_params is not None:
+        weights = np.asarray(kernel_params.get('weights', []), dtype=float)
+        thetas = np.asarray(kernel_params.get('thetas', []), dtype=float)
+        if weights.size != thetas.size:
+            raise ValueError('kernel_params require matching weights and thetas')
+        if np.any(weights < 0) or np.any(thetas <= 0):
+            raise ValueError('kernel_params require weights ≥ 0 and thetas > 0')
+        kernel_params = {'weights': weights.tolist(), 'thetas': thetas.tolist()}
+    epsilon_tau = cfg_json.get('epsilon_tau', 0.1)
+    eta = cfg_json.get('eta', 0.1)
+    if not 0.05 <= epsilon_tau <= 0.2:
+        raise ValueError('epsilon_tau must be between 0.05 and 0.2')
+    if not 0.05 <= eta <= 0.1:
+        raise ValueError('eta must be between 0.05 and 0.1')
+    pulse_early_stop = cfg_json.get('pulse_early_stop')
+    if pulse_early_stop not in (None, 'saturation', 'slope'):
+        raise ValueError("pulse_early_stop must be 'saturation' or 'slope'")
+    pulse_check_interval = int(cfg_json.get('pulse_check_interval', 200))
+    if pulse_check_interval < 1:
+        raise ValueError('pulse_check_interval must be >= 1')
+    energy_stride = int(cfg_json.get('energy_stride', 1))
+    if energy_stride < 1:
+        raise ValueError('energy_stride must be >= 1')
+    crn_experiment = cfg_json.get('crn_experiment')
+    if crn_experiment is not None and not isinstance(crn_experiment, str):
+        raise ValueError('crn_experiment must be a string naming the experiment')
+    precompute_cache_size = int(cfg_json.get('precompute_cache_size', DEFAULT_MAXSIZE))
+    if precompute_cache_size < 0:
+        raise ValueError('precompute_cache_size must be >= 0')
+    snapshots = cfg_json.get('snapshots')
+    if snapshots is not None and not isinstance(snapshots, dict):
+        raise ValueError('snapshots must be a mapping (stride, region, chunk_steps, compress)')
+    numerical_params = cfg_json.get('numerical_params', {})
+    integrator = cfg_json.get('integrator', numerical_params.get('integrator', 'IMEX'))
+    if integrator == 'Leapfrog' and kernel_params:
+        raise ValueError('Leapfrog integrator incompatible with memory (kernel_params)')
 
-def run_single_sim(a_val, tau_val, seed):
-    """Run a single simulation and append results to the shared list."""
+    config = {
+        'gamma': cfg_json.get('gamma', 0.05),
+        'grid_size': cfg_json.get('grid_size', 100),
+        'boundary_mode': cfg_json.get('boundary_mode', boundary_mode),
+        'log_steps': cfg_json.get('log_steps', log_steps),
+        'log_path': cfg_json.get('log_path', log_path),
+        'a_ref': cfg_json.get('a_ref', 1.0),
+        'tau_ref': cfg_json.get('tau_ref', 1.0),
+        'max_ram_bytes': cfg_json.get('max_ram_bytes', 32 * 1024**3),
+        'lpc_duration_physical': cfg_json.get('lpc_duration_physical'),
+        'pulse_amplitude': cfg_json.get('pulse_amplitude', 0.1),
+        'detection_thresholds': cfg_json.get('detection_thresholds', [1.0, 3.0, 5.0]),
+        'max_pulse_steps': cfg_json.get('max_pulse_steps'),
+        'max_lpc_steps': cfg_json.get('max_lpc_steps'),
+        'kernel_params': kernel_params,
+        'integrator': integrator,
+        'tau_dynamic_on': cfg_json.get('tau_dynamic_on', False),
+        'alpha_delay': cfg_json.get('alpha_delay', 0.0),
+        'lambda_z': cfg_json.get('lambda_z', 0.0),
+        'tau_model': cfg_json.get('tau_model', 'direct'),
+        'epsilon_tau': epsilon_tau,
+        'eta': eta,
+        'max_delta_d': cfg_json.get('max_delta_d', 0.25),
+        'interp_order': cfg_json.get('interp_order', 3),
+        'instrument': cfg_json.get('instrument', False),
+        'telemetry_interval': cfg_json.get('telemetry_interval'),
+        'pulse_early_stop': pulse_early_stop,
+        'pulse_slope_rtol': cfg_json.get('pulse_slope_rtol', 0.01),
+        'pulse_check_interval': pulse_check_interval,
+        'lpc_probes': cfg_json.get('lpc_probes'),
+        'lpc_parareal': resolve_parareal(cfg_json.get('lpc_parareal')),
+        'precompute_cache_size': precompute_cache_size,
+        'crn_experiment': crn_experiment,
+        'energy_stride': energy_stride,
+        'snapshots': snapshots,
+        'lean': bool(cfg_json.get('lean', False)),
+    }
+    # Remove optional keys with None values to keep configuration clean
+    return {k: v for k, v in config.items() if v is not None}
+
+
+def build_model(config, a_val, tau_val, gamma, seed, run_id, rate_logger=None):
+    """Build the :class:`DOFTModel` of one sweep run from the worker config."""
+
+    return DOFTModel(
+        grid_size=config['grid_size'],
+        a=a_val,
+        tau=tau_val,
+        a_ref=config['a_ref'],
+        tau_ref=config['tau_ref'],
+        gamma=gamma,
+        seed=seed,
+        boundary_mode=config['boundary_mode'],
+        log_steps=config['log_steps'],
+        log_path=config.get('log_path'),
+        max_ram_bytes=config['max_ram_bytes'],
+        lpc_duration_physical=config.get('lpc_duration_physical'),
+        pulse_amplitude=config['pulse_amplitude'],
+        detection_thresholds=config['detection_thresholds'],
+        max_pulse_steps=config.get('max_pulse_steps'),
+        max_lpc_steps=config.get('max_lpc_steps'),
+        kernel_params=config.get('kernel_params'),
+        integrator=config.get('integrator'),
+        tau_dynamic=config.get('tau_dynamic_on', False),
+        alpha_delay=config.get('alpha_delay', 0.0),
+        lambda_z=config.get('lambda_z', 0.0),
+        epsilon_tau=config.get('epsilon_tau', 0.1),
+        eta_slew=config.get('eta', 0.1),
+        max_delta_d=config.get('max_delta_d', 0.25),
+        interp_order=config.get('interp_order', 3),
+        instrument=config.get('instrument', False),
+        rate_logger=rate_logger,
+        pulse_early_stop=config.get('pulse_early_stop'),
+        pulse_slope_rtol=config.get('pulse_slope_rtol', 0.01),
+        pulse_check_interval=config.get('pulse_check_interval', 200),
+        lean=config.get('lean', False),
+        lpc_probes=config.get('lpc_probes'),
+        lpc_parareal=config.get('lpc_parareal'),
+        crn_experiment=config.get('crn_experiment'),
+        energy_stride=config.get('energy_stride', 1),
+        snapshots=(
+            {**config['snapshots'], 'path': os.path.join(config['snapshots']['path'], run_id)}
+            if config.get('snapshots') else None
+        ),
+    )
+
+
+def run_single_sim(a_val, tau_val, seed, gamma_val=None, group=None):
+    """Run a single simulation and append results to the shared list.
+
+    ``gamma_val`` and ``group`` default to the sweep-wide ``gamma`` and the
+    configured group of ``(a, tau)``; adaptive sweeps set both per run.
+    """
+    gamma = _CONFIG['gamma'] if gamma_val is None else gamma_val
     with _COUNTER.get_lock():
         _COUNTER.value += 1
         run_idx = _COUNTER.value
@@ -40,33 +214,18 @@ def run_single_sim(a_val, tau_val, seed):
     run_id = f"run_{int(time.time())}_{run_idx}"
     print(f"[{run_idx}/{_TOTAL}] Running sim: a={a_val}, τ={tau_val}, seed={seed}")
 
-    model = DOFTModel(
-        grid_size=_CONFIG['grid_size'],
-        a=a_val,
-        tau=tau_val,
-        a_ref=_CONFIG['a_ref'],
-        tau_ref=_CONFIG['tau_ref'],
-        gamma=_CONFIG['gamma'],
-        seed=seed,
-        boundary_mode=_CONFIG['boundary_mode'],
-        log_steps=_CONFIG['log_steps'],
-        log_path=_CONFIG.get('log_path'),
-        max_ram_bytes=_CONFIG['max_ram_bytes'],
-        lpc_duration_physical=_CONFIG.get('lpc_duration_physical'),
-        pulse_amplitude=_CONFIG['pulse_amplitude'],
-        detection_thresholds=_CONFIG['detection_thresholds'],
-        max_pulse_steps=_CONFIG.get('max_pulse_steps'),
-        max_lpc_steps=_CONFIG.get('max_lpc_steps'),
-        kernel_params=_CONFIG.get('kernel_params'),
-        integrator=_CONFIG.get('integrator'),
-        tau_dynamic=_CONFIG.get('tau_dynamic_on', False),
-        alpha_delay=_CONFIG.get('alpha_delay', 0.0),
-        lambda_z=_CONFIG.get('lambda_z', 0.0),
-        epsilon_tau=_CONFIG.get('epsilon_tau', 0.1),
-        eta_slew=_CONFIG.get('eta', 0.1),
-        max_delta_d=_CONFIG.get('max_delta_d', 0.25),
-        interp_order=_CONFIG.get('interp_order', 3),
-    )
+    rate_logger = None
+    if _CONFIG.get('progress_path'):
+        rate_logger = RateLogger(
+            interval_sec=_CONFIG['telemetry_interval'],
+            sink=_CONFIG['progress_path'],
+            run_id=run_id,
+            a=a_val,
+            tau=tau_val,
+            seed=seed,
+        )
+
+    model = build_model(_CONFIG, a_val, tau_val, gamma, seed, run_id, rate_logger)
 
     run_metrics, blocks_df = model.run()
     logger.info(
@@ -94,8 +253,8 @@ def run_single_sim(a_val, tau_val, seed):
     run_metrics['seed'] = seed
     run_metrics['a_mean'] = a_val
     run_metrics['tau_mean'] = tau_val
-    run_metrics['gamma'] = _CONFIG['gamma']
-    run_metrics['param_group'] = _CONFIG['point_to_group'].get((a_val, tau_val), 'unknown')
+    run_metrics['gamma'] = gamma
+    run_metrics['param_group'] = group or _CONFIG['point_to_group'].get((a_val, tau_val), 'unknown')
     run_metrics['lorentz_window'] = 'NA'
 
     if blocks_df is not None and not blocks_df.empty:
@@ -110,6 +269,8 @@ def main():
     Main orchestrator for the DOFT Phase 1 counter-trial.
     This version incorporates numerical stability fixes based on audit feedback.
     """
+    import pandas as pd
+
     parser = argparse.ArgumentParser(description="Run DOFT Phase-1 Simulation Sweep.")
     parser.add_argument(
         "--config",
@@ -145,52 +306,45 @@ def main():
         with open(config_path) as f:
             cfg_json = json.load(f)
 
-    # general parameters with defaults
+    config = worker_config(
+        cfg_json, boundary_mode=args.boundary, log_steps=args.log_steps, log_path=args.log_path
+    )
     seeds = cfg_json.get('seeds', [42, 123, 456, 789, 1011])
-    gamma = cfg_json.get('gamma', 0.05)
-    grid_size = cfg_json.get('grid_size', 100)
-    boundary_mode = cfg_json.get('boundary_mode', args.boundary)
-    log_steps = cfg_json.get('log_steps', args.log_steps)
-    log_path = cfg_json.get('log_path', args.log_path)
-    a_ref = cfg_json.get('a_ref', 1.0)
-    tau_ref = cfg_json.get('tau_ref', 1.0)
-    max_ram_bytes = cfg_json.get('max_ram_bytes', 32 * 1024**3)
-    lpc_duration_physical = cfg_json.get('lpc_duration_physical')
-    pulse_amplitude = cfg_json.get('pulse_amplitude', 0.1)
-    detection_thresholds = cfg_json.get('detection_thresholds', [1.0, 3.0, 5.0])
-    max_pulse_steps = cfg_json.get('max_pulse_steps')
-    max_lpc_steps = cfg_json.get('max_lpc_steps')
-    kernel_params = cfg_json.get('kernel_params', cfg_json.get('prony_memory'))
-    if kernel_params is not None:
-        weights = np.asarray(kernel_params.get('weights', []), dtype=float)
-        thetas = np.asarray(kernel_params.get('thetas', []), dtype=float)
-        if weights.size != thetas.size:
-            raise ValueError('kernel_params require matching weights and thetas')
-        if np.any(weights < 0) or np.any(thetas <= 0):
-            raise ValueError('kernel_params require weights ≥ 0 and thetas > 0')
-        kernel_params = {'weights': weights.tolist(), 'thetas': thetas.tolist()}
-    tau_dynamic_on = cfg_json.get('tau_dynamic_on', False)
-    alpha_delay = cfg_json.get('alpha_delay', 0.0)
-    lambda_z = cfg_json.get('lambda_z', 0.0)
-    tau_model = cfg_json.get('tau_model', 'direct')
-    epsilon_tau = cfg_json.get('epsilon_tau', 0.1)
-    eta = cfg_json.get('eta', 0.1)
-    if not 0.05 <= epsilon_tau <= 0.2:
-        raise ValueError('epsilon_tau must be between 0.05 and 0.2')
-    if not 0.05 <= eta <= 0.1:
-        raise ValueError('eta must be between 0.05 and 0.1')
-    max_delta_d = cfg_json.get('max_delta_d', 0.25)
-    interp_order = cfg_json.get('interp_order', 3)
-
-    # Numerical parameters
-    numerical_params = cfg_json.get('numerical_params', {})
-    integrator = cfg_json.get('integrator', numerical_params.get('integrator', 'IMEX'))
+    gamma = config['gamma']
+    integrator = config['integrator']
+    max_ram_bytes = config['max_ram_bytes']
+    output_formats = cfg_json.get('output_formats', ['csv'])
+    if isinstance(output_formats, str):
+        output_formats = [output_formats]
+    unknown_formats = set(output_formats) - set(OUTPUT_FORMATS)
+    if unknown_formats or not output_formats:
+        raise ValueError(f'output_formats must be a non-empty subset of {OUTPUT_FORMATS}')
+
+    # --- Adaptive sweep (optional) ---
+    adaptive_cfg = cfg_json.get('adaptive_sweep')
+    sweep = None
+    if adaptive_cfg:
+        axes = dict(adaptive_cfg.get('axes', {}))
+        axes.setdefault('gamma', [gamma])
+        missing_axes = set(AXES) - axes.keys()
+        if missing_axes:
+            raise ValueError(f'adaptive_sweep axes require {sorted(missing_axes)}')
+        sweep = AdaptiveSweep(
+            axes,
+            metrics=adaptive_cfg.get('metrics', DEFAULT_METRICS),
+            variance_weight=adaptive_cfg.get('variance_weight', 1.0),
+            max_depth=adaptive_cfg.get('max_depth', 6),
+        )
+        sweep_budget = int(adaptive_cfg.get('budget', 4 * len(sweep.points) * len(seeds)))
+        if sweep_budget < len(sweep.points) * len(seeds):
+            raise ValueError('adaptive_sweep budget must cover the coarse grid times the seeds')
+        gammas = sweep.axes['gamma']
+    else:
+        gammas = [gamma]
 
     if integrator == 'Leapfrog':
-        if gamma != 0:
+        if any(g != 0 for g in gammas):
             raise ValueError('Leapfrog integrator requires gamma = 0')
-        if kernel_params:
-            raise ValueError('Leapfrog integrator incompatible with memory (kernel_params)')
 
     # --- Sweep Configuration ---
     simulation_points = []
@@ -215,8 +369,16 @@ def main():
                 simulation_points.append(pt)
                 point_to_group[pt] = name
 
+    # --- Sequential seed allocation (optional, fixed grid only) ---
+    sequential_cfg = resolve_sequential(cfg_json.get('sequential_seeds'))
+    sequential = None
+    if sequential_cfg is not None:
+        if sweep is not None:
+            raise ValueError('sequential_seeds cannot be combined with adaptive_sweep')
+        sequential = SequentialSeeds(simulation_points, seeds, sequential_cfg)
+
     # --- Create Unique Output Directory ---
-    mode_dir = 'passive' if gamma >= 0 else 'active'
+    mode_dir = 'passive' if min(gammas) >= 0 else 'active'
     base_run_dir = os.path.join('runs', mode_dir)
     os.makedirs(base_run_dir, exist_ok=True)
 
@@ -229,62 +391,107 @@ def main():
     all_runs_data = []
     all_blocks_data = []
 
-    print(f"🚀 Starting DOFT Phase-1 Simulation Sweep across {len(simulation_points)} points...")
-
-    total_sims = len(simulation_points) * len(seeds)
-
-    config = {
-        'gamma': gamma,
-        'grid_size': grid_size,
-        'boundary_mode': boundary_mode,
-        'log_steps': log_steps,
-        'log_path': log_path,
-        'a_ref': a_ref,
-        'tau_ref': tau_ref,
-        'point_to_group': point_to_group,
-        'max_ram_bytes': max_ram_bytes,
-        'lpc_duration_physical': lpc_duration_physical,
-        'pulse_amplitude': pulse_amplitude,
-        'detection_thresholds': detection_thresholds,
-        'max_pulse_steps': max_pulse_steps,
-        'max_lpc_steps': max_lpc_steps,
-        'kernel_params': kernel_params,
-        'integrator': integrator,
-        'tau_dynamic_on': tau_dynamic_on,
-        'alpha_delay': alpha_delay,
-        'lambda_z': lambda_z,
-        'tau_model': tau_model,
-        'epsilon_tau': epsilon_tau,
-        'eta': eta,
-        'max_delta_d': max_delta_d,
-        'interp_order': interp_order,
-    }
-
-    # Remove optional keys with None values to keep configuration clean
-    config = {k: v for k, v in config.items() if v is not None}
-
-    # Ensure required tau parameters are present exactly once
-    required_tau_keys = {'tau_model', 'epsilon_tau', 'eta'}
-    missing_tau = required_tau_keys - config.keys()
-    if missing_tau:
-        raise KeyError(f"Missing required config keys: {missing_tau}")
+    if sweep is not None:
+        print(
+            f"🚀 Starting adaptive DOFT Phase-1 sweep: {len(sweep.points)} coarse points, "
+            f"budget {sweep_budget} runs..."
+        )
+        total_sims = sweep_budget
+    elif sequential is not None:
+        print(
+            f"🚀 Starting sequential DOFT Phase-1 sweep across {len(sequential.points)} points: "
+            f"{sequential_cfg['initial']} to {sequential.max_seeds} seeds per point..."
+        )
+        total_sims = len(sequential.points) * sequential.max_seeds
+    else:
+        print(f"🚀 Starting DOFT Phase-1 Simulation Sweep across {len(simulation_points)} points...")
+        total_sims = len(simulation_points) * len(seeds)
+
+    config['point_to_group'] = point_to_group
+    if config.get('telemetry_interval') is not None:
+        # Every worker appends JSON lines to this one sweep-level file
+        config['progress_path'] = os.path.join(output_dir, 'progress.jsonl')
+        print(f"📈 Progress telemetry: tail -f {config['progress_path']}")
+    if config.get('snapshots') is not None:
+        # One store per run and phase: snapshots/<run_id>/{pulse,lpc}
+        config['snapshots'] = {**config['snapshots'], 'path': os.path.join(output_dir, 'snapshots')}
+        print(f"📸 Field snapshots: {config['snapshots']['path']}")
+
+    # --- Memory plan: cap concurrent workers (and switch to lean mode) so the
+    # sweep's estimated peak stays within max_ram_bytes ---
+    plan_points = (
+        sweep.points if sweep is not None
+        else [(a, t, gamma) for (a, t) in simulation_points]
+    )
+    memory_plan = plan_sweep(plan_points, config, max_ram_bytes, cfg_json.get('max_workers'))
+    if cfg_json.get('lean'):
+        memory_plan['lean'] = True
+    config['lean'] = memory_plan['lean']
+    print(
+        f"🧮 Memory plan: ~{memory_plan['per_run_bytes'] / 1024**2:.0f} MiB per run, "
+        f"{memory_plan['workers']} worker(s), lean={memory_plan['lean']}"
+    )
+    if not memory_plan['fits']:
+        logger.warning(
+            "A single run is estimated to need %.1f GiB, above max_ram_bytes=%.1f GiB",
+            memory_plan['per_run_bytes'] / 1024**3,
+            max_ram_bytes / 1024**3,
+        )
+
+    # --- Executor layout: processes x BLAS/FFT threads (and CPU pinning) ---
+    executor = resolve_executor(cfg_json.get('executor'), cfg_json.get('executor_profile'))
+    n_processes = pool_processes(executor, memory_plan['workers'])
+    if executor['threads_per_process'] or executor['affinity']:
+        print(
+            f"🧵 Executor: {n_processes} process(es) x "
+            f"{executor['threads_per_process'] or 'default'} thread(s), "
+            f"affinity={executor['affinity']}"
+        )
 
     counter = mp.Value('i', 0)
+    slots = mp.Value('i', 0)
     combos = [(a, t, s) for (a, t) in simulation_points for s in seeds]
 
+    def execute(run_batch, results_list):
+        if sequential is not None:
+            return sequential.run(run_batch, results_list)
+        if sweep is None:
+            run_batch(combos)
+            return len(combos)
+        return sweep.run(
+            run_batch, results_list, seeds, sweep_budget,
+            batch_points=adaptive_cfg.get('batch_points', 4),
+        )
+
+    if not args.parallel:
+        # The worker layout budgets a share of the node; the driver keeps all of it
+        executor = serial_layout(executor)
+
     if args.parallel:
         with mp.Manager() as manager:
             results_list = manager.list()
-            with mp.Pool(initializer=init_worker, initargs=(config, results_list, counter, total_sims)) as pool:
-                pool.starmap(run_single_sim, combos)
+            with mp.Pool(
+                processes=n_processes,
+                initializer=init_worker,
+                initargs=(config, results_list, counter, total_sims, executor, slots),
+            ) as pool:
+                runs_done = execute(lambda batch: pool.starmap(run_single_sim, batch), results_list)
             results = list(results_list)
     else:
         results = []
         init_worker(config, results, counter, total_sims)
-        for args_tuple in combos:
-            run_single_sim(*args_tuple)
+
+        def run_serial(batch):
+            for args_tuple in batch:
+                run_single_sim(*args_tuple)
+
+        with serial_limits(executor):
+            runs_done = execute(run_serial, results)
         results = list(results)
 
+    if sweep is not None:
+        simulation_points = sweep.points
+
     for run_metrics, blocks_df in results:
         all_runs_data.append(run_metrics)
         if blocks_df is not None and not blocks_df.empty:
@@ -292,42 +499,67 @@ def main():
 
     print(f"\n✅ Simulation sweep finished. Consolidating and writing results to {output_dir}...")
 
+    extensions = ['.csv' if fmt == 'csv' else COLUMNAR_EXTENSIONS[fmt] for fmt in output_formats]
+    # Tables and metadata go through a writer thread, so the metadata below
+    # is assembled while the tables are on their way to disk
+    writer = BackgroundWriter()
+
     runs_df = pd.DataFrame(all_runs_data)
-    runs_output_path = os.path.join(output_dir, 'runs.csv')
-    runs_df.to_csv(runs_output_path, index=False)
-    print(f"--> Wrote {len(runs_df)} rows to {runs_output_path}")
+    for ext in extensions:
+        runs_output_path = os.path.join(output_dir, 'runs' + ext)
+        writer.write_table(runs_df, runs_output_path, RUNS_COLUMNS)
+        print(f"--> Wrote {len(runs_df)} rows to {runs_output_path}")
 
     if all_blocks_data:
         blocks_df_final = pd.concat(all_blocks_data, ignore_index=True)
-        blocks_output_path = os.path.join(output_dir, 'blocks.csv')
-        blocks_df_final.to_csv(blocks_output_path, index=False)
-        print(f"--> Wrote {len(blocks_df_final)} rows to {blocks_output_path}")
+        for ext in extensions:
+            blocks_output_path = os.path.join(output_dir, 'blocks' + ext)
+            writer.write_table(blocks_df_final, blocks_output_path, BLOCKS_COLUMNS)
+            print(f"--> Wrote {len(blocks_df_final)} rows to {blocks_output_path}")
     else:
         print("--> No block data generated for blocks.csv.")
 
     meta_data = {
         'run_directory': os.path.join(mode_dir, f'phase1_run_{timestamp}'),
         'timestamp_utc': time.asctime(time.gmtime()),
-        'total_runs_in_sweep': total_sims,
+        'total_runs_in_sweep': runs_done,
         'simulation_points': simulation_points,
         'seeds_used': seeds,
-        'fixed_params': {'gamma': gamma, 'grid_size': grid_size},
+        'fixed_params': {'gamma': gamma, 'grid_size': config['grid_size']},
         'stability_params': {
             'dt_logic': 'min(0.02, 0.1, tau_nondim/50, 0.1/(gamma_nondim + |a_nondim| + 1))',
-            'a_ref': a_ref,
-            'tau_ref': tau_ref,
+            'a_ref': config['a_ref'],
+            'tau_ref': config['tau_ref'],
             'delay_interpolation': True,
         },
-        'tau_model': tau_model,
-        'epsilon_tau': epsilon_tau,
-        'eta': eta,
-        'alpha_delay': alpha_delay,
-        'lambda_z': lambda_z,
-        'topology': {'grid': [grid_size, grid_size], 'boundary_mode': boundary_mode},
+        'tau_model': config['tau_model'],
+        'epsilon_tau': config['epsilon_tau'],
+        'eta': config['eta'],
+        'alpha_delay': config['alpha_delay'],
+        'lambda_z': config['lambda_z'],
+        'topology': {
+            'grid': [config['grid_size'], config['grid_size']],
+            'boundary_mode': config['boundary_mode'],
+        },
     }
 
-    if kernel_params is not None:
-        meta_data['kernel_params'] = kernel_params
+    if config.get('kernel_params') is not None:
+        meta_data['kernel_params'] = config['kernel_params']
+    if sweep is not None:
+        meta_data['adaptive_sweep'] = {
+            'axes': sweep.axes,
+            'metrics': sweep.metrics,
+            'budget': sweep_budget,
+            'rounds': sweep.history,
+        }
+    if sequential is not None:
+        meta_data['sequential_seeds'] = sequential.summary()
+        meta_data['seeds_used'] = sequential.seeds[:max(sequential.n_seeds.values(), default=0)]
+        print(
+            f"--> Sequential seeds: {meta_data['sequential_seeds']['runs_used']} runs, "
+            f"{meta_data['sequential_seeds']['runs_saved']} saved against "
+            f"{sequential.max_seeds} seeds per point"
+        )
 
     repo_root = Path(__file__).resolve().parents[2]
     try:
@@ -341,12 +573,24 @@ def main():
         'manifest': 'MANIFESTO.md',
         'code_version': code_version,
         'seeds_detailed': [{'seed': s} for s in seeds],
-        'pulse_amplitude': pulse_amplitude,
-        'detection_thresholds': detection_thresholds,
+        'pulse_amplitude': config['pulse_amplitude'],
+        'detection_thresholds': config['detection_thresholds'],
+        'output_formats': output_formats,
+        'pulse_early_stop': config.get('pulse_early_stop'),
+        'pulse_slope_rtol': config['pulse_slope_rtol'],
+        'pulse_check_interval': config['pulse_check_interval'],
+        'memory_plan': memory_plan,
+        'snapshots': config.get('snapshots'),
+        'lpc_probes': config.get('lpc_probes'),
+        'lpc_parareal': config.get('lpc_parareal'),
+        'precompute_cache_size': config['precompute_cache_size'],
+        'crn_experiment': config.get('crn_experiment'),
+        'energy_stride': config['energy_stride'],
+        'executor': {**executor, 'processes': n_processes} if args.parallel else executor,
     })
     meta_output_path = os.path.join(output_dir, 'run_meta.json')
-    with open(meta_output_path, 'w') as f:
-        json.dump(meta_data, f, indent=4)
+    writer.write_json(meta_data, meta_output_path)
+    writer.close()
     print(f"--> Wrote metadata to {meta_output_path}")
 
 if __name__ == "__main__":
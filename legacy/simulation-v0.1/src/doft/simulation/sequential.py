@@ -0,0 +1,202 @@
+# src/doft/simulation/sequential.py
+"""Sequential seed allocation for fixed-grid sweeps.
+
+Instead of running every ``seeds`` entry at every point, each point starts
+with the first ``initial`` seeds. After every round the confidence interval
+half-width ``z * std / sqrt(n)`` of each tracked metric is computed per
+point, and only points where some metric is still wider than its target
+get ``batch`` more seeds, up to ``max`` seeds per point. Points always run
+a prefix of the same seed list, so runs stay paired across points (see
+``crn_experiment``).
+
+Enabled with the ``sequential_seeds`` config mapping, e.g.::
+
+    "sequential_seeds": {"initial": 3, "max": 10, "ci_target": {"ceff_pulse": 0.01}}
+"""
+
+import math
+
+import numpy as np
+
+SEQUENTIAL_DEFAULTS = {
+    "initial": 3,
+    "batch": 1,
+    "max": None,
+    "metrics": ["ceff_pulse", "lpc_ok_frac"],
+    "ci_target": 0.05,
+    "relative": False,
+    "z": 1.96,
+}
+
+
+def resolve_sequential(spec) -> dict | None:
+    """Normalise the ``sequential_seeds`` option; ``None`` disables the mode.
+
+    ``spec`` is ``True`` (defaults) or a mapping with any of the keys of
+    :data:`SEQUENTIAL_DEFAULTS`. ``max`` defaults to the number of configured
+    seeds. ``ci_target`` is one half-width for all metrics or a mapping per
+    metric; with ``relative`` it is a fraction of ``|mean|``.
+    """
+
+    if spec is None or spec is False:
+        return None
+    if spec is True:
+        spec = {}
+    if not isinstance(spec, dict):
+        raise ValueError("sequential_seeds must be a mapping")
+    unknown = set(spec) - set(SEQUENTIAL_DEFAULTS)
+    if unknown:
+        raise ValueError(f"unknown sequential_seeds keys: {sorted(unknown)}")
+    cfg = {**SEQUENTIAL_DEFAULTS, **spec}
+    for key in ("initial", "batch"):
+        if int(cfg[key]) < 1:
+            raise ValueError(f"sequential_seeds {key} must be >= 1")
+        cfg[key] = int(cfg[key])
+    if cfg["max"] is not None:
+        cfg["max"] = int(cfg["max"])
+        if cfg["max"] < cfg["initial"]:
+            raise ValueError("sequential_seeds max must be >= initial")
+    cfg["metrics"] = list(cfg["metrics"])
+    targets = cfg["ci_target"]
+    if not isinstance(targets, dict):
+        targets = {m: targets for m in cfg["metrics"]}
+    if set(targets) != set(cfg["metrics"]):
+        raise ValueError("sequential_seeds ci_target must cover exactly the metrics")
+    if not all(float(v) > 0 for v in targets.values()):
+        raise ValueError("sequential_seeds ci_target must be > 0")
+    cfg["ci_target"] = {m: float(v) for m, v in targets.items()}
+    return cfg
+
+
+def extend_seeds(seeds, n: int) -> list:
+    """The first ``n`` seeds: ``seeds`` continued with the integers after its maximum."""
+
+    seeds = list(seeds)
+    extra = max(seeds, default=-1) + 1
+    while len(seeds) < n:
+        seeds.append(extra)
+        extra += 1
+    return seeds[:n]
+
+
+class SequentialSeeds:
+    """Per-point seed counts grown until the metric intervals are narrow enough.
+
+    Parameters
+    ----------
+    points:
+        The ``(a, tau)`` sweep points.
+    seeds:
+        Configured seeds; extended by :func:`extend_seeds` up to ``max``.
+    cfg:
+        Options from :func:`resolve_sequential`.
+    """
+
+    def __init__(self, points, seeds, cfg):
+        self.points = list(dict.fromkeys(tuple(p) for p in points))
+        self.cfg = cfg
+        self.max_seeds = cfg["max"] if cfg["max"] is not None else max(len(seeds), cfg["initial"])
+        self.seeds = extend_seeds(seeds, self.max_seeds)
+        self.results: dict[tuple, list[dict]] = {p: [] for p in self.points}
+        self.n_seeds = {p: 0 for p in self.points}
+        self.history: list[dict] = []
+
+    def record(self, point, run_metrics: dict):
+        """Store the tracked metrics of one run at ``point``."""
+
+        self.results.setdefault(tuple(point), []).append(
+            {m: _as_float(run_metrics.get(m)) for m in self.cfg["metrics"]}
+        )
+
+    def halfwidths(self, point) -> dict:
+        """Return ``{metric: half-width}`` of the ``z`` interval at ``point``.
+
+        A metric with a single finite value has an infinite half-width; one
+        that is never finite (not produced by the run) is ignored.
+        """
+
+        out = {}
+        for m in self.cfg["metrics"]:
+            vals = np.array([r[m] for r in self.results.get(point, [])], dtype=float)
+            vals = vals[np.isfinite(vals)]
+            if vals.size == 0:
+                continue
+            if vals.size == 1:
+                out[m] = math.inf
+                continue
+            hw = self.cfg["z"] * float(vals.std(ddof=1)) / math.sqrt(vals.size)
+            if self.cfg["relative"]:
+                mean = abs(float(vals.mean()))
+                hw = hw / mean if mean > 0 else (0.0 if hw == 0 else math.inf)
+            out[m] = hw
+        return out
+
+    def converged(self, point) -> bool:
+        targets = self.cfg["ci_target"]
+        return all(hw <= targets[m] for m, hw in self.halfwidths(point).items())
+
+    def run(self, run_batch, results) -> int:
+        """Run rounds until every point has converged or reached ``max`` seeds.
+
+        ``run_batch(combos)`` executes ``(a, tau, seed)`` tuples and appends
+        ``(run_metrics, blocks_df)`` entries to ``results``. Returns the
+        number of runs performed.
+        """
+
+        pending = {p: self.cfg["initial"] for p in self.points}
+        used = 0
+        while pending:
+            combos = [
+                (a, tau, s)
+                for (a, tau), n in pending.items()
+                for s in self.seeds[self.n_seeds[(a, tau)]:n]
+            ]
+            start = len(results)
+            run_batch(combos)
+            for run_metrics, _blocks in list(results[start:]):
+                self.record((run_metrics["a_mean"], run_metrics["tau_mean"]), run_metrics)
+            self.n_seeds.update(pending)
+            used += len(combos)
+            self.history.append({"points": [list(p) for p in pending], "runs": len(combos), "runs_used": used})
+
+            pending = {
+                p: min(n + self.cfg["batch"], self.max_seeds)
+                for p, n in self.n_seeds.items()
+                if n < self.max_seeds and not self.converged(p)
+            }
+        return used
+
+    def summary(self) -> dict:
+        """Metadata for ``run_meta.json``: rounds, per-point seed counts and saved runs."""
+
+        runs_used = sum(self.n_seeds.values())
+        runs_fixed = len(self.points) * self.max_seeds
+        return {
+            **self.cfg,
+            "max": self.max_seeds,
+            "seeds": self.seeds,
+            "rounds": self.history,
+            "points": [
+                {
+                    "point": list(p),
+                    "n_seeds": self.n_seeds[p],
+                    "converged": self.converged(p),
+                    "ci_halfwidth": {m: _json_float(v) for m, v in self.halfwidths(p).items()},
+                }
+                for p in self.points
+            ],
+            "runs_used": runs_used,
+            "runs_fixed": runs_fixed,
+            "runs_saved": runs_fixed - runs_used,
+        }
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _json_float(value: float):
+    return value if math.isfinite(value) else None
@@ -0,0 +1,166 @@
+# src/doft/simulation/sweep.py
+"""Adaptive refinement of ``(a, tau, gamma)`` parameter sweeps.
+
+The sweep starts from a coarse tensor grid. Neighbouring points along each
+axis form the edges of the sweep; after every round of runs each edge is
+scored by how much the per-point metric means differ across it and by the
+seed spread at its end points. New points are placed at the midpoints of
+the highest-scoring edges until the run budget is spent, so runs accumulate
+where a metric changes regime instead of being spread uniformly.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+AXES = ("a", "tau", "gamma")
+DEFAULT_METRICS = ("lpc_ok_frac", "anisotropy_max_pct")
+
+
+class AdaptiveSweep:
+    """Coarse grid plus midpoint refinement driven by metric contrast.
+
+    Parameters
+    ----------
+    axes:
+        Mapping with the coarse values of ``"a"``, ``"tau"`` and ``"gamma"``.
+    metrics:
+        Run metrics whose transitions drive the refinement.
+    variance_weight:
+        Weight of the seed standard deviation relative to the difference of
+        the means when scoring an edge.
+    max_depth:
+        Number of times a coarse interval may be bisected.
+    """
+
+    def __init__(self, axes, metrics=DEFAULT_METRICS, variance_weight=1.0, max_depth=6):
+        missing = set(AXES) - set(axes)
+        if missing:
+            raise ValueError(f"adaptive sweep axes missing: {sorted(missing)}")
+        self.axes = {name: sorted({float(v) for v in axes[name]}) for name in AXES}
+        self.metrics = list(metrics)
+        self.variance_weight = float(variance_weight)
+        self.min_step = {
+            name: (vals[-1] - vals[0]) / 2 ** max_depth if len(vals) > 1 else 0.0
+            for name, vals in self.axes.items()
+        }
+        self.points = list(itertools.product(*(self.axes[name] for name in AXES)))
+        self.results: dict[tuple, list[dict]] = {}
+        self.history: list[dict] = []
+
+    def record(self, point, run_metrics: dict):
+        """Store the metrics of one run at ``point``."""
+
+        self.results.setdefault(tuple(point), []).append(
+            {m: _as_float(run_metrics.get(m)) for m in self.metrics}
+        )
+
+    def point_stats(self, point) -> dict:
+        """Return ``{metric: (mean, std)}`` over the seeds run at ``point``."""
+
+        stats = {}
+        for m in self.metrics:
+            vals = np.array([r[m] for r in self.results.get(point, [])], dtype=float)
+            vals = vals[np.isfinite(vals)]
+            mean = float(vals.mean()) if vals.size else math.nan
+            std = float(vals.std(ddof=1)) if vals.size > 1 else 0.0
+            stats[m] = (mean, std)
+        return stats
+
+    def edges(self):
+        """Yield ``(p, q, axis)`` for neighbouring points along each axis."""
+
+        for k, name in enumerate(AXES):
+            lines: dict[tuple, list[tuple]] = {}
+            for p in self.points:
+                lines.setdefault(p[:k] + p[k + 1:], []).append(p)
+            for line in lines.values():
+                line.sort(key=lambda p: p[k])
+                for p, q in zip(line, line[1:]):
+                    yield p, q, k
+
+    def score_edges(self):
+        """Return ``(score, p, q, axis)`` for every edge that may be split."""
+
+        stats = {p: self.point_stats(p) for p in self.points}
+        # Each metric is normalised by the spread of its point means (or by
+        # its largest seed spread while the means are still flat)
+        scales = {}
+        for m in self.metrics:
+            means = [stats[p][m][0] for p in self.points if math.isfinite(stats[p][m][0])]
+            span = max(means) - min(means) if means else 0.0
+            span = max(span, max((stats[p][m][1] for p in self.points), default=0.0))
+            if span > 0:
+                scales[m] = span
+
+        scored = []
+        for p, q, k in self.edges():
+            if q[k] - p[k] < 2 * self.min_step[AXES[k]]:
+                continue
+            score = 0.0
+            for m, scale in scales.items():
+                (mp, sp), (mq, sq) = stats[p][m], stats[q][m]
+                if math.isfinite(mp) and math.isfinite(mq):
+                    score += abs(mp - mq) / scale
+                score += self.variance_weight * 0.5 * (sp + sq) / scale
+            scored.append((score, p, q, k))
+        scored.sort(key=lambda e: (-e[0], -(e[2][e[3]] - e[1][e[3]]), e[1], e[2]))
+        return scored
+
+    def refine(self, n_points: int) -> list[tuple]:
+        """Add up to ``n_points`` midpoints of the best edges and return them.
+
+        Edges without any contrast score zero and are split longest first,
+        so a budget left after the transitions are resolved fills the grid
+        uniformly.
+        """
+
+        existing = set(self.points)
+        new = []
+        for score, p, q, k in self.score_edges():
+            if len(new) >= n_points:
+                break
+            mid = list(p)
+            mid[k] = round(0.5 * (p[k] + q[k]), 12)
+            mid = tuple(mid)
+            if mid not in existing:
+                existing.add(mid)
+                new.append(mid)
+        self.points.extend(new)
+        return new
+
+    def run(self, run_batch, results, seeds, budget: int, batch_points: int = 4):
+        """Drive the sweep until ``budget`` runs have been spent.
+
+        ``run_batch(combos)`` executes ``(a, tau, seed, gamma, group)`` tuples
+        and appends ``(run_metrics, blocks_df)`` entries to ``results``; the
+        entries added by each batch are folded into the sweep. Returns the
+        number of runs performed.
+        """
+
+        seeds = list(seeds)
+        pending, group = list(self.points), "coarse"
+        used = 0
+        while pending:
+            start = len(results)
+            run_batch([(a, tau, s, gamma, group) for (a, tau, gamma) in pending for s in seeds])
+            for run_metrics, _blocks in list(results[start:]):
+                point = (run_metrics["a_mean"], run_metrics["tau_mean"], run_metrics["gamma"])
+                self.record(point, run_metrics)
+            used += len(pending) * len(seeds)
+            self.history.append({"group": group, "points": [list(p) for p in pending], "runs_used": used})
+
+            room = (budget - used) // max(len(seeds), 1)
+            if room <= 0:
+                break
+            group = f"refine_{len(self.history)}"
+            pending = self.refine(min(batch_points, room))
+        return used
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
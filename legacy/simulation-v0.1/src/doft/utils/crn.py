@@ -0,0 +1,34 @@
+"""Common random numbers: named per-seed random substreams.
+
+By default a model draws all its noise from one ``default_rng(seed)``, so
+what a draw sees depends on everything drawn before it in the run. In
+common-random-numbers (CRN) mode each use draws from its own named
+substream, derived from ``(seed, experiment, name)`` only::
+
+    SeedSequence(seed, spawn_key=(crc32(experiment), crc32(name)))
+
+Every sweep point of an experiment therefore gets the same initial noise
+for a given seed, whatever its parameters or the order of the draws, and
+metric differences between points can be estimated from paired runs (see
+:func:`doft.analysis.analyze_results.paired_difference`).
+"""
+
+import zlib
+
+import numpy as np
+
+# Substreams drawn by the model
+CRN_STREAMS = ("pulse_noise", "lpc_init")
+
+
+def stream_seed(seed: int, experiment: str, name: str) -> np.random.SeedSequence:
+    """Return the :class:`~numpy.random.SeedSequence` of substream ``name``."""
+
+    key = (zlib.crc32(experiment.encode()), zlib.crc32(name.encode()))
+    return np.random.SeedSequence(seed, spawn_key=key)
+
+
+def rng_stream(seed: int, experiment: str, name: str) -> np.random.Generator:
+    """Return a fresh generator at the start of substream ``name``."""
+
+    return np.random.default_rng(stream_seed(seed, experiment, name))
@@ -0,0 +1,333 @@
+"""Tabular outputs for run and block tables.
+
+CSV remains the default export. The columnar formats (Parquet and Arrow IPC)
+use an explicit schema so list-valued metrics keep their native type and the
+repeated ids are dictionary encoded instead of stored as strings per row.
+``pyarrow`` is only imported when a columnar format is requested.
+
+:class:`BackgroundWriter` moves the writes off the compute thread.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+OUTPUT_FORMATS = ("csv", *COLUMNAR_EXTENSIONS)
+
+# (name, type) pairs; the type names are resolved by ``_arrow_type``.
+RUNS_COLUMNS = [
+    ("run_id", "dict"),
+    ("seed", "int64"),
+    ("a_mean", "float64"),
+    ("tau_mean", "float64"),
+    ("gamma", "float64"),
+    ("param_group", "dict"),
+    ("lorentz_window", "dict"),
+    # C-1 / C-2: pulse front speed and anisotropy
+    ("xi_floor", "float64"),
+    ("ceff_pulse", "float64"),
+    ("ceff_pulse_ic95_lo", "float64"),
+    ("ceff_pulse_ic95_hi", "float64"),
+    ("anisotropy_max_pct", "float64"),
+    ("var_c_over_c2", "float64"),
+    ("ceff_iso_x", "float64"),
+    ("ceff_iso_y", "float64"),
+    ("ceff_iso_z", "float64"),
+    ("ceff_iso_diag", "float64"),
+    ("ceff_pulse_by_thr", "list<float64>"),
+    ("pulse_steps_run", "int64"),
+    ("pulse_steps_saved", "int64"),
+    ("pulse_stop_reason", "dict"),
+    # C-3: LPC windows
+    ("lpc_ok_frac", "float64"),
+    ("lpc_vcount", "int64"),
+    ("lpc_windows_analyzed", "int64"),
+    ("block_skipped", "int64"),
+    ("lpc_n_probes", "int64"),
+    ("lpc_ok_frac_by_probe", "list<float64>"),
+    ("lpc_ok_frac_probe_std", "float64"),
+    # Experimental parareal LPC; null unless lpc_parareal is set
+    ("lpc_parareal_slices", "int64"),
+    ("lpc_parareal_iterations", "int64"),
+    ("lpc_parareal_converged", "bool"),
+    ("lpc_parareal_residual", "float64"),
+    ("lpc_parareal_fine_rejections", "int64"),
+    ("lpc_parareal_s", "float64"),
+    ("lpc_serial_s", "float64"),
+    ("lpc_parareal_speedup", "float64"),
+    ("lpc_parareal_K_dev", "float64"),
+    # Delay model diagnostics
+    ("tau_dynamic_on", "bool"),
+    ("alpha_delay", "float64"),
+    ("lambda_z", "float64"),
+    ("dt_max_delta_d_exceeded_count", "int64"),
+    ("delta_d_rate", "float64"),
+    ("interp_order", "int64"),
+    ("ring_buffer_len", "int64"),
+    # v1.4.1 additions (tests/expected_columns_v141.txt); null until produced
+    ("lpc_mean", "float64"),
+    ("lpc_drift", "float64"),
+    ("skin_duty", "float64"),
+    ("phi_offharm", "float64"),
+    ("ret_eff_peak", "float64"),
+    ("rstar_est", "float64"),
+    ("pulses_per_period", "float64"),
+]
+
+BLOCKS_COLUMNS = [
+    ("run_id", "dict"),
+    ("probe_id", "int64"),
+    ("window_id", "int64"),
+    ("K_metric", "float64"),
+    ("deltaK", "float64"),
+    ("block_skipped", "int64"),
+]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise SystemExit(
+            "pyarrow is required for Parquet/Arrow outputs. Please install pyarrow or use the csv format."
+        ) from e
+    return pa
+
+
+def _arrow_type(pa, name: str):
+    if name == "dict":
+        return pa.dictionary(pa.int32(), pa.string())
+    if name == "list<float64>":
+        return pa.list_(pa.float64())
+    return {"float64": pa.float64(), "int64": pa.int64(), "bool": pa.bool_()}[name]
+
+
+def arrow_schema(columns):
+    """Return a ``pyarrow.Schema`` for ``RUNS_COLUMNS`` or ``BLOCKS_COLUMNS``."""
+
+    pa = _require_pyarrow()
+    return pa.schema([pa.field(name, _arrow_type(pa, kind)) for name, kind in columns])
+
+
+def to_arrow(df, columns):
+    """Convert ``df`` to an Arrow table following ``columns``.
+
+    Schema columns missing from ``df`` are written as nulls; columns that are
+    not part of the schema are appended with an inferred type so new metrics
+    are never dropped.
+    """
+
+    pa = _require_pyarrow()
+    schema = arrow_schema(columns)
+    arrays, fields = [], []
+    for field in schema:
+        if field.name in df.columns:
+            arrays.append(pa.array(df[field.name], type=field.type, from_pandas=True))
+        else:
+            arrays.append(pa.nulls(len(df), type=field.type))
+        fields.append(field)
+    for col in df.columns:
+        if col in schema.names:
+            continue
+        arr = pa.array(df[col], from_pandas=True)
+        arrays.append(arr)
+        fields.append(pa.field(col, arr.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_table(df, path: str, columns=None):
+    """Write ``df`` to ``path`` in the format implied by its extension."""
+
+    ext = os.path.splitext(path)[1]
+    if ext == ".csv":
+        df.to_csv(path, index=False)
+        return
+    table = to_arrow(df, columns or [])
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    elif ext == ".arrow":
+        import pyarrow.ipc as ipc
+
+        with ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"unknown output format for {path}")
+
+
+def read_table(path: str):
+    """Read a run/block table written by :func:`write_table` as a DataFrame.
+
+    Dictionary-encoded ids come back as pandas categoricals and list columns
+    as arrays, so no text re-parsing is needed for the columnar formats.
+    """
+
+    ext = os.path.splitext(path)[1]
+    if ext == ".csv":
+        import pandas as pd
+
+        return pd.read_csv(path)
+    _require_pyarrow()
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path).to_pandas()
+    if ext == ".arrow":
+        import pyarrow.ipc as ipc
+
+        with ipc.open_file(path) as reader:
+            return reader.read_all().to_pandas()
+    raise ValueError(f"unknown table format for {path}")
+
+
+def find_table(directory: str, stem: str) -> str | None:
+    """Return the first existing ``stem`` table in ``directory``.
+
+    Columnar files are preferred over CSV when several formats are present.
+    """
+
+    for ext in (*COLUMNAR_EXTENSIONS.values(), ".csv"):
+        path = os.path.join(directory, stem + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def write_json(obj, path: str):
+    """Write ``obj`` as indented JSON to ``path``."""
+
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=4)
+
+
+def _fsync(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class BackgroundWriter:
+    """Execute output writes on a background thread.
+
+    Jobs are queued with :meth:`submit` and run in order on a single writer
+    thread. The queue holds at most ``max_pending`` jobs; when the disk falls
+    behind, :meth:`submit` blocks the producer (backpressure) and the time
+    spent waiting is accumulated in :attr:`blocked_s`. A job returns the
+    path (or list of paths) it wrote; :meth:`flush` waits for the queue to
+    drain and fsyncs those files and their directories, so callers flush at
+    phase boundaries. The first failing job stops all later ones and its
+    exception is raised from the next :meth:`submit`, :meth:`flush` or
+    :meth:`close`.
+    """
+
+    def __init__(self, max_pending: int = 8):
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._written: list[str] = []
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+        self._closed = False
+        self.blocked_s = 0.0
+        self.jobs_done = 0
+        self._thread = threading.Thread(target=self._drain, name="doft-writer", daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                if self._error is not None:
+                    continue
+                fn, args, kwargs = job
+                written = fn(*args, **kwargs)
+                if written is not None:
+                    with self._lock:
+                        self._written.extend([written] if isinstance(written, str) else written)
+                self.jobs_done += 1
+            except BaseException as e:  # re-raised on the producer side
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def check(self):
+        """Raise the error of a failed job, if any."""
+
+        if self._error is not None:
+            raise RuntimeError(f"background write failed: {self._error!r}") from self._error
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue ``fn(*args, **kwargs)``; blocks while the queue is full."""
+
+        self.check()
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        job = (fn, args, kwargs)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            t0 = time.perf_counter()
+            self._queue.put(job)
+            self.blocked_s += time.perf_counter() - t0
+
+    def write_table(self, df, path: str, columns=None):
+        """Queue :func:`write_table` for ``df``."""
+
+        self.submit(_written(write_table), df, path, columns)
+
+    def write_json(self, obj, path: str):
+        """Queue :func:`write_json` for ``obj``."""
+
+        self.submit(_written(write_json), obj, path)
+
+    def flush(self, fsync: bool = True):
+        """Wait for every queued job and fsync the files written so far."""
+
+        self._queue.join()
+        self.check()
+        with self._lock:
+            written, self._written = self._written, []
+        if fsync:
+            for path in written:
+                _fsync(path)
+            for directory in {os.path.dirname(os.path.abspath(p)) for p in written}:
+                _fsync(directory)
+
+    def close(self):
+        """Flush and stop the writer thread."""
+
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:  # keep the original exception; stop without raising a write error
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+def _written(fn):
+    def job(obj, path, *args):
+        fn(obj, path, *args)
+        return path
+
+    return job
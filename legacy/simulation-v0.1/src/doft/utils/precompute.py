@@ -0,0 +1,94 @@
+"""Per-process cache of immutable precomputations.
+
+A pool worker builds dozens of models that share the grid size and often
+the time step, so the arrays that depend only on such parameters (the
+Gaussian pulse, the front-detection rays, the Lagrange nodes of the delay
+interpolator, the Prony decay factors) are built once per process and
+shared. Each entry is keyed on exactly the parameters it depends on, e.g.
+``("pulse_profile", grid_size)`` or ``("prony", weights, thetas, dt)``, so
+models that differ elsewhere still share it.
+
+Cached arrays are made read-only; callers copy before modifying. The cache
+is a least-recently-used map bounded by ``maxsize`` entries (``0``
+disables it) and counts hits, misses and evictions.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAXSIZE = 64
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class PrecomputeCache:
+    """LRU map from hashable keys to immutable precomputed values."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = int(maxsize)
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, factory):
+        """Return the value for ``key``, building it with ``factory()`` on a miss."""
+
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = _freeze(factory())
+            if self.maxsize > 0:
+                self._data[key] = value
+                self._evict()
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int):
+        """Change the bound, evicting the least recently used entries."""
+
+        if int(maxsize) < 0:
+            raise ValueError("precompute cache size must be >= 0")
+        self.maxsize = int(maxsize)
+        self._evict()
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+# One cache per process: pool workers each get their own on import
+PRECOMPUTE = PrecomputeCache()
@@ -0,0 +1,294 @@
+"""Chunked on-disk snapshots of the lattice fields.
+
+A snapshot store is a directory holding ``meta.json`` and one chunk per
+block of ``chunk_steps`` captured frames::
+
+    <path>/meta.json
+    <path>/chunk_000000.npz          # compress=True: Q, P, ..., step, t
+    <path>/chunk_000001/Q.npy        # compress=False: one .npy per array
+
+:class:`SnapshotWriter` copies the requested region of each field into a
+preallocated block buffer during the step loop; full blocks are written by
+a :class:`~doft.utils.outputs.BackgroundWriter`, so the loop only pays for
+the copy. At most ``max_pending`` blocks wait for the disk before
+:meth:`SnapshotWriter.capture` blocks, which bounds the memory held by the
+writer. Chunks are written to a temporary name and renamed, so a store that
+is still being written only ever exposes complete chunks.
+
+:class:`SnapshotStore` reads a store lazily: uncompressed chunks are memory
+mapped and compressed chunks are decompressed one array at a time.
+"""
+
+import json
+import os
+import queue
+
+import numpy as np
+
+from doft.utils.outputs import BackgroundWriter, write_json
+
+META_NAME = "meta.json"
+
+
+def _chunk_name(k: int) -> str:
+    return f"chunk_{k:06d}"
+
+
+def _region_slices(region, shape):
+    if region is None:
+        return (slice(0, shape[0]), slice(0, shape[1]))
+    r0, r1, c0, c1 = (int(v) for v in region)
+    if not (0 <= r0 < r1 <= shape[0] and 0 <= c0 < c1 <= shape[1]):
+        raise ValueError(f"snapshot region {list(region)} outside the {shape} lattice")
+    return (slice(r0, r1), slice(c0, c1))
+
+
+def block_bytes(n_fields: int, region_shape, chunk_steps: int) -> int:
+    """Bytes of one block buffer for ``n_fields`` float64 fields."""
+
+    cells = int(np.prod(region_shape))
+    return chunk_steps * (n_fields * cells * 8 + 16)
+
+
+class SnapshotWriter:
+    """Capture field snapshots into chunks written by a background thread.
+
+    Parameters
+    ----------
+    path:
+        Store directory (created if needed).
+    fields:
+        Names of the fields passed to :meth:`capture`.
+    shape:
+        Lattice shape of every field.
+    stride:
+        Capture every ``stride``-th step (see :meth:`due`).
+    region:
+        Optional ``(row0, row1, col0, col1)`` window; the full lattice by
+        default.
+    chunk_steps:
+        Frames per chunk.
+    compress:
+        Write compressed ``.npz`` chunks instead of memory-mappable ``.npy``.
+    max_pending:
+        Full blocks allowed to wait for the writer thread.
+    attrs:
+        Extra JSON-serialisable metadata stored in ``meta.json``.
+    writer:
+        Shared :class:`~doft.utils.outputs.BackgroundWriter`; a private one
+        is started (and stopped by :meth:`close`) when omitted.
+    """
+
+    def __init__(
+        self,
+        path,
+        fields,
+        shape,
+        *,
+        stride: int = 1,
+        region=None,
+        chunk_steps: int = 64,
+        compress: bool = True,
+        max_pending: int = 2,
+        attrs: dict | None = None,
+        writer: BackgroundWriter | None = None,
+    ):
+        if stride < 1 or chunk_steps < 1 or max_pending < 1:
+            raise ValueError("stride, chunk_steps and max_pending must be >= 1")
+        self.path = os.fspath(path)
+        self.fields = list(fields)
+        self.stride = int(stride)
+        self.chunk_steps = int(chunk_steps)
+        self.compress = bool(compress)
+        self._slices = _region_slices(region, tuple(shape))
+        region_shape = tuple(s.stop - s.start for s in self._slices)
+        self.meta = {
+            "fields": self.fields,
+            "shape": list(shape),
+            "region": [self._slices[0].start, self._slices[0].stop,
+                       self._slices[1].start, self._slices[1].stop],
+            "stride": self.stride,
+            "chunk_steps": self.chunk_steps,
+            "compress": self.compress,
+            "dtype": "float64",
+            "n_frames": None,
+            "n_chunks": None,
+            **(attrs or {}),
+        }
+        os.makedirs(self.path, exist_ok=True)
+        self._own_writer = writer is None
+        self._writer = BackgroundWriter() if writer is None else writer
+        self._write_meta()
+        self._writer.flush()
+
+        # Block buffers cycle between the step loop and the writer thread
+        self._free: queue.Queue = queue.Queue()
+        for _ in range(max_pending + 1):
+            self._free.put(self._new_block(region_shape))
+        self._block = None
+        self._fill = 0
+        self._n_frames = 0
+        self._n_chunks = 0
+        self._closed = False
+
+    def _new_block(self, region_shape):
+        block = {name: np.empty((self.chunk_steps, *region_shape)) for name in self.fields}
+        block["step"] = np.empty(self.chunk_steps, dtype=np.int64)
+        block["t"] = np.empty(self.chunk_steps)
+        return block
+
+    def _write_meta(self):
+        self._writer.submit(self._replace_meta, dict(self.meta))
+
+    def _replace_meta(self, meta: dict) -> str:
+        path = os.path.join(self.path, META_NAME)
+        write_json(meta, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        return path
+
+    def due(self, step: int) -> bool:
+        return step % self.stride == 0
+
+    def capture(self, step: int, t: float, fields: dict):
+        """Copy the region of every field into the current block."""
+
+        while self._block is None:
+            # A failed writer skips the queued blocks, so never wait blindly
+            self._writer.check()
+            try:
+                self._block = self._free.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        i = self._fill
+        for name in self.fields:
+            np.copyto(self._block[name][i], fields[name][self._slices])
+        self._block["step"][i] = step
+        self._block["t"][i] = t
+        self._fill += 1
+        self._n_frames += 1
+        if self._fill == self.chunk_steps:
+            self._submit()
+
+    def _submit(self):
+        self._writer.submit(self._write_block, self._n_chunks, self._block, self._fill)
+        self._n_chunks += 1
+        self._block, self._fill = None, 0
+
+    def _write_block(self, k: int, block: dict, n: int) -> list[str]:
+        try:
+            return self._write_chunk(k, block, n)
+        finally:
+            self._free.put(block)
+
+    def _write_chunk(self, k: int, block: dict, n: int) -> list[str]:
+        arrays = {name: block[name][:n] for name in (*self.fields, "step", "t")}
+        final = os.path.join(self.path, _chunk_name(k))
+        if self.compress:
+            tmp = final + ".tmp.npz"
+            np.savez_compressed(tmp, **arrays)
+            os.replace(tmp, final + ".npz")
+            return [final + ".npz"]
+        tmp = final + ".tmp"
+        os.makedirs(tmp, exist_ok=True)
+        for name, arr in arrays.items():
+            np.save(os.path.join(tmp, name + ".npy"), arr)
+        os.replace(tmp, final)
+        return [os.path.join(final, name + ".npy") for name in arrays]
+
+    def close(self):
+        """Flush the partial block, finalise ``meta.json`` and fsync the store."""
+
+        if self._closed:
+            return
+        self._closed = True
+        if self._fill:
+            self._submit()
+        self.meta["n_frames"] = self._n_frames
+        self.meta["n_chunks"] = self._n_chunks
+        self._write_meta()
+        if self._own_writer:
+            self._writer.close()
+        else:
+            self._writer.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SnapshotStore:
+    """Lazy reader for a directory written by :class:`SnapshotWriter`.
+
+    ``store[i]`` returns ``{field: frame}`` for captured frame ``i`` and
+    ``store.frame(i, "Q")`` a single field; only the chunk holding the
+    frame is touched. :attr:`steps` and :attr:`times` index the frames.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(os.path.join(self.path, META_NAME)) as f:
+            self.meta = json.load(f)
+        self.fields = self.meta["fields"]
+        self.chunk_steps = self.meta["chunk_steps"]
+        self.compress = self.meta["compress"]
+        n_chunks = self.meta.get("n_chunks")
+        if n_chunks is None:  # still being written: count complete chunks
+            n_chunks = 0
+            while self._chunk_exists(n_chunks):
+                n_chunks += 1
+        self.n_chunks = n_chunks
+        self._open = {}
+        self._steps = None
+        self._times = None
+
+    def _chunk_exists(self, k: int) -> bool:
+        base = os.path.join(self.path, _chunk_name(k))
+        return os.path.exists(base + ".npz" if self.compress else base)
+
+    def chunk(self, k: int, name: str) -> np.ndarray:
+        """Return array ``name`` (a field, ``"step"`` or ``"t"``) of chunk ``k``."""
+
+        if not 0 <= k < self.n_chunks:
+            raise IndexError(f"chunk {k} out of range")
+        base = os.path.join(self.path, _chunk_name(k))
+        if not self.compress:
+            return np.load(os.path.join(base, name + ".npy"), mmap_mode="r")
+        # Decompressed arrays of the most recently used chunk are kept
+        if self._open.get("k") != k:
+            self._open = {"k": k, "npz": np.load(base + ".npz")}
+        if name not in self._open:
+            self._open[name] = self._open["npz"][name]
+        return self._open[name]
+
+    def _index(self, name):
+        if not self.n_chunks:
+            return np.empty(0)
+        return np.concatenate([np.asarray(self.chunk(k, name)) for k in range(self.n_chunks)])
+
+    @property
+    def steps(self) -> np.ndarray:
+        if self._steps is None:
+            self._steps = self._index("step").astype(np.int64)
+        return self._steps
+
+    @property
+    def times(self) -> np.ndarray:
+        if self._times is None:
+            self._times = self._index("t")
+        return self._times
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def frame(self, i: int, name: str) -> np.ndarray:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"frame {i} out of range for {n} frames")
+        return self.chunk(i // self.chunk_steps, name)[i % self.chunk_steps]
+
+    def __getitem__(self, i: int) -> dict:
+        return {name: self.frame(i, name) for name in self.fields}
@@ -1,30 +1,154 @@
-
-import time, math, numpy as np
+import json, os, time, math, numpy as np
 
 class RateLogger:
-    def __init__(self, interval_sec=60):
+    """Periodic progress reporter for long step loops.
+
+    Without a ``sink`` a one-line summary is printed at most every
+    ``interval_sec``. With ``sink`` set to a file path, each report is
+    appended as one JSON line carrying ``labels`` (e.g. ``run_id``), the
+    current ``phase``, ``step``, ``steps_per_s`` since the previous report and
+    any keyword values passed to :meth:`tick`. Lines are written with a single
+    ``O_APPEND`` write, so several worker processes can share one file.
+    """
+
+    def __init__(self, interval_sec=60, sink=None, **labels):
         self.t0 = time.time()
         self.last = self.t0
         self.interval = interval_sec
         self.step = 0
+        self.sink = sink
+        self.labels = labels
+        self._last_step = 0
+
+    def reset(self, **labels):
+        """Restart the rate baseline, e.g. when a new phase begins."""
+        self.t0 = self.last = time.time()
+        self.step = self._last_step = 0
+        self.labels.update(labels)
 
-    def tick(self, step, **kv):
+    def tick(self, step, force=False, **kv):
         self.step = step
         now = time.time()
-        if now - self.last >= self.interval:
-            dt = int(now - self.t0)
-            rate = (step / max(1, dt))
-            labels = []
-            for k, v in kv.items():
-                if isinstance(v, float):
-                    if abs(v) >= 1e3 or (abs(v) > 0 and abs(v) < 1e-2):
-                        labels.append(f"{k}:{v:.3e}")
+        if force or now - self.last >= self.interval:
+            if self.sink is not None:
+                self._emit(now, step, kv)
+            else:
+                dt = int(now - self.t0)
+                rate = (step / max(1, dt))
+                labels = []
+                for k, v in kv.items():
+                    if isinstance(v, float):
+                        if abs(v) >= 1e3 or (abs(v) > 0 and abs(v) < 1e-2):
+                            labels.append(f"{k}:{v:.3e}")
+                        else:
+                            labels.append(f"{k}:{v:.3f}")
                     else:
-                        labels.append(f"{k}:{v:.3f}")
-                else:
-                    labels.append(f"{k}:{v}")
-            lbl = ", ".join(labels)
-            print(f"t:{dt:6d}s, step:{step}, rate:{rate:.1f}/s, {lbl}", flush=True)
+                        labels.append(f"{k}:{v}")
+                lbl = ", ".join(labels)
+                print(f"t:{dt:6d}s, step:{step}, rate:{rate:.1f}/s, {lbl}", flush=True)
+            self.last = now
+            self._last_step = step
+
+    def _emit(self, now, step, kv):
+        elapsed = now - self.last
+        record = {
+            "time": now,
+            **self.labels,
+            "step": step,
+            "steps_per_s": (step - self._last_step) / elapsed if elapsed > 0 else 0.0,
+            **kv,
+        }
+        line = (json.dumps(record) + "\n").encode()
+        fd = os.open(self.sink, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+class RunningStats:
+    """Mergeable running count, mean and variance.
+
+    Batches are folded in with the pairwise update of Chan et al., so partial
+    statistics computed on separate shards (or in separate processes) can be
+    combined without revisiting the raw values. ``NaN`` entries are skipped,
+    matching the pandas reductions this replaces.
+    """
+
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.n = int(n)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    def update(self, values):
+        x = np.asarray(values, dtype=np.float64).ravel()
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return self
+        mu = float(np.mean(x))
+        return self.merge(RunningStats(x.size, mu, float(np.sum((x - mu) ** 2))))
+
+    def merge(self, other: "RunningStats"):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def var(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var) if self.n > 1 else float("nan")
+
+    def to_dict(self) -> dict:
+        return {"n": self.n, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RunningStats":
+        return cls(d["n"], d["mean"], d["m2"])
+
+
+class PhaseTimer:
+    """Accumulate wall time and call counts per named section.
+
+    ``wrap`` returns a timed version of a callable; ``add`` records a section
+    timed by the caller. ``as_metrics`` flattens the totals into
+    ``time_<name>`` (seconds) and ``count_<name>`` entries.
+    """
+
+    def __init__(self):
+        self.totals: dict[str, list] = {}
+
+    def add(self, name: str, seconds: float, count: int = 1):
+        entry = self.totals.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += count
+
+    def wrap(self, name: str, fn):
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - t0)
+
+        return timed
+
+    def as_metrics(self) -> dict:
+        metrics = {}
+        for name, (seconds, count) in sorted(self.totals.items()):
+            metrics[f"time_{name}"] = seconds
+            metrics[f"count_{name}"] = count
+        return metrics
 
 
 
@@ -41,30 +165,70 @@ def anisotropy_from_ceff_map(ceff_map: np.ndarray) -> float:
 
 
 
+# Default ``workers`` of the FFTs in :func:`spectral_entropy_batch`; set per
+# process from the executor's thread budget (``set_fft_workers``)
+FFT_WORKERS = 1
+
+
+def set_fft_workers(workers: int):
+    """Set the default number of FFT workers used by the entropy functions."""
+
+    global FFT_WORKERS
+    FFT_WORKERS = int(workers)
+
+
+def spectral_entropy_batch(x, eps: float = 1e-12, out=None, workers: int | None = None):
+    """Spectral entropy of every row of a 2D ``(n_signals, n_samples)`` array.
+
+    Rows follow the rules of :func:`spectral_entropy` independently: a row
+    with non-finite values gives ``NaN``, a constant row gives ``0.0``, and
+    every row is ``NaN`` when ``n_samples < 8``. The FFTs of all rows run in
+    one ``scipy.fft.rfft`` call with ``workers`` threads (default
+    ``FFT_WORKERS``). ``out`` may be a preallocated ``(n_signals,)`` float64
+    array; it is filled and returned.
+    """
+    import scipy.fft
+
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim != 2:
+        raise ValueError("spectral_entropy_batch expects a 2D (n_signals, n_samples) array")
+    n_signals, n_samples = x.shape
+    if out is None:
+        out = np.empty(n_signals, dtype=np.float64)
+    elif out.shape != (n_signals,):
+        raise ValueError(f"out must have shape ({n_signals},)")
+    if n_samples < 8:
+        out.fill(np.nan)
+        return out
+    finite = np.isfinite(x).all(axis=1)
+    out[~finite] = np.nan
+    rows = np.flatnonzero(finite)
+    if rows.size == 0:
+        return out
+    xs = x if rows.size == n_signals else x[rows]
+    xs = xs - np.mean(xs, axis=1, keepdims=True)
+    flat = np.isclose(xs, 0).all(axis=1)
+    X = scipy.fft.rfft(xs, axis=1, workers=workers or FFT_WORKERS)
+    P = np.abs(X) ** 2
+    s = P.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.clip(P / s[:, None], eps, 1.0)
+        H = -np.sum(p * np.log(p), axis=1)
+    H[flat | (s <= 0)] = 0.0
+    out[rows] = H
+    return out
+
+
 def spectral_entropy(x, eps: float = 1e-12) -> float:
-    """Simple spectral entropy on a 1D real signal using NumPy.
+    """Simple spectral entropy on a 1D real signal.
 
     The input is converted to ``float64``. Returns ``NaN`` when the input
     contains non-finite values. The natural logarithm is used; changing the
-    log base only scales the result by a constant factor.
+    log base only scales the result by a constant factor. Computed as a
+    single-row :func:`spectral_entropy_batch`, so both agree exactly.
     """
     x = np.asarray(x, dtype=np.float64)
-    if not np.all(np.isfinite(x)):
-        return float("nan")
-    if x.size < 8:
-        return float("nan")
-    x = x - np.mean(x)
-    if np.allclose(x, 0):
-        return 0.0
-    X = np.fft.rfft(x)
-    P = np.abs(X) ** 2
-    s = P.sum()
-    if s <= 0:
-        return 0.0
-    p = np.clip(P / s, eps, 1.0)
-    H = -np.sum(p * np.log(p))
-    return float(H)
-
+    return float(spectral_entropy_batch(x.reshape(1, -1), eps)[0])
 
 
 def ensure_numpy(x):
@@ -0,0 +1,90 @@
+# tests/test_adaptive_sweep.py
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from doft.simulation import run_sim
+from doft.simulation.sweep import AdaptiveSweep
+
+TRANSITION_A = 1.23
+
+
+def _lpc_ok(a, gamma):
+    return 1.0 if a < TRANSITION_A + gamma else 0.0
+
+
+def test_refinement_concentrates_on_transition():
+    sweep = AdaptiveSweep({'a': [0.5, 1.0, 1.5, 2.0], 'tau': [1.0], 'gamma': [0.0]},
+                          metrics=['lpc_ok_frac'])
+    results = []
+
+    def run_batch(combos):
+        for a, tau, seed, gamma, group in combos:
+            metrics = {'a_mean': a, 'tau_mean': tau, 'gamma': gamma,
+                       'lpc_ok_frac': _lpc_ok(a, gamma)}
+            results.append((metrics, None))
+
+    used = sweep.run(run_batch, results, seeds=[0, 1], budget=16, batch_points=1)
+
+    assert used == 16
+    refined = sweep.points[4:]
+    assert len(refined) == 4
+    # Every refinement lies inside the coarse interval holding the transition
+    assert all(1.0 < p[0] < 1.5 for p in refined)
+    a_vals = sorted(p[0] for p in sweep.points)
+    bracket = min(b - a for a, b in zip(a_vals, a_vals[1:]) if a < TRANSITION_A <= b)
+    assert bracket <= 0.5 / 2 ** 4
+
+
+def test_seed_variance_drives_refinement_without_mean_contrast():
+    sweep = AdaptiveSweep({'a': [0.0, 1.0, 2.0], 'tau': [1.0], 'gamma': [0.0]},
+                          metrics=['anisotropy_max_pct'])
+    for a in (0.0, 1.0, 2.0):
+        for value in ((0.0, 0.0) if a < 1.5 else (-1.0, 1.0)):
+            sweep.record((a, 1.0, 0.0), {'anisotropy_max_pct': value})
+    assert sweep.refine(1) == [(1.5, 1.0, 0.0)]
+
+
+def test_run_sim_adaptive_mode(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gammas = []
+
+    class DummyModel:
+        def __init__(self, *args, a=None, gamma=None, **kwargs):
+            self.a, self.gamma = a, gamma
+            gammas.append(gamma)
+
+        def run(self):
+            metrics = {'lpc_ok_frac': _lpc_ok(self.a, self.gamma), 'anisotropy_max_pct': 0.0}
+            return metrics, pd.DataFrame()
+
+    monkeypatch.setattr(run_sim, 'DOFTModel', DummyModel)
+    cfg = {
+        'seeds': [0],
+        'adaptive_sweep': {
+            'axes': {'a': [1.0, 1.5], 'tau': [1.0], 'gamma': [0.0, 0.1]},
+            'budget': 10,
+            'batch_points': 2,
+        },
+    }
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(cfg))
+    monkeypatch.setenv('DOFT_CONFIG', str(config_path))
+    monkeypatch.setattr(sys, 'argv', ['run_sim'])
+    run_sim.main()
+
+    run_dir = next((tmp_path / 'runs' / 'passive').glob('phase1_run_*'))
+    runs = pd.read_csv(run_dir / 'runs.csv')
+    assert len(runs) == 10
+    assert set(runs['gamma']) == {0.0, 0.1}
+    assert set(gammas) == {0.0, 0.1}
+    assert (runs['param_group'] == 'coarse').sum() == 4
+    assert runs['param_group'].str.startswith('refine_').sum() == 6
+
+    meta = json.loads((run_dir / 'run_meta.json').read_text())
+    assert meta['total_runs_in_sweep'] == 10
+    assert meta['adaptive_sweep']['rounds'][-1]['runs_used'] == 10
@@ -3,6 +3,7 @@ import sys
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 
 def test_analyze_results_main(tmp_path, monkeypatch):
@@ -28,4 +29,98 @@ def test_analyze_results_main(tmp_path, monkeypatch):
     assert (outdir / "hbar_eff_vs_gamma.png").exists()
     assert (outdir / "lpc_rate_vs_gamma.png").exists()
     assert (outdir / "anisotropy_vs_gamma.png").exists()
-    
\ No newline at end of file
+    
+
+def _write_runs(path, gammas, lpc):
+    path.mkdir(parents=True)
+    pd.DataFrame({
+        "gamma": gammas,
+        "ceff_pulse": [1.0 + 0.1 * i for i in range(len(gammas))],
+        "lpc_ok_frac": lpc,
+        "anisotropy_max_pct": [5.0] * len(gammas),
+    }).to_csv(path / "runs.csv", index=False)
+
+
+def test_analyze_results_from_runs_with_cache(tmp_path, monkeypatch):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+    import matplotlib.pyplot as plt
+    from doft.analysis.analyze_results import main
+
+    indir = tmp_path / "in"
+    _write_runs(indir / "sweep_a", [0.1, 0.1, 0.2], [1.0, 0.5, 0.0])
+    _write_runs(indir / "sweep_b", [0.2], [1.0])
+    outdir = tmp_path / "out"
+    monkeypatch.setenv("MPLBACKEND", "Agg")
+    monkeypatch.setattr(sys, "argv", ["analyze_results", "--in", str(indir), "--out", str(outdir)])
+
+    rendered = []
+    savefig = plt.savefig
+
+    def recording_savefig(path, **kwargs):
+        rendered.append(Path(path).name)
+        savefig(path, **kwargs)
+
+    monkeypatch.setattr(plt, "savefig", recording_savefig)
+
+    main()
+    summary = pd.read_csv(outdir / "summary.csv")
+    assert list(summary["gamma"]) == [0.1, 0.2]
+    assert list(summary["n_runs"]) == [2, 2]
+    assert summary["lpc_ok_frac_mean"].tolist() == [0.75, 0.5]
+    assert sorted(rendered) == ["anisotropy_vs_gamma.png", "ceff_pulse_vs_gamma.png", "lpc_ok_frac_vs_gamma.png"]
+
+    rendered.clear()
+    main()
+    assert rendered == []
+
+    # Only the LPC slice changes, so only its figure is re-rendered
+    df = pd.read_csv(indir / "sweep_b" / "runs.csv")
+    df["lpc_ok_frac"] = 0.0
+    df.to_csv(indir / "sweep_b" / "runs.csv", index=False)
+    main()
+    assert rendered == ["lpc_ok_frac_vs_gamma.png"]
+
+
+def test_analyze_results_paired_differences(tmp_path, monkeypatch):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+    from doft.analysis.analyze_results import main
+
+    indir = tmp_path / "in" / "sweep"
+    indir.mkdir(parents=True)
+    pd.DataFrame({
+        "seed": [1, 2, 3, 1, 2, 3],
+        "gamma": [0.1, 0.1, 0.1, 0.2, 0.2, 0.2],
+        "ceff_pulse": [1.0, 2.0, 3.0, 1.5, 2.5, 3.5],
+    }).to_csv(indir / "runs.csv", index=False)
+    outdir = tmp_path / "out"
+    monkeypatch.setenv("MPLBACKEND", "Agg")
+    monkeypatch.setattr(
+        sys, "argv", ["analyze_results", "--in", str(tmp_path / "in"), "--out", str(outdir), "--paired", "gamma"]
+    )
+
+    main()
+    paired = pd.read_csv(outdir / "paired_gamma.csv")
+    row = paired.set_index("metric").loc["ceff_pulse"]
+    assert (row["baseline"], row["treatment"], row["n_pairs"]) == (0.1, 0.2, 3)
+    assert row["diff_mean"] == 0.5 and row["diff_sem"] == 0.0
+
+
+def test_identical_tables_in_two_sweeps_both_count(tmp_path):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+    from doft.analysis.analyze_results import build_summary, find_run_tables
+
+    indir = tmp_path / "in"
+    _write_runs(indir / "sweep_a", [0.1, 0.1], [1.0, 0.5])
+    _write_runs(indir / "sweep_b", [0.1, 0.1], [1.0, 0.5])
+    tables = find_run_tables(str(indir))
+    cache = {"inputs": {}, "figures": {}}
+    for _ in range(2):
+        summary = build_summary(tables, cache)
+        assert summary["n_runs"].tolist() == [4]
+        assert summary["lpc_ok_frac_mean"].tolist() == [0.75]
+        assert summary["lpc_ok_frac_sem"].iloc[0] == pytest.approx(0.5 / 12 ** 0.5)
+    assert sorted(cache["inputs"]) == tables
+
+    (indir / "sweep_b" / "runs.csv").unlink()
+    build_summary(tables[:1], cache)
+    assert list(cache["inputs"]) == tables[:1]
@@ -0,0 +1,96 @@
+# tests/test_background_writer.py
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+from doft.utils import outputs
+from doft.utils.outputs import BackgroundWriter, read_table
+
+
+def test_writes_run_in_order_off_the_caller_thread(tmp_path):
+    threads, order = set(), []
+
+    def job(i):
+        threads.add(threading.get_ident())
+        order.append(i)
+
+    with BackgroundWriter(max_pending=2) as writer:
+        for i in range(10):
+            writer.submit(job, i)
+        writer.write_table(pd.DataFrame({"x": [1, 2]}), str(tmp_path / "t.csv"))
+        writer.write_json({"a": 1}, str(tmp_path / "m.json"))
+    assert order == list(range(10))
+    assert threads and threading.get_ident() not in threads
+    assert read_table(str(tmp_path / "t.csv"))["x"].tolist() == [1, 2]
+    assert json.loads((tmp_path / "m.json").read_text()) == {"a": 1}
+
+
+def test_full_queue_applies_backpressure():
+    release = threading.Event()
+    writer = BackgroundWriter(max_pending=1)
+    writer.submit(lambda: release.wait() and None)
+    writer.submit(lambda: None)  # fills the queue behind the blocked job
+    done = threading.Event()
+
+    def producer():
+        writer.submit(lambda: None)
+        done.set()
+
+    t = threading.Thread(target=producer)
+    t.start()
+    assert not done.wait(0.2)
+    release.set()
+    t.join(5)
+    assert done.is_set() and writer.blocked_s > 0
+    writer.close()
+    assert writer.jobs_done == 3
+
+
+def test_flush_fsyncs_written_files(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(outputs, "_fsync", synced.append)
+    writer = BackgroundWriter()
+    path = str(tmp_path / "m.json")
+    writer.write_json({}, path)
+    writer.flush()
+    assert path in synced and str(tmp_path) in synced
+    synced.clear()
+    writer.flush()
+    assert synced == []
+    writer.close()
+
+
+def test_write_errors_surface_to_the_producer(tmp_path):
+    writer = BackgroundWriter()
+    writer.write_json({}, str(tmp_path / "missing" / "m.json"))
+    with pytest.raises(RuntimeError, match="background write failed"):
+        writer.flush()
+    with pytest.raises(RuntimeError):
+        writer.submit(lambda: None)
+    with pytest.raises(RuntimeError):
+        writer.close()
+
+
+def test_step_log_written_through_run_writer(tmp_path):
+    log_path = tmp_path / "steps"
+    model = DOFTModel(
+        8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0, max_pulse_steps=5, max_lpc_steps=5,
+        log_steps=True, log_path=str(log_path),
+    )
+    model.run()
+    assert model.output_writer is None
+    assert len(pd.read_csv(f"{log_path}.csv")) == len(model.step_log)
+
+    bad = DOFTModel(
+        8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0, max_pulse_steps=5, max_lpc_steps=5,
+        log_steps=True, log_path=str(tmp_path / "missing" / "steps"),
+    )
+    with pytest.raises(RuntimeError, match="background write failed"):
+        bad.run()
@@ -0,0 +1,63 @@
+# tests/test_crn.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.analysis.analyze_results import paired_difference
+from doft.models.model import DOFTModel
+from doft.utils.crn import rng_stream
+
+
+class _Captured(Exception):
+    pass
+
+
+def _lpc_initial_field(model, monkeypatch):
+    def capture(n_steps, probe_idx):
+        raise _Captured(model.Q.copy())
+
+    monkeypatch.setattr(model, "_lpc_series", capture)
+    with pytest.raises(_Captured) as info:
+        model._calculate_lpc_metrics(64)
+    return info.value.args[0]
+
+
+@pytest.mark.parametrize("crn", [None, "exp"])
+def test_lpc_noise_independent_of_pulse_draws(crn, monkeypatch):
+    quiet = DOFTModel(8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=5, crn_experiment=crn)
+    noisy = DOFTModel(8, 0.2, 2.0, 1.0, 1.0, 0.1, seed=5, crn_experiment=crn)
+    noisy._calculate_pulse_metrics(5, noise_std=0.01)
+    same = np.array_equal(_lpc_initial_field(quiet, monkeypatch), _lpc_initial_field(noisy, monkeypatch))
+    assert same == (crn is not None)
+
+
+def test_streams_are_named_and_reproducible():
+    draw = lambda *key: rng_stream(*key).normal(size=4)  # noqa: E731
+    np.testing.assert_array_equal(draw(1, "exp", "lpc_init"), draw(1, "exp", "lpc_init"))
+    assert not np.array_equal(draw(1, "exp", "lpc_init"), draw(1, "exp", "pulse_noise"))
+    assert not np.array_equal(draw(1, "exp", "lpc_init"), draw(1, "other", "lpc_init"))
+    assert not np.array_equal(draw(1, "exp", "lpc_init"), draw(2, "exp", "lpc_init"))
+
+
+def test_paired_difference_cancels_shared_noise():
+    rng = np.random.default_rng(0)
+    seeds = np.arange(12)
+    shared = rng.normal(0.0, 1.0, seeds.size)
+    df = pd.DataFrame({
+        "seed": np.tile(seeds, 2),
+        "a_mean": 0.3,
+        "tau_mean": np.repeat([1.0, 2.0], seeds.size),
+        "gamma": 0.1,
+        "ceff_pulse": np.concatenate([shared, shared + 0.5 + rng.normal(0.0, 0.01, seeds.size)]),
+    })
+    df.loc[0, "ceff_pulse"] = np.nan
+    res = paired_difference(df, "ceff_pulse", "tau_mean", 1.0, 2.0)
+    assert res["n_pairs"] == seeds.size - 1
+    assert res["ci95_lo"] < 0.5 < res["ci95_hi"]
+    assert res["diff_sem"] < 0.05 * res["unpaired_sem"]
+    assert res["sem_ratio"] == pytest.approx(res["diff_sem"] / res["unpaired_sem"])
@@ -0,0 +1,160 @@
+# tests/test_executor.py
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.simulation import executor, run_sim
+
+
+def test_resolve_executor_validates_and_loads_profile(tmp_path):
+    assert executor.resolve_executor(None)["processes"] is None
+    layout = executor.resolve_executor({"processes": 2, "threads_per_process": 4})
+    assert layout == {"processes": 2, "threads_per_process": 4, "affinity": None}
+    with pytest.raises(ValueError):
+        executor.resolve_executor({"threads": 2})
+    with pytest.raises(ValueError):
+        executor.resolve_executor({"processes": 0})
+    with pytest.raises(ValueError):
+        executor.resolve_executor({"affinity": "spread"})
+
+    profile = tmp_path / "executor.json"
+    with pytest.raises(SystemExit):
+        executor.resolve_executor("auto", str(profile))
+    profile.write_text(json.dumps({"best": {"processes": 3, "threads_per_process": 1, "affinity": None}}))
+    assert executor.resolve_executor("auto", str(profile))["processes"] == 3
+
+
+def test_candidate_layouts_fit_the_node():
+    layouts = executor.candidate_layouts(8)
+    assert {(l["processes"], l["threads_per_process"]) for l in layouts} == {
+        (8, 1), (4, 2), (2, 4), (1, 8)
+    }
+    assert executor.candidate_layouts(1) == [{"processes": 1, "threads_per_process": 1}]
+
+
+def test_compact_affinity_gives_disjoint_blocks(monkeypatch):
+    monkeypatch.setattr(executor, "available_cpus", lambda: list(range(8)))
+    blocks = [executor.worker_cpus("compact", slot, 2) for slot in range(4)]
+    assert blocks == [[0, 1], [2, 3], [4, 5], [6, 7]]
+    assert executor.worker_cpus("compact", 4, 2) == [0, 1]
+    assert executor.worker_cpus([1, 3, 42], 0, None) == [1, 3]
+
+
+def test_thread_limits_applied_in_worker(monkeypatch):
+    threadpoolctl = pytest.importorskip("threadpoolctl")
+    for var in executor.THREAD_ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+    try:
+        executor.configure_worker({"threads_per_process": 1, "affinity": None})
+        assert os.environ["OMP_NUM_THREADS"] == "1"
+        assert all(p["num_threads"] == 1 for p in threadpoolctl.threadpool_info())
+    finally:
+        executor._THREAD_LIMITS.restore_original_limits()
+        executor._THREAD_LIMITS = None
+
+
+def _run_sim(tmp_path, monkeypatch, cfg, argv=()):
+    monkeypatch.chdir(tmp_path)
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'seeds': [0], 'grid_size': 8, 'sweep_groups': {'g': [[1.0, 1.0]]}, **cfg}))
+    monkeypatch.setenv('DOFT_CONFIG', str(config_path))
+    monkeypatch.setattr(sys, 'argv', ['run_sim', *argv])
+    run_sim.main()
+    run_dir = next((tmp_path / 'runs' / 'passive').glob('phase1_run_*'))
+    return json.loads((run_dir / 'run_meta.json').read_text())
+
+
+def test_serial_run_scopes_thread_limits_to_the_sweep(tmp_path, monkeypatch):
+    pytest.importorskip("threadpoolctl")
+    from doft.utils import utils
+
+    fft_workers = []
+
+    class DummyModel:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def run(self):
+            fft_workers.append(utils.FFT_WORKERS)
+            return {'ceff_pulse': 1.0}, pd.DataFrame()
+
+    applied = []
+    monkeypatch.setattr(run_sim, 'DOFTModel', DummyModel)
+    monkeypatch.setattr(run_sim, 'configure_worker', lambda layout, slot: applied.append((layout, slot)))
+    monkeypatch.setattr(utils, 'FFT_WORKERS', 1)
+    for var in executor.THREAD_ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+    meta = _run_sim(tmp_path, monkeypatch, {'executor': {'processes': 4, 'threads_per_process': 2}})
+
+    # The driver is neither pinned nor capped at the per-worker budget, and
+    # its environment and FFT workers are restored after the sweep
+    n_cpus = len(executor.available_cpus())
+    assert applied == []
+    assert fft_workers == [n_cpus] and utils.FFT_WORKERS == 1
+    assert not any(var in os.environ for var in executor.THREAD_ENV_VARS)
+    assert meta['executor'] == {'processes': 1, 'threads_per_process': n_cpus, 'affinity': None}
+
+
+def test_thread_budget_caps_pool_size(tmp_path, monkeypatch):
+    pool_sizes = []
+
+    class SerialPool:
+        def __init__(self, processes, initializer, initargs):
+            pool_sizes.append(processes)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def starmap(self, fn, batch):
+            return [fn(*args) for args in batch]
+
+    class DummyModel:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def run(self):
+            return {'ceff_pulse': 1.0}, pd.DataFrame()
+
+    monkeypatch.setattr(run_sim, 'DOFTModel', DummyModel)
+    monkeypatch.setattr(run_sim.mp, 'Pool', SerialPool)
+    monkeypatch.setattr(executor, 'available_cpus', lambda: list(range(8)))
+    meta = _run_sim(
+        tmp_path, monkeypatch,
+        {'max_workers': 16, 'executor': {'threads_per_process': 2}},
+        argv=['--parallel'],
+    )
+
+    assert pool_sizes == [4]
+    assert meta['executor'] == {'processes': 4, 'threads_per_process': 2, 'affinity': None}
+    assert executor.pool_processes({'processes': 6, 'threads_per_process': 2}, 16) == 6
+    assert executor.pool_processes({'processes': None, 'threads_per_process': None}, 16) == 16
+    assert executor.pool_processes({'processes': None, 'threads_per_process': 16}, 16) == 1
+
+
+def test_serial_layout_drops_worker_budget():
+    layout = {'processes': 4, 'threads_per_process': 2, 'affinity': 'compact'}
+    assert executor.serial_layout(layout) == {
+        'processes': 1,
+        'threads_per_process': len(executor.available_cpus()),
+        'affinity': None,
+    }
+    default = executor.resolve_executor(None)
+    assert executor.serial_layout(default)['threads_per_process'] is None
+
+
+def test_thread_budget_sets_fft_workers(monkeypatch):
+    from doft.utils import utils
+
+    monkeypatch.setattr(executor, "apply_thread_limits", lambda threads: None)
+    monkeypatch.setattr(utils, "FFT_WORKERS", 1)
+    executor.configure_worker({"threads_per_process": 3, "affinity": None})
+    assert utils.FFT_WORKERS == 3
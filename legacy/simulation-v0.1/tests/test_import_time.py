@@ -0,0 +1,41 @@
+# tests/test_import_time.py
+"""Import-time budget for the stepping core.
+
+Pool workers import ``doft.simulation.run_sim`` (and through it the model)
+on spawn, so the core must not pull in pandas or SciPy at module load.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+BUDGET_US = 1_000_000
+HEAVY = ("pandas", "scipy", "matplotlib")
+
+
+def _importtime(module):
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+def test_core_import_budget():
+    for module in ("doft.models.model", "doft.simulation.run_sim"):
+        times = _importtime(module)
+        heavy = sorted(name for name in times if name.split(".")[0] in HEAVY)
+        assert heavy == [], f"{module} imports {heavy[:5]}"
+        assert times[module] < BUDGET_US
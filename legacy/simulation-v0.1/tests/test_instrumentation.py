@@ -0,0 +1,53 @@
+# tests/test_instrumentation.py
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+
+
+def create_model(instrument, gamma=0.1):
+    return DOFTModel(
+        grid_size=6,
+        a=1.0,
+        tau=1.0,
+        a_ref=1.0,
+        tau_ref=1.0,
+        gamma=gamma,
+        seed=0,
+        max_pulse_steps=40,
+        max_lpc_steps=4200,
+        instrument=instrument,
+    )
+
+
+def test_run_metrics_include_phase_timings():
+    metrics, _ = create_model(instrument=True).run()
+    for name in ("pulse", "pulse_loop", "front_detection", "lpc", "lpc_loop",
+                 "window_entropy", "laplacian", "energy_check"):
+        assert metrics[f"time_{name}"] >= 0.0
+        assert metrics[f"count_{name}"] > 0
+    assert metrics["count_pulse_loop"] == 40
+    assert metrics["count_lpc_loop"] == 4200
+    assert metrics["count_front_detection"] == 40
+    assert metrics["count_laplacian"] >= 40 + 4200
+    assert metrics["time_pulse"] >= metrics["time_pulse_loop"]
+
+
+def test_rollbacks_are_timed():
+    model = create_model(instrument=True, gamma=-10.0)
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    model._step_imex(0)
+    assert model.timer.totals["rollback"][1] > 0
+
+
+def test_uninstrumented_run_has_no_timing_columns():
+    model = create_model(instrument=False)
+    model.max_lpc_steps = 10
+    metrics, _ = model.run()
+    assert model.timer is None
+    assert not any(k.startswith(("time_", "count_")) for k in metrics)
+    assert np.isfinite(metrics["ceff_pulse"])
@@ -39,3 +39,53 @@ def test_leapfrog_energy_conservation():
     final_energy = model.energy_fn(model.Q, model.P)
     assert np.isfinite(final_energy)
     assert final_energy == pytest.approx(initial_energy, rel=2e-4, abs=1e-6)
+
+
+def _conservative_model(**kwargs):
+    model = DOFTModel(4, 1.0, 1.0, 1.0, 1.0, 0.0, seed=0, integrator="Leapfrog", **kwargs)
+    rng = np.random.default_rng(0)
+    model.Q = rng.normal(scale=0.1, size=model.Q.shape)
+    model.P = rng.normal(scale=0.1, size=model.P.shape)
+    return model
+
+
+def test_leapfrog_reuses_end_of_step_force(monkeypatch):
+    model = _conservative_model()
+    Q, P = model.Q.copy(), model.P.copy()
+    calls = []
+    laplacian = model._laplacian
+    monkeypatch.setattr(model, "_laplacian", lambda f: calls.append(1) or laplacian(f))
+
+    for t_idx in range(20):
+        model._step_leapfrog(t_idx)
+    assert len(calls) == 21
+
+    dt = model.dt_nondim
+    for _ in range(20):
+        P_half = P + 0.5 * dt * (model.a_nondim * laplacian(Q) - Q)
+        Q = Q + dt * P_half
+        P = P_half + 0.5 * dt * (model.a_nondim * laplacian(Q) - Q)
+    np.testing.assert_array_equal(model.Q, Q)
+    np.testing.assert_array_equal(model.P, P)
+
+    # In-place changes need an explicit invalidation; reassignment does not
+    model.Q *= 0.5
+    model._invalidate_force()
+    model._step_leapfrog(20)
+    model.Q = model.Q.copy()
+    model._step_leapfrog(21)
+    assert len(calls) == 25
+
+
+def test_leapfrog_energy_stride():
+    full = _conservative_model()
+    strided = _conservative_model(energy_stride=10)
+    initial_energy = strided.energy_fn(strided.Q, strided.P)
+    for t_idx in range(100):
+        full._step_leapfrog(t_idx)
+        strided._step_leapfrog(t_idx)
+    assert strided.energy_log == full.energy_log[::10]
+    final_energy = strided.energy_fn(strided.Q, strided.P)
+    assert final_energy == pytest.approx(initial_energy, rel=2e-4, abs=1e-6)
+    with pytest.raises(ValueError):
+        DOFTModel(4, 1.0, 1.0, 1.0, 1.0, 0.0, seed=0, integrator="Leapfrog", energy_stride=0)
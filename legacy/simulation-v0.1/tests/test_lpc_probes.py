@@ -0,0 +1,58 @@
+# tests/test_lpc_probes.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel, resolve_probes
+
+
+def test_resolve_probes_specs():
+    rows, cols = resolve_probes(None, 9)
+    assert rows.tolist() == [4] and cols.tolist() == [4]
+    rows, cols = resolve_probes({"grid": 2}, 8)
+    assert list(zip(rows, cols)) == [(2, 2), (2, 6), (6, 2), (6, 6)]
+    rows, cols = resolve_probes({"random": 5, "seed": 3}, 8)
+    assert len(set(zip(rows, cols))) == 5
+    again = resolve_probes({"random": 5, "seed": 3}, 8)
+    assert rows.tolist() == again[0].tolist() and cols.tolist() == again[1].tolist()
+    assert resolve_probes([[0, 1], [7, 7]], 8)[1].tolist() == [1, 7]
+    with pytest.raises(ValueError):
+        resolve_probes([[0, 8]], 8)
+    with pytest.raises(ValueError):
+        resolve_probes({"grid": 9}, 8)
+
+
+def _lpc(probes, steps=4096 + 2048 * 2):
+    model = DOFTModel(8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0, lpc_probes=probes)
+    return model._calculate_lpc_metrics(steps)
+
+
+def test_multi_probe_metrics_pool_single_probe_runs():
+    center, _ = _lpc(None)
+    multi, blocks = _lpc([[4, 4], [1, 2], [6, 3]])
+    assert multi["lpc_n_probes"] == 3 and len(multi["lpc_ok_frac_by_probe"]) == 3
+    # Same seed, same dynamics: the centre probe reproduces the single-probe run
+    assert multi["lpc_ok_frac_by_probe"][0] == center["lpc_ok_frac"]
+    assert center["lpc_ok_frac_by_probe"] == [center["lpc_ok_frac"]]
+    assert multi["lpc_ok_frac"] == pytest.approx(np.mean(multi["lpc_ok_frac_by_probe"]))
+    assert multi["lpc_windows_analyzed"] == 3 * center["lpc_windows_analyzed"]
+    assert sorted(blocks["probe_id"].unique()) == [0, 1, 2]
+
+
+def test_window_blocks_match_per_probe_series():
+    model = DOFTModel(8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0)
+    series = np.random.default_rng(2).normal(size=(1000, 2))
+    series[650, 1] = np.nan
+    blocks, skipped = model._window_blocks(series, 200, 100)
+    assert skipped == 2
+    for probe in range(2):
+        single, _ = model._window_blocks(series[:, probe], 200, 100)
+        rows = [{k: v for k, v in b.items() if k != 'probe_id'} for b in blocks if b['probe_id'] == probe]
+        expected = [{k: v for k, v in b.items() if k != 'probe_id'} for b in single]
+        np.testing.assert_array_equal(
+            [r['K_metric'] for r in rows], [e['K_metric'] for e in expected]
+        )
@@ -0,0 +1,82 @@
+# tests/test_memory_planner.py
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import LEAN_LOG_LEN, DOFTModel
+from doft.simulation import run_sim
+from doft.simulation.planner import estimate_run_bytes, plan_sweep
+
+
+def test_estimate_grows_with_state_size():
+    base = estimate_run_bytes(32, 0.5, 1.0, 0.1)
+    assert estimate_run_bytes(64, 0.5, 1.0, 0.1)["fields"] == 4 * base["fields"]
+    assert estimate_run_bytes(32, 0.5, 1.0, 0.1, n_modes=10)["peak"] > base["peak"]
+    ring = estimate_run_bytes(32, 0.5, 1.0, 0.1, tau_dynamic=True)
+    model = DOFTModel(32, 0.5, 1.0, 1.0, 1.0, 0.1, seed=0, tau_dynamic=True)
+    assert ring["ring_buffer_len"] == model.ring_buffer_len
+    assert ring["ring_buffer"] >= model.q_ring.nbytes
+    capped = estimate_run_bytes(32, 0.5, 1.0, 0.1, max_pulse_steps=100, max_lpc_steps=100)
+    assert capped["pulse_steps"] == 100 and capped["peak"] < base["peak"]
+
+
+def test_plan_caps_workers_and_switches_to_lean():
+    config = {"grid_size": 64}
+    points = [(0.5, 1.0, 0.1), (1.0, 1.0, 0.1)]
+    peak = max(estimate_run_bytes(64, a, t, g)["peak"] for a, t, g in points)
+    lean_peak = max(estimate_run_bytes(64, a, t, g, lean=True)["peak"] for a, t, g in points)
+    assert lean_peak < peak
+
+    plan = plan_sweep(points, config, int(2.2 * peak), max_workers=16)
+    assert plan["workers"] == 2 and plan["per_run_bytes"] <= peak
+
+    plan = plan_sweep(points, config, (peak + lean_peak) // 2, max_workers=16)
+    assert plan["lean"] and plan["fits"] and plan["workers"] == 1
+
+    plan = plan_sweep(points, config, lean_peak // 2, max_workers=16)
+    assert not plan["fits"] and plan["workers"] == 1
+
+
+def test_lean_mode_keeps_results_and_bounds_logs():
+    def run(lean):
+        model = DOFTModel(16, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0, lean=lean)
+        metrics = model._calculate_pulse_metrics(n_steps=LEAN_LOG_LEN + 200, noise_std=1e-3)
+        return model, metrics
+
+    full, full_metrics = run(False)
+    lean, lean_metrics = run(True)
+    assert lean_metrics["ceff_pulse"] == full_metrics["ceff_pulse"]
+    assert lean_metrics["ceff_pulse_by_thr"] == full_metrics["ceff_pulse_by_thr"]
+    assert lean.energy_log.maxlen == LEAN_LOG_LEN
+    assert list(lean.energy_log) == full.energy_log[-len(lean.energy_log):]
+
+
+def test_run_sim_records_memory_plan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen = []
+
+    class DummyModel:
+        def __init__(self, *args, lean=False, **kwargs):
+            seen.append(lean)
+
+        def run(self):
+            return {'ceff_pulse': 1.0}, pd.DataFrame()
+
+    monkeypatch.setattr(run_sim, 'DOFTModel', DummyModel)
+    cfg = {'seeds': [0], 'grid_size': 8, 'sweep_groups': {'g': [[1.0, 1.0]]}, 'lean': True}
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(cfg))
+    monkeypatch.setenv('DOFT_CONFIG', str(config_path))
+    monkeypatch.setattr(sys, 'argv', ['run_sim'])
+    run_sim.main()
+
+    run_dir = next((tmp_path / 'runs' / 'passive').glob('phase1_run_*'))
+    meta = json.loads((run_dir / 'run_meta.json').read_text())
+    assert meta['memory_plan']['lean'] is True
+    assert meta['memory_plan']['workers'] >= 1
+    assert np.all(seen)
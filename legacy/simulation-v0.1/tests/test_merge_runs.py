@@ -0,0 +1,100 @@
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from doft.utils.utils import RunningStats
+
+
+def _load_merge_runs():
+    spec = importlib.util.spec_from_file_location("merge_runs", ROOT / "scripts" / "merge_runs.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["merge_runs"] = module  # workers pickle read_shard by reference
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write_shard(path, seed):
+    rng = np.random.default_rng(seed)
+    n = 12
+    df = pd.DataFrame({
+        "gamma": rng.choice([0.05, 0.1], size=n),
+        "xi": rng.choice([1.0, 2.0], size=n),
+        "ceff_bar": rng.normal(1.0, 0.1, size=n),
+        "beta_dyn": rng.normal(0.0, 1.0, size=n),
+        "lpcV": rng.integers(0, 2, size=n),
+    })
+    path.parent.mkdir(parents=True)
+    df.to_csv(path, index=False)
+    return df
+
+
+def _expected_summary(frames):
+    big = pd.concat(frames, ignore_index=True)
+    big["lpc_ok"] = (big["lpcV"].fillna(0) == 0).astype(float)
+    group = big.groupby(["gamma", "xi"])
+    return pd.DataFrame({
+        "ceff_bar_mean": group["ceff_bar"].mean(),
+        "ceff_bar_std": group["ceff_bar"].std(),
+        "beta_dyn_std": group["beta_dyn"].std(),
+        "lpc_ok_frac": group["lpc_ok"].mean(),
+        "n": group.size(),
+    }).reset_index()
+
+
+def test_running_stats_merge_matches_numpy():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=50), rng.normal(3.0, 2.0, size=7)
+    merged = RunningStats().update(a).merge(RunningStats().update(b))
+    both = np.concatenate([a, b])
+    assert merged.n == both.size
+    assert np.isclose(merged.mean, both.mean())
+    assert np.isclose(merged.std, both.std(ddof=1))
+    assert RunningStats.from_dict(merged.to_dict()).m2 == merged.m2
+
+
+def test_incremental_merge_matches_full_groupby(tmp_path, monkeypatch):
+    merge_runs = _load_merge_runs()
+    frames = [_write_shard(tmp_path / "runs" / f"shard{i}" / "table.csv", i) for i in range(3)]
+    out = tmp_path / "merged"
+
+    monkeypatch.setattr(sys, "argv", ["merge_runs", str(tmp_path / "runs" / "*"), "--out", str(out), "--jobs", "2"])
+    merge_runs.main()
+    frames.append(_write_shard(tmp_path / "runs" / "shard3" / "table.csv", 3))
+    monkeypatch.setattr(sys, "argv", ["merge_runs", str(tmp_path / "runs" / "*"), "--out", str(out), "--jobs", "1"])
+    merge_runs.main()
+
+    state = json.loads((out / "merge_state.json").read_text())
+    assert len(state["files"]) == 4
+    assert len(pd.read_csv(out / "merged.csv")) == sum(len(f) for f in frames)
+
+    summary = pd.read_csv(out / "summary.csv")
+    expected = _expected_summary(frames)
+    for col in expected.columns:
+        assert np.allclose(summary[col], expected[col]), col
+    assert np.allclose(summary["ceff_bar_sem"], expected["ceff_bar_std"] / np.sqrt(expected["n"]))
+
+
+def test_shard_in_several_formats_is_ingested_once(tmp_path, monkeypatch):
+    merge_runs = _load_merge_runs()
+    shard = tmp_path / "runs" / "shard0"
+    frame = _write_shard(shard / "table.csv", 0)
+    frame.to_parquet(shard / "table.parquet")
+    out = tmp_path / "merged"
+
+    monkeypatch.setattr(sys, "argv", ["merge_runs", str(tmp_path / "runs" / "*"), "--out", str(out), "--jobs", "1"])
+    merge_runs.main()
+    state = json.loads((out / "merge_state.json").read_text())
+    assert list(state["files"]) == [str(shard / "table.parquet")]
+    assert len(pd.read_csv(out / "merged.csv")) == len(frame)
+
+    monkeypatch.setattr(sys, "argv", ["merge_runs", str(tmp_path / "empty"), "--out", str(out)])
+    with pytest.raises(SystemExit, match="table.parquet/table.arrow/table.csv"):
+        merge_runs.main()
@@ -12,6 +12,7 @@ import numpy as np
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from doft.models.model import DOFTModel
+from doft.utils.theilsen import TheilSenResult
 
 
 def create_model(seed=0, dt_nondim=0.1):
@@ -56,15 +57,13 @@ def test_all_thresholds_affect_ceff_pulse(monkeypatch):
 
     # Patch slope estimator so each threshold yields a different speed
     slopes = [1.0, 2.0, 4.0]
-    call = {"n": 0}
 
-    def fake_theilslopes(dists, times, alpha):
-        idx = call["n"] % 3
-        call["n"] += 1
-        s = slopes[idx]
-        return s, 0.0, s - 0.1, s + 0.1
+    def fake_theilslopes_batch(dists, times, lengths, alpha):
+        # Rays are fitted theta-major, threshold-minor
+        s = np.resize(slopes, len(lengths))
+        return TheilSenResult(s, np.zeros_like(s), s - 0.1, s + 0.1)
 
-    monkeypatch.setattr("doft.models.model.theilslopes", fake_theilslopes)
+    monkeypatch.setattr("doft.models.model.theilslopes_batch", fake_theilslopes_batch)
 
     metrics = model._calculate_pulse_metrics(n_steps=60, noise_std=0.0)
     speeds = np.array(metrics["ceff_pulse_by_thr"])
@@ -0,0 +1,70 @@
+# tests/test_parareal.py
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+from doft.models.parareal import parareal_lpc_series, resolve_parareal
+
+
+def _model(gamma=0.1, **parareal):
+    model = DOFTModel(8, 0.3, 1.0, 1.0, 1.0, gamma, seed=0, lpc_parareal=parareal)
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    model.last_energy = model.energy_fn(model.Q, model.P)
+    probe_idx = np.ravel_multi_index((model.probe_rows, model.probe_cols), model.Q.shape)
+    return model, probe_idx
+
+
+def test_resolve_parareal_validates():
+    assert resolve_parareal(None) is None
+    assert resolve_parareal(True)["slices"] == 8
+    assert resolve_parareal({"slices": 4, "tol": 0})["tol"] == 0
+    with pytest.raises(ValueError):
+        resolve_parareal({"slice": 4})
+    with pytest.raises(ValueError):
+        resolve_parareal({"coarse_factor": 0})
+    with pytest.raises(ValueError):
+        DOFTModel(8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0, tau_dynamic=True, lpc_parareal=True)
+    with pytest.raises(ValueError):
+        DOFTModel(8, 0.3, 1.0, 1.0, 1.0, 0.0, seed=0, integrator="Leapfrog", lpc_parareal=True)
+
+
+def test_pickled_model_steps_identically():
+    model = DOFTModel(8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0, instrument=True, kernel_params={"weights": [0.1], "thetas": [2.0]})
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    model.last_energy = model.energy_fn(model.Q, model.P)
+    copy = pickle.loads(pickle.dumps(model))
+    assert copy.timer is None and copy.output_writer is None
+    for t in range(50):
+        model._step(t)
+        copy._step(t)
+    np.testing.assert_array_equal(copy.Q, model.Q)
+    np.testing.assert_array_equal(copy.memory.y, model.memory.y)
+
+
+def test_all_iterations_reproduce_serial_run():
+    model, probe_idx = _model(slices=4, coarse_factor=4, tol=0, processes=0)
+    series, stats, reference = parareal_lpc_series(model, 2000, probe_idx)
+    assert stats["lpc_parareal_iterations"] == 4 and stats["lpc_parareal_converged"]
+    np.testing.assert_array_equal(series, reference)
+
+
+def test_damped_run_converges_early_over_pool():
+    model, probe_idx = _model(gamma=5.0, slices=8, coarse_factor=2, tol=1e-6, processes=2)
+    series, stats, reference = parareal_lpc_series(model, 2000, probe_idx)
+    assert stats["lpc_parareal_converged"] and stats["lpc_parareal_iterations"] < 8
+    assert stats["lpc_parareal_speedup"] > 0
+    np.testing.assert_allclose(series, reference, rtol=0, atol=1e-6 * np.abs(reference).max())
+
+
+def test_lpc_metrics_report_K_deviation():
+    model, _ = _model(slices=2, tol=0, processes=0)
+    metrics, blocks = model._calculate_lpc_metrics(4096 + 2048)
+    assert metrics["lpc_parareal_K_dev"] == 0.0
+    assert metrics["lpc_parareal_iterations"] == 2
+    assert len(blocks) == 2
@@ -0,0 +1,90 @@
+# tests/test_precompute.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.memory import PronyMemory
+from doft.models.model import DOFTModel, _ray_geometry
+from doft.utils.precompute import PRECOMPUTE, PrecomputeCache
+
+
+def test_lru_eviction_and_stats():
+    cache = PrecomputeCache(maxsize=2)
+    calls = []
+
+    def build(key):
+        calls.append(key)
+        return np.arange(3)
+
+    a = cache.get("a", lambda: build("a"))
+    assert cache.get("a", lambda: build("a")) is a
+    cache.get("b", lambda: build("b"))
+    cache.get("a", lambda: build("a"))  # "b" is now least recently used
+    cache.get("c", lambda: build("c"))
+    assert "a" in cache and "b" not in cache and "c" in cache
+    assert calls == ["a", "b", "c"]
+    assert cache.stats() == {"hits": 2, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2}
+    with pytest.raises(ValueError):
+        a[0] = 1
+    cache.resize(0)
+    assert len(cache) == 0
+    cache.get("d", lambda: build("d"))
+    assert len(cache) == 0 and calls[-1] == "d"
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+
+
+def test_ray_cells_match_pointwise_scan():
+    grid_size = 17
+    center = grid_size // 2
+    thetas, cells = _ray_geometry(grid_size, 16)
+    for i, theta in enumerate(thetas):
+        for r in range(center):
+            px = int(center + r * np.cos(theta))
+            py = int(center + r * np.sin(theta))
+            assert cells[i, r] == py * grid_size + px
+
+
+def test_prony_coefficients_shared_between_models():
+    first = PronyMemory([0.2, 0.1], [1.0, 3.0], (4, 4))
+    second = PronyMemory([0.2, 0.1], [1.0, 3.0], (8, 8))
+    decay, gain = first.coefficients(0.01)
+    assert second.coefficients(0.01)[0] is decay
+    np.testing.assert_array_equal(decay[:, 0, 0], np.exp(-0.01 / np.array([1.0, 3.0])))
+    np.testing.assert_array_equal(gain[:, 0, 0], np.array([0.2, 0.1]) * (1.0 - decay[:, 0, 0]))
+
+
+def _pulse(model):
+    model.last_energy = np.inf
+    return model._calculate_pulse_metrics(60)
+
+
+def test_warm_cache_reproduces_cold_run():
+    PRECOMPUTE.clear()
+    cold = _pulse(DOFTModel(12, 0.3, 1.0, 1.0, 1.0, 0.1, seed=3))
+    misses = PRECOMPUTE.misses
+    warm = _pulse(DOFTModel(12, 0.3, 1.0, 1.0, 1.0, 0.1, seed=3))
+    assert PRECOMPUTE.misses == misses and PRECOMPUTE.hits >= misses
+    assert cold.keys() == warm.keys()
+    for key in cold:
+        np.testing.assert_array_equal(cold[key], warm[key])
+
+
+def test_instrumented_runs_report_their_own_cache_use():
+    def run():
+        model = DOFTModel(
+            8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=3, instrument=True,
+            max_pulse_steps=20, max_lpc_steps=64, kernel_params={"weights": [0.1], "thetas": [2.0]},
+        )
+        return model.run()[0]
+
+    PRECOMPUTE.clear()
+    first = run()
+    second = run()
+    assert first["precompute_misses"] > 0 and second["precompute_misses"] == 0
+    assert second["precompute_hits"] == first["precompute_hits"] + first["precompute_misses"]
+    assert PRECOMPUTE.hits == first["precompute_hits"] + second["precompute_hits"]
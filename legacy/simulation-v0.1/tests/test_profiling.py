@@ -0,0 +1,79 @@
+# tests/test_profiling.py
+import cProfile
+import json
+import pstats
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.simulation import profiling
+
+
+def _inner(n):
+    return sum(i * i for i in range(n))
+
+
+def _outer():
+    return _inner(20000) + _inner(40000)
+
+
+def test_pstats_collapsed_keeps_call_paths():
+    prof = cProfile.Profile()
+    prof.runcall(_outer)
+    stats = pstats.Stats(prof)
+    stacks = profiling.pstats_to_collapsed(stats)
+    paths = [s.split(";") for s in stacks]
+    assert any(p[-1].startswith("_inner") and p[-2].startswith("_outer") for p in paths)
+    total_us = sum(entry[2] for entry in stats.stats.values()) * 1e6
+    assert sum(stacks.values()) == pytest.approx(total_us, rel=0.05)
+
+
+def test_top_from_collapsed_counts_self_and_total():
+    rows = profiling.top_from_collapsed({"a;b": 3, "a;c": 1, "a": 1}, 2)
+    assert [r["function"] for r in rows] == ["b", "c"]
+    assert rows[0]["self_pct"] == 60.0 and rows[0]["total_pct"] == 60.0
+    table = profiling.format_table(rows, ["self_pct", "function"])
+    assert table.splitlines()[1].startswith("60.000")
+
+
+@pytest.mark.parametrize("profiler", profiling.PROFILERS)
+def test_cli_profiles_one_point(tmp_path, profiler, capsys):
+    cfg = {"grid_size": 8, "gamma": 0.1, "seeds": [7], "sweep_groups": {"g": [[0.3, 1.0]]}}
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(cfg))
+    out = tmp_path / "prof"
+    profiling.main([
+        "--config", str(config_path), "--profiler", profiler, "--out", str(out),
+        "--max-pulse-steps", "40", "--max-lpc-steps", "64", "--top", "5", "--interval", "0.001",
+    ])
+    record = json.loads((out / "profile.json").read_text())
+    assert (record["a"], record["tau"], record["seed"]) == (0.3, 1.0, 7)
+    assert record["max_pulse_steps"] == 40 and record["pulse_steps_run"] <= 40
+    lines = (out / "stacks.folded").read_text().splitlines()
+    assert lines and all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+    assert len((out / "top.txt").read_text().splitlines()) >= 2
+    assert (out / "profile.pstats").exists() == (profiler == "cprofile")
+    assert "outputs in" in capsys.readouterr().out
+
+
+def test_profile_config_matches_run_sim_parsing():
+    from doft.simulation.run_sim import worker_config
+
+    cfg = {
+        "grid_size": 8, "prony_memory": {"weights": [0.1], "thetas": [2]},
+        "pulse_check_interval": 25, "crn_experiment": "exp", "lpc_duration_physical": 5.0,
+        "snapshots": {"stride": 10},
+    }
+    config = profiling.profile_config(cfg, 40, 64)
+    expected = worker_config(cfg)
+    for key in ("snapshots", "lpc_duration_physical"):
+        expected.pop(key)
+    assert config == {**expected, "log_steps": False, "max_pulse_steps": 40, "max_lpc_steps": 64}
+    assert config["kernel_params"] == {"weights": [0.1], "thetas": [2.0]}
+    assert config["pulse_check_interval"] == 25
+    for bad in ({"eta": 0.5}, {"pulse_early_stop": "never"}, {"kernel_params": {"weights": [1.0], "thetas": []}}):
+        with pytest.raises(ValueError):
+            profiling.profile_config(bad, 40, 64)
@@ -0,0 +1,67 @@
+# tests/test_prony_memory.py
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.memory import PronyMemory
+from doft.models.model import DOFTModel, compute_total_energy
+
+
+WEIGHTS = np.array([0.2, 0.4, 0.1])
+THETAS = np.array([0.05, 0.2, 1.5])
+
+
+def _reference_update(y, P, dt):
+    exp_fac = np.exp(-dt / THETAS)[:, None, None]
+    return exp_fac * y + WEIGHTS[:, None, None] * (1.0 - exp_fac) * P
+
+
+def test_propose_commit_matches_reference_update():
+    rng = np.random.default_rng(0)
+    mem = PronyMemory(WEIGHTS, THETAS, (4, 4))
+    mem.y[...] = rng.normal(size=mem.y.shape)
+    mem.invalidate()
+    y0 = mem.y.copy()
+    P = rng.normal(size=(4, 4))
+
+    y_new = mem.propose(P, 0.01)
+    assert np.allclose(y_new, _reference_update(y0, P, 0.01))
+    assert np.array_equal(mem.y, y0)  # nothing committed yet
+    assert np.allclose(mem.force, y0.sum(axis=0))
+
+    mem.commit()
+    assert np.allclose(mem.y, _reference_update(y0, P, 0.01))
+    assert np.allclose(mem.force, mem.y.sum(axis=0))
+
+
+def test_coefficients_cached_per_dt():
+    mem = PronyMemory(WEIGHTS, THETAS, (2, 2))
+    decay, gain = mem.coefficients(0.01)
+    assert mem.coefficients(0.01)[0] is decay
+    assert mem.coefficients(0.005)[0] is not decay
+    assert np.allclose(mem.coefficients(0.005)[1].ravel(), WEIGHTS * (1 - np.exp(-0.005 / THETAS)))
+
+
+def test_model_memory_states_follow_reference():
+    model = DOFTModel(
+        grid_size=4, a=0.5, tau=1.0, a_ref=1.0, tau_ref=1.0, gamma=0.2, seed=0,
+        kernel_params={"weights": WEIGHTS, "thetas": THETAS},
+        max_ram_bytes=32 * 1024**3,
+    )
+    rng = np.random.default_rng(1)
+    model.Q = rng.normal(scale=0.1, size=model.Q.shape)
+    model.y_states = 0.05
+    model.last_energy = compute_total_energy(
+        model.Q, model.P, model.a_nondim, model.y_states, model.kernel_params
+    )
+    for t_idx in range(5):
+        y_ref = _reference_update(model.y_states.copy(), model.P, model.dt_nondim)
+        model._step_imex(t_idx)
+        assert np.allclose(model.y_states, y_ref)
+    assert np.isclose(
+        model.memory.energy(),
+        compute_total_energy(model.Q * 0, model.P * 0, 0.0, model.y_states, model.kernel_params),
+    )
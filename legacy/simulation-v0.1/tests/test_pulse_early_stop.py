@@ -0,0 +1,102 @@
+# tests/test_pulse_early_stop.py
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+from doft.simulation import run_sim
+from doft.utils.theilsen import TheilSenResult
+
+
+def _model(grid_size=8, **kwargs):
+    return DOFTModel(
+        grid_size=grid_size,
+        a=0.3,
+        tau=1.0,
+        a_ref=1.0,
+        tau_ref=1.0,
+        gamma=0.1,
+        seed=0,
+        **kwargs,
+    )
+
+
+def test_default_runs_every_pulse_step():
+    metrics = _model()._calculate_pulse_metrics(n_steps=60)
+    assert metrics["pulse_steps_run"] == 60
+    assert metrics["pulse_steps_saved"] == 0
+    assert metrics["pulse_stop_reason"] == "none"
+
+
+def test_saturation_stops_once_every_front_reaches_boundary():
+    # On a small lattice the pulse tail is above the noise-relative
+    # thresholds everywhere, so all fronts sit at the boundary right away
+    model = _model(pulse_early_stop="saturation")
+    metrics = model._calculate_pulse_metrics(n_steps=60)
+    assert metrics["pulse_stop_reason"] == "saturation"
+    assert metrics["pulse_steps_run"] == 1
+    assert metrics["pulse_steps_saved"] == 59
+
+
+def test_slope_mode_stops_when_speeds_stabilise(monkeypatch):
+    model = _model(grid_size=48, pulse_early_stop="slope", pulse_check_interval=20)
+    n_rays = 16 * len(model.detection_thresholds)
+    calls = []
+
+    def fit(rays):
+        # Zero speed for every ray at the first check, then a constant speed
+        calls.append(len(rays))
+        speed = np.full(len(rays), 0.0 if len(calls) == 1 else 0.8)
+        return TheilSenResult(speed, speed, speed, speed)
+
+    monkeypatch.setattr(model, "_fit_front_speeds", fit)
+    metrics = model._calculate_pulse_metrics(n_steps=400)
+
+    # check 1 (step 20) has zero speed, check 2 sets the estimate, check 3 agrees
+    assert metrics["pulse_stop_reason"] == "slope"
+    assert metrics["pulse_steps_run"] == 60
+    assert metrics["pulse_steps_saved"] == 340
+    assert metrics["ceff_pulse"] == pytest.approx(0.8)
+    # One batched fit per check and one for the final metrics
+    assert calls == [n_rays] * 4
+
+
+def test_invalid_mode_rejected():
+    with pytest.raises(ValueError):
+        _model(pulse_early_stop="always")
+
+
+def _run_sim(tmp_path, monkeypatch, cfg):
+    seen = []
+
+    class DummyModel:
+        def __init__(self, *args, **kwargs):
+            seen.append(kwargs)
+
+        def run(self):
+            return {}, None
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_sim, "DOFTModel", DummyModel)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"seeds": [0], "sweep_groups": {"g": [[0.3, 1.0]]}, **cfg}))
+    monkeypatch.setenv("DOFT_CONFIG", str(config_path))
+    monkeypatch.setattr(sys, "argv", ["run_sim"])
+    run_sim.main()
+    return seen
+
+
+def test_run_sim_passes_pulse_options(tmp_path, monkeypatch):
+    cfg = {"pulse_early_stop": "slope", "pulse_slope_rtol": 0.05, "pulse_check_interval": 25}
+    seen = _run_sim(tmp_path, monkeypatch, cfg)
+    assert {k: seen[0][k] for k in cfg} == cfg
+    run_dir = next((tmp_path / "runs" / "passive").glob("phase1_run_*"))
+    meta = json.loads((run_dir / "run_meta.json").read_text())
+    assert {k: meta[k] for k in cfg} == cfg
+    with pytest.raises(ValueError):
+        _run_sim(tmp_path, monkeypatch, {"pulse_check_interval": 0})
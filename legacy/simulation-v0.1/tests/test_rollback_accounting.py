@@ -0,0 +1,60 @@
+# tests/test_rollback_accounting.py
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+
+
+def _model(gamma):
+    return DOFTModel(
+        grid_size=4,
+        a=1.0,
+        tau=1.0,
+        a_ref=1.0,
+        tau_ref=1.0,
+        gamma=gamma,
+        seed=0,
+        dt_nondim=0.1,
+        max_ram_bytes=32 * 1024**3,
+    )
+
+
+def test_energy_rejections_are_counted_by_cause():
+    model = _model(-0.1)
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    model._step_imex(0)
+
+    assert model.rejections["energy"] > 0
+    assert model.rejections["nonfinite"] == 0
+    assert model.rejections["delay_slew"] == 0
+    assert model.rollback_count == sum(model.rejections.values())
+
+
+def test_nonfinite_rejection_leaves_state_untouched():
+    model = _model(0.1)
+    model.min_dt_nondim = 0.01
+    Q = model.rng.normal(0, 0.1, model.Q.shape)
+    Q[0, 0] = np.nan
+    model.Q = Q
+    P = model.P
+    model._step_imex(0)
+
+    # Every attempt is rejected until dt bottoms out; the state is not replaced
+    assert model.rejections["nonfinite"] > 0
+    assert model.rejections["energy"] == 0
+    assert model.Q is Q and model.P is P
+    assert model.dt_nondim == model.min_dt_nondim
+
+
+def test_candidate_energy_matches_total_energy():
+    from doft.models.model import compute_total_energy
+
+    model = _model(0.1)
+    Q = model.rng.normal(size=model.Q.shape)
+    P = model.rng.normal(size=model.P.shape)
+    fast = model._candidate_energy(Q, P, None, np.linalg.norm(Q), np.linalg.norm(P))
+    assert np.isclose(fast, compute_total_energy(Q, P, model.a_nondim, None, model.kernel_params))
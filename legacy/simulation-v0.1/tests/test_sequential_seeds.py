@@ -0,0 +1,82 @@
+# tests/test_sequential_seeds.py
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from doft.simulation import run_sim
+from doft.simulation.sequential import SequentialSeeds, extend_seeds, resolve_sequential
+
+
+def _metric(a, seed):
+    # Noise-free below a = 1, seed-dependent above it
+    return 1.0 + (0.2 * (-1) ** seed if a > 1.0 else 0.0)
+
+
+def test_resolve_sequential_validates():
+    assert resolve_sequential(None) is None
+    cfg = resolve_sequential({'metrics': ['lpc_ok_frac'], 'ci_target': 0.1})
+    assert cfg['ci_target'] == {'lpc_ok_frac': 0.1} and cfg['initial'] == 3
+    with pytest.raises(ValueError):
+        resolve_sequential({'initial': 4, 'max': 2})
+    with pytest.raises(ValueError):
+        resolve_sequential({'metrics': ['lpc_ok_frac'], 'ci_target': {'ceff_pulse': 0.1}})
+    with pytest.raises(ValueError):
+        resolve_sequential({'seeds': 3})
+    assert extend_seeds([42, 7], 4) == [42, 7, 43, 44]
+
+
+def test_only_noisy_points_get_more_seeds():
+    cfg = resolve_sequential({'initial': 2, 'batch': 2, 'max': 8, 'metrics': ['ceff_pulse'], 'ci_target': 0.05})
+    seq = SequentialSeeds([(0.5, 1.0), (1.5, 1.0), (0.5, 1.0)], [10, 11], cfg)
+    results, ran = [], []
+
+    def run_batch(combos):
+        for a, tau, seed in combos:
+            ran.append((a, seed))
+            results.append(({'a_mean': a, 'tau_mean': tau, 'ceff_pulse': _metric(a, seed)}, None))
+
+    used = seq.run(run_batch, results)
+    assert seq.n_seeds == {(0.5, 1.0): 2, (1.5, 1.0): 8}
+    assert used == len(ran) == 10 and len(set(ran)) == 10
+    assert [r['runs'] for r in seq.history] == [4, 2, 2, 2]
+    summary = seq.summary()
+    assert summary['runs_saved'] == 6 and summary['seeds'] == [10, 11, 12, 13, 14, 15, 16, 17]
+    converged = {tuple(p['point']): p['converged'] for p in summary['points']}
+    assert converged == {(0.5, 1.0): True, (1.5, 1.0): False}
+    json.dumps(summary)
+
+
+def test_run_sim_sequential_mode(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class DummyModel:
+        def __init__(self, *args, a=None, seed=None, **kwargs):
+            self.a, self.seed = a, seed
+
+        def run(self):
+            return {'ceff_pulse': _metric(self.a, self.seed), 'lpc_ok_frac': 1.0}, pd.DataFrame()
+
+    monkeypatch.setattr(run_sim, 'DOFTModel', DummyModel)
+    cfg = {
+        'seeds': [0, 1, 2, 3, 4],
+        'sweep_groups': {'g': [[0.5, 1.0], [1.5, 1.0]]},
+        'sequential_seeds': {'initial': 2, 'ci_target': 0.05},
+    }
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(cfg))
+    monkeypatch.setenv('DOFT_CONFIG', str(config_path))
+    monkeypatch.setattr(sys, 'argv', ['run_sim'])
+    run_sim.main()
+
+    run_dir = next((tmp_path / 'runs' / 'passive').glob('phase1_run_*'))
+    runs = pd.read_csv(run_dir / 'runs.csv')
+    assert runs.groupby('a_mean').size().to_dict() == {0.5: 2, 1.5: 5}
+    meta = json.loads((run_dir / 'run_meta.json').read_text())
+    assert meta['total_runs_in_sweep'] == 7
+    assert meta['sequential_seeds']['runs_saved'] == 3
+    assert meta['seeds_used'] == [0, 1, 2, 3, 4]
@@ -0,0 +1,100 @@
+# tests/test_snapshots.py
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+from doft.simulation import run_sim
+from doft.utils.snapshots import SnapshotStore, SnapshotWriter
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_writer_round_trip_with_region_and_chunks(tmp_path, compress):
+    rng = np.random.default_rng(0)
+    frames = rng.normal(size=(10, 8, 8))
+    with SnapshotWriter(tmp_path / "s", ["Q"], (8, 8), stride=2, region=(2, 6, 1, 5),
+                        chunk_steps=2, compress=compress) as writer:
+        for step, frame in enumerate(frames):
+            if writer.due(step):
+                writer.capture(step, 0.5 * step, {"Q": frame})
+
+    store = SnapshotStore(tmp_path / "s")
+    assert store.n_chunks == 3 and len(store) == 5
+    np.testing.assert_array_equal(store.steps, [0, 2, 4, 6, 8])
+    np.testing.assert_array_equal(store.times, [0.0, 1.0, 2.0, 3.0, 4.0])
+    for i, step in enumerate(store.steps):
+        np.testing.assert_array_equal(store[i]["Q"], frames[step, 2:6, 1:5])
+    if not compress:
+        assert isinstance(store.chunk(1, "Q"), np.memmap)
+    assert store.meta["n_frames"] == 5
+
+
+def test_reader_sees_only_complete_chunks_while_writing(tmp_path):
+    writer = SnapshotWriter(tmp_path / "s", ["Q"], (4, 4), chunk_steps=2)
+    writer.capture(0, 0.0, {"Q": np.zeros((4, 4))})
+    store = SnapshotStore(tmp_path / "s")
+    assert store.meta["n_frames"] is None and store.n_chunks == 0
+    writer.capture(1, 1.0, {"Q": np.ones((4, 4))})
+    writer.capture(2, 2.0, {"Q": np.ones((4, 4))})
+    writer.close()
+    store = SnapshotStore(tmp_path / "s")
+    assert store.n_chunks == 2 and len(store) == 3
+    assert not list((tmp_path / "s").glob("*.tmp*"))
+
+
+def test_writer_rejects_region_outside_lattice(tmp_path):
+    with pytest.raises(ValueError):
+        SnapshotWriter(tmp_path / "s", ["Q"], (8, 8), region=(0, 9, 0, 8))
+
+
+def test_model_snapshots_both_phases(tmp_path):
+    model = DOFTModel(
+        16, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0, max_pulse_steps=20, max_lpc_steps=30,
+        tau_dynamic=True, snapshots={"path": str(tmp_path), "stride": 5, "chunk_steps": 4},
+    )
+    model.run()
+    pulse = SnapshotStore(tmp_path / "pulse")
+    lpc = SnapshotStore(tmp_path / "lpc")
+    assert pulse.fields == ["Q", "P", "tau"]
+    np.testing.assert_array_equal(pulse.steps, [0, 5, 10, 15])
+    np.testing.assert_array_equal(lpc.steps, [0, 5, 10, 15, 20, 25])
+    np.testing.assert_array_equal(lpc[-1]["Q"], model.Q)
+    np.testing.assert_array_equal(lpc[-1]["tau"], model.prev_tau)
+
+
+def test_run_sim_writes_snapshots_per_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen = []
+
+    class DummyModel:
+        def __init__(self, *args, snapshots=None, **kwargs):
+            seen.append(snapshots)
+
+        def run(self):
+            return {'ceff_pulse': 1.0}, pd.DataFrame()
+
+    monkeypatch.setattr(run_sim, 'DOFTModel', DummyModel)
+    cfg = {
+        'seeds': [0, 1],
+        'grid_size': 8,
+        'sweep_groups': {'g': [[1.0, 1.0]]},
+        'snapshots': {'stride': 10, 'region': [0, 4, 0, 4]},
+    }
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(cfg))
+    monkeypatch.setenv('DOFT_CONFIG', str(config_path))
+    monkeypatch.setattr(sys, 'argv', ['run_sim'])
+    run_sim.main()
+
+    run_dir = next((tmp_path / 'runs' / 'passive').glob('phase1_run_*'))
+    assert len({s['path'] for s in seen}) == 2
+    assert all(tmp_path / Path(s['path']).parent == run_dir / 'snapshots' for s in seen)
+    assert all(s['stride'] == 10 for s in seen)
+    meta = json.loads((run_dir / 'run_meta.json').read_text())
+    assert meta['snapshots']['region'] == [0, 4, 0, 4]
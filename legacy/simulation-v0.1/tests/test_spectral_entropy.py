@@ -0,0 +1,64 @@
+# tests/test_spectral_entropy.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+from doft.utils.utils import spectral_entropy, spectral_entropy_batch
+
+
+def _legacy_entropy(x, eps=1e-12):
+    x = np.asarray(x, dtype=np.float64)
+    if not np.all(np.isfinite(x)) or x.size < 8:
+        return float("nan")
+    x = x - np.mean(x)
+    if np.allclose(x, 0):
+        return 0.0
+    P = np.abs(np.fft.rfft(x)) ** 2
+    p = np.clip(P / P.sum(), eps, 1.0)
+    return float(-np.sum(p * np.log(p)))
+
+
+def test_batch_matches_scalar_row_by_row():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(6, 257))
+    x[1] = 3.0  # constant row
+    x[2, 17] = np.nan
+    x[3, 0] = np.inf
+    x[4] = np.sin(np.arange(257) * 0.3)
+    out = np.empty(6)
+    res = spectral_entropy_batch(x, out=out, workers=2)
+    assert res is out
+    for row, value in zip(x, res):
+        scalar = spectral_entropy(row)
+        assert (np.isnan(scalar) and np.isnan(value)) or scalar == value
+    assert res[1] == 0.0 and np.isnan(res[2]) and np.isnan(res[3])
+    # Same values as the former NumPy implementation up to FFT rounding
+    np.testing.assert_allclose(res[[0, 4, 5]], [_legacy_entropy(r) for r in x[[0, 4, 5]]], rtol=1e-12)
+
+
+def test_batch_edge_shapes():
+    assert np.isnan(spectral_entropy_batch(np.ones((3, 7)))).all()
+    assert spectral_entropy_batch(np.empty((0, 16))).shape == (0,)
+    with pytest.raises(ValueError):
+        spectral_entropy_batch(np.ones(16))
+    with pytest.raises(ValueError):
+        spectral_entropy_batch(np.ones((2, 16)), out=np.empty(3))
+
+
+def test_window_blocks_use_batched_entropy():
+    model = DOFTModel(8, 0.3, 1.0, 1.0, 1.0, 0.1, seed=0)
+    series = np.random.default_rng(1).normal(size=1000)
+    series[650] = np.nan
+    blocks, skipped = model._window_blocks(series, 200, 100)
+    assert skipped == 2 and len(blocks) == 9
+    valid = [b for b in blocks if not b['block_skipped']]
+    for b in valid:
+        i = b['window_id']
+        assert b['K_metric'] == spectral_entropy(series[i * 100:i * 100 + 200])
+    assert valid[0]['deltaK'] == 0.0
+    assert valid[-1]['deltaK'] == valid[-1]['K_metric'] - valid[-2]['K_metric']
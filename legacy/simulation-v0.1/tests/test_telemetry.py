@@ -0,0 +1,75 @@
+# tests/test_telemetry.py
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+from doft.simulation import run_sim
+from doft.utils.utils import RateLogger
+
+
+def test_rate_logger_json_lines(tmp_path):
+    sink = tmp_path / "progress.jsonl"
+    logger = RateLogger(interval_sec=3600, sink=str(sink), run_id="r1")
+    logger.reset(phase="pulse")
+    logger.tick(10, dt_nondim=0.02)  # within the interval: nothing written
+    assert not sink.exists()
+    logger.tick(20, force=True, dt_nondim=0.02)
+    (record,) = [json.loads(line) for line in sink.read_text().splitlines()]
+    assert record["run_id"] == "r1"
+    assert record["phase"] == "pulse"
+    assert record["step"] == 20
+    assert record["steps_per_s"] > 0
+    assert record["dt_nondim"] == 0.02
+
+
+def test_model_reports_both_phases(tmp_path):
+    sink = tmp_path / "progress.jsonl"
+    model = DOFTModel(
+        grid_size=4,
+        a=1.0,
+        tau=1.0,
+        a_ref=1.0,
+        tau_ref=1.0,
+        gamma=0.1,
+        seed=0,
+        max_pulse_steps=5,
+        max_lpc_steps=5,
+        rate_logger=RateLogger(interval_sec=0, sink=str(sink), run_id="r1"),
+    )
+    model.run()
+    records = [json.loads(line) for line in sink.read_text().splitlines()]
+    assert {r["phase"] for r in records} == {"pulse", "lpc"}
+    final = [r for r in records if r["step"] == 5]
+    assert {r["phase"] for r in final} == {"pulse", "lpc"}
+    assert all({"dt_nondim", "scale_accum", "rollbacks", "steps_per_s"} <= r.keys() for r in records)
+
+
+def test_run_sim_creates_sweep_progress_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    captured = {}
+
+    class DummyModel:
+        def __init__(self, *args, **kwargs):
+            captured.update(kwargs)
+
+        def run(self):
+            captured['rate_logger'].tick(1, force=True)
+            return {'ceff_pulse': 1.0}, pd.DataFrame()
+
+    monkeypatch.setattr(run_sim, 'DOFTModel', DummyModel)
+    cfg = {'seeds': [0], 'sweep_groups': {'g': [[1.0, 1.0]]}, 'telemetry_interval': 5}
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(cfg))
+    monkeypatch.setenv('DOFT_CONFIG', str(config_path))
+    monkeypatch.setattr(sys, 'argv', ['run_sim'])
+    run_sim.main()
+
+    run_dir = next((tmp_path / 'runs' / 'passive').glob('phase1_run_*'))
+    (record,) = [json.loads(line) for line in (run_dir / 'progress.jsonl').read_text().splitlines()]
+    assert record['run_id'].startswith('run_')
+    assert record['seed'] == 0
@@ -0,0 +1,98 @@
+# tests/test_theilsen.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import _PairLog, _detection_array
+from doft.utils.theilsen import MAX_PAIRS, _all_slopes, theilslopes, theilslopes_batch
+
+
+def test_matches_scipy_exactly():
+    stats = pytest.importorskip("scipy.stats")
+    rng = np.random.default_rng(0)
+    for n in (2, 3, 10, 257):
+        x = np.sort(rng.uniform(0, 10, n))
+        y = 0.7 * x + rng.normal(scale=0.3, size=n)
+        np.testing.assert_allclose(theilslopes(y, x, 0.95), stats.theilslopes(y, x, 0.95), rtol=1e-12)
+    # Ties in x (same-step detections) and in y (integer radii)
+    x = np.repeat(np.arange(40.0), 3)
+    y = np.round(0.5 * x + rng.normal(size=x.size))
+    np.testing.assert_allclose(theilslopes(y, x, 0.9), stats.theilslopes(y, x, 0.9), rtol=1e-12)
+
+
+def test_sampled_mode_stays_close_to_exact():
+    rng = np.random.default_rng(1)
+    x = np.arange(3000.0)
+    y = 0.25 * x + rng.normal(scale=5.0, size=x.size)
+    exact = theilslopes(y, x)
+    sampled = theilslopes(y, x, max_pairs=50_000)
+    assert sampled == theilslopes(y, x, max_pairs=50_000)
+    np.testing.assert_allclose(sampled, exact, rtol=5e-3)
+    assert sampled.low_slope <= sampled.slope <= sampled.high_slope
+
+
+def test_sampled_ranks_within_stated_tolerance_of_scipy():
+    stats = pytest.importorskip("scipy.stats")
+    rng = np.random.default_rng(2)
+    x = np.arange(1500.0)
+    y = 0.25 * x + rng.normal(scale=5.0, size=x.size)
+    slopes = np.sort(_all_slopes(x, y))
+    assert slopes.size > MAX_PAIRS
+    ref = stats.theilslopes(y, x, 0.95)
+    tol = 0.5 / np.sqrt(MAX_PAIRS)
+
+    # The relative rank error of each returned statistic, in units of the
+    # stated standard error, over several sampling seeds
+    errors = []
+    for seed in range(8):
+        res = theilslopes(y, x, seed=seed)
+        for got, want in [(res.slope, ref[0]), (res.low_slope, ref[2]), (res.high_slope, ref[3])]:
+            rank_error = np.searchsorted(slopes, got) - np.searchsorted(slopes, want)
+            errors.append(rank_error / slopes.size / tol)
+    errors = np.array(errors)
+    assert np.sqrt(np.mean(errors**2)) <= 1.25
+    assert np.all(np.abs(errors) <= 3.0)
+
+
+def test_batch_matches_one_fit_per_series():
+    rng = np.random.default_rng(3)
+    lengths = [12, 2, 1, 40, 25, 300]
+    width = max(lengths)
+    x = rng.uniform(0, 5, (len(lengths), width))
+    y = rng.normal(size=x.shape)
+    x[3, :40] = np.repeat(np.arange(20.0), 2)  # ties in x
+    y[4, :25] = np.round(y[4, :25])  # ties in y
+    res = theilslopes_batch(y, x, lengths, 0.9, max_pairs=500)
+    for row, n in enumerate(lengths):
+        got = [v[row] for v in res]
+        if n < 2:
+            assert np.all(np.isnan(got))
+            continue
+        # Rows above max_pairs (the last one) take the same sampled path
+        np.testing.assert_allclose(got, theilslopes(y[row, :n], x[row, :n], 0.9, max_pairs=500), rtol=1e-12)
+    with pytest.raises(ValueError):
+        theilslopes_batch(y, x, [width + 1] * len(lengths))
+
+
+def test_degenerate_inputs():
+    with pytest.raises(ValueError):
+        theilslopes([1.0], [0.0])
+    with pytest.raises(ValueError):
+        theilslopes([1.0, 2.0], [0.0, 1.0, 2.0])
+    assert np.isnan(theilslopes([1.0, 2.0], [3.0, 3.0]).slope)
+
+
+def test_detection_array_drops_duplicates_in_order():
+    log = _PairLog()
+    for pair in [(0.1, 2.0), (0.2, 3.0), (0.3, 4.0)]:
+        log.append(pair)
+    arr = _detection_array(log)
+    assert arr.tolist() == [[0.1, 2.0], [0.2, 3.0], [0.3, 4.0]]
+    log.append((0.4, 5.0))  # the array must not pin the log's buffer
+    assert len(log) == 4
+    assert _detection_array([(0.2, 1.0), (0.1, 1.0), (0.2, 1.0)]).tolist() == [[0.2, 1.0], [0.1, 1.0]]
+    assert _detection_array([]).shape == (0, 2)
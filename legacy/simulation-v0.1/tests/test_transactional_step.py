@@ -0,0 +1,92 @@
+# tests/test_transactional_step.py
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from doft.models.model import DOFTModel
+
+
+def _model(**kwargs):
+    params = dict(
+        grid_size=5,
+        a=0.1,
+        tau=1.0,
+        a_ref=1.0,
+        tau_ref=1.0,
+        gamma=0.1,
+        seed=0,
+        max_ram_bytes=32 * 1024**3,
+    )
+    params.update(kwargs)
+    return DOFTModel(**params)
+
+
+def test_rejected_delay_slew_leaves_filter_state_untouched():
+    # alpha_delay couples tau to the filtered energy density z, so a primed
+    # z moves tau by ~eta_slew * dt, i.e. ~0.1 delay steps, on the first attempt
+    model = _model(tau_dynamic=True, alpha_delay=0.5, lambda_z=0.5, max_delta_d=0.01)
+    dt0 = model.dt_nondim
+    model.min_dt_nondim = dt0 / 8
+    model.Q = model.rng.normal(0, 0.5, model.Q.shape)
+    model.last_energy = model.energy_fn(model.Q, model.P)
+    model.z_state = np.full(model.Q.shape, 1.0)
+    model.q_ring[:] = model.rng.normal(0, 0.1, model.q_ring.shape)
+    before = {
+        "z_state": model.z_state.copy(),
+        "prev_tau": model.prev_tau.copy(),
+        "_prev_delay_steps": model._prev_delay_steps.copy(),
+        "q_ring": model.q_ring.copy(),
+        "Q": model.Q.copy(),
+        "P": model.P.copy(),
+    }
+    attempts = []
+    reject = model._reject_attempt
+
+    def checked_reject(cause, attempt_t0):
+        attempts.append((cause, model.dt_nondim))
+        for name, value in before.items():
+            assert np.array_equal(getattr(model, name), value), name
+        assert model._ring_index == 0 and model.delta_d_log == []
+        return reject(cause, attempt_t0)
+
+    model._reject_attempt = checked_reject
+    model._step_imex(0)
+
+    # dt, dt/2, dt/4 and dt/8 are all rejected; the first at the original dt
+    assert attempts == [("delay_slew", dt0 / 2**k) for k in range(4)]
+    assert model.rejections == {"nonfinite": 0, "energy": 0, "delay_slew": 4}
+    for name, value in before.items():
+        assert np.array_equal(getattr(model, name), value), name
+    assert model._ring_index == 0 and model.delta_d_log == []
+
+
+def test_retries_reuse_dt_independent_terms():
+    model = _model(gamma=-0.1)
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    calls = []
+    laplacian = model._laplacian
+    model._laplacian = lambda field, mode=None: calls.append(1) or laplacian(field, mode)
+
+    model._step_imex(0)
+
+    assert model.rejections["energy"] > 0
+    assert len(calls) == 1
+
+
+def test_step_matches_unfused_update():
+    model = _model()
+    model.Q = model.rng.normal(0, 0.1, model.Q.shape)
+    model.P = model.rng.normal(0, 0.1, model.P.shape)
+    model.Q_delay = model.rng.normal(0, 0.1, model.Q.shape)
+    model.last_energy = np.inf
+    Q, P, dt = model.Q.copy(), model.P.copy(), model.dt_nondim
+    K_term = model.a_nondim * model._laplacian(model.Q_delay)
+    P_ref = (P + dt * (K_term - Q)) / (1.0 + dt * model.gamma_nondim + dt**2)
+
+    model._step_imex(0)
+
+    assert np.array_equal(model.P, P_ref)
+    assert np.array_equal(model.Q, Q + dt * P_ref)
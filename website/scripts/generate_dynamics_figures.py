@@ -8,16 +8,27 @@ Source artifact:
 The values below are a direct transcription of that artifact's seven inline
 charts. The website selects five and renders them in English without adding
 new fits or smoothing.
+
+Figures are rendered in a process pool. A manifest records a hash of each
+figure function, the shared style code and the written PNG; figures whose
+hash is unchanged are skipped unless ``--force`` is given.
 """
 
+import argparse
+import hashlib
+import inspect
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 
 
 ROOT = Path(__file__).resolve().parents[1]
 OUTPUT = ROOT / "public" / "figures"
+MANIFEST = ROOT / "scripts" / ".figure-manifest.json"
 
 PAPER = "#fbf8f2"
 INK = "#1c1b19"
@@ -400,13 +411,76 @@ def causal_splitting() -> None:
     finish(fig, "causal-splitting.png")
 
 
+FIGURES = {
+    "hold-vs-energy.png": hold_vs_energy,
+    "escape-law.png": escape_law,
+    "instability-pulse.png": instability_pulse,
+    "spectroscopic-age.png": spectroscopic_age,
+    "causal-splitting.png": causal_splitting,
+}
+
+
+def style_digest() -> str:
+    """Hash the palette and the helpers every figure shares."""
+
+    h = hashlib.sha256(matplotlib.__version__.encode())
+    for name in ("PAPER", "INK", "MUTED", "LINE", "ORANGE", "ORANGE_DARK", "TEAL", "TEAL_LIGHT", "GREY_LIGHT"):
+        h.update(f"{name}={globals()[name]}".encode())
+    for helper in (configure, finish, setup_axes):
+        h.update(inspect.getsource(helper).encode())
+    return h.hexdigest()
+
+
+def figure_digest(fn, style: str) -> str:
+    """Hash a figure's data and drawing code together with the shared style."""
+
+    return hashlib.sha256(style.encode() + inspect.getsource(fn).encode()).hexdigest()
+
+
+def file_digest(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_manifest() -> dict:
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text())
+    return {}
+
+
+def render(name: str) -> str:
+    FIGURES[name]()
+    return name
+
+
 def main() -> None:
-    configure()
-    hold_vs_energy()
-    escape_law()
-    instability_pulse()
-    spectroscopic_age()
-    causal_splitting()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="render every figure")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    style = style_digest()
+    manifest = {} if args.force else load_manifest()
+    digests = {name: figure_digest(fn, style) for name, fn in FIGURES.items()}
+    stale = [
+        name
+        for name, digest in digests.items()
+        if manifest.get(name, {}).get("inputs") != digest
+        or manifest.get(name, {}).get("png") != file_digest(OUTPUT / name)
+        or not (OUTPUT / name).exists()
+    ]
+    if not stale:
+        print("figures up to date")
+        return
+
+    OUTPUT.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=configure) as pool:
+        for name in pool.map(render, stale):
+            manifest[name] = {"inputs": digests[name], "png": file_digest(OUTPUT / name)}
+            print(f"rendered {name}")
+
+    MANIFEST.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
 
 
 if __name__ == "__main__":